@@ -1,8 +1,15 @@
 
+import asyncio
+
 from dotenv import load_dotenv
 import click
-from src.agent_core.rename_workflow import rename_mode
+from src.agent_core.rename_workflow import arename_mode, rename_mode
 from src.agent_core.research_workflow import research_filter_mode
+from src.services.extraction_cache import ExtractionCache, DEFAULT_CACHE_DIR
+from src.services.llm_client import LLMClient
+from src.services.ocr_service import OcrPool
+from src.services.rate_limiter import RateQuota
+from src.services.response_cache import DEFAULT_RESPONSE_CACHE_PATH, ResponseCache
 
 
 # Load environment variables from .env at the very start
@@ -18,18 +25,133 @@ def cli():
     pass
 
 
+def _build_cache(cache_dir, no_cache):
+    """
+    Create the extraction cache for a CLI run, or None when caching is disabled.
+    """
+    return None if no_cache else ExtractionCache(cache_dir)
+
+
+def _build_ocr(enabled, ocr_workers, ocr_pages, cache):
+    """
+    Create the OCR pool for a CLI run, or None when OCR is disabled or its tools are missing.
+    """
+    if not enabled:
+        return None
+    pool = OcrPool(max_workers=ocr_workers, max_pages=ocr_pages, cache=cache)
+    if not pool.available():
+        print("OCR disabled: tesseract and poppler's pdftoppm must be on PATH.")
+        pool.shutdown()
+        return None
+    return pool
+
 
+def _build_llm_client(rpm, tpm, rate_limit_file, llm_cache, llm_cache_path, refresh_llm_cache):
+    """
+    Create the LLM client for a CLI run, with the given quotas for its model (defaults otherwise)
+    and, if enabled, the persistent response cache.
+    """
+    response_cache = ResponseCache(llm_cache_path, bypass=refresh_llm_cache) if llm_cache else None
+    client = LLMClient(rate_limit_file=rate_limit_file, response_cache=response_cache)
+    if rpm or tpm:
+        default = client.rate_limiter.quotas.get(client.model_name, RateQuota())
+        client.rate_limiter.quotas[client.model_name] = RateQuota(
+            rpm=rpm or default.rpm, tpm=tpm or default.tpm
+        )
+    return client
+
+
+def _report_llm_cache(client):
+    """
+    Print the response cache's hit/miss counts for a CLI run.
+    """
+    if client.response_cache is not None:
+        stats = client.response_cache.stats()
+        print(
+            f"LLM response cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['entries']} entries stored."
+        )
 
 
 @cli.command()
 @click.option('--target-dir', default=None, help='Source folder to scan for files to rename.')
 @click.option('--dest-dir', default=None, help='Destination folder to copy and rename files.')
-def rename(target_dir, dest_dir):
+@click.option('--workers', default=1, type=int,
+              help='Number of extraction worker processes (0 = one per CPU core).')
+@click.option('--cache-dir', default=DEFAULT_CACHE_DIR,
+              help='Directory of the persistent extraction cache.')
+@click.option('--no-cache', is_flag=True, help='Disable the persistent extraction cache.')
+@click.option('--no-metadata', is_flag=True,
+              help='Always name files with the LLM, ignoring document metadata.')
+@click.option('--timeout', default=None, type=float,
+              help='Seconds allowed to extract one file before it is moved to the Error folder.')
+@click.option('--memory-limit-mb', default=None, type=int,
+              help='Address-space limit per extraction worker, in MB (POSIX only).')
+@click.option('--ocr', is_flag=True,
+              help='OCR the first pages of scanned PDFs that have no text layer '
+                   '(needs tesseract and pdftoppm).')
+@click.option('--ocr-workers', default=1, type=int, help='Number of PDFs OCR\'d at the same time.')
+@click.option('--ocr-pages', default=3, type=int, help='Leading pages OCR\'d per scanned PDF.')
+@click.option('--leading-text', is_flag=True,
+              help='Send the first part of each document instead of its most informative '
+                   'regions.')
+@click.option('--compress-tokens', default=None, type=int,
+              help='Compress each prompt\'s document text to about this many tokens '
+                   '(local TextRank summary).')
+@click.option('--no-preprocess', is_flag=True,
+              help='Send extracted text as is, without removing running headers/footers, '
+                   'page numbers and hyphenation.')
+@click.option('--concurrency', default=1, type=int,
+              help='LLM requests in flight at once (above 1 uses the async Gemini client).')
+@click.option('--rpm', default=None, type=int,
+              help='Gemini requests per minute allowed (defaults to the model\'s tier 1 quota).')
+@click.option('--tpm', default=None, type=int,
+              help='Gemini input plus output tokens per minute allowed.')
+@click.option('--rate-limit-file', default=None,
+              help='File that shares the request/token quotas between concurrent runs.')
+@click.option('--llm-cache', is_flag=True,
+              help='Reuse stored Gemini responses for prompts already answered '
+                   '(same model and parameters).')
+@click.option('--llm-cache-path', default=DEFAULT_RESPONSE_CACHE_PATH,
+              help='SQLite file of the LLM response cache.')
+@click.option('--refresh-llm-cache', is_flag=True,
+              help='Ignore stored responses for this run, but store the fresh ones.')
+def rename(target_dir, dest_dir, workers, cache_dir, no_cache, no_metadata, timeout,
+           memory_limit_mb, ocr, ocr_workers, ocr_pages, leading_text, compress_tokens,
+           no_preprocess, concurrency, rpm, tpm, rate_limit_file, llm_cache, llm_cache_path,
+           refresh_llm_cache):
     """
     Run Rename Mode.
     Scans for TXT, PDF, and DOCX files, extracts text, and uses the LLM to generate descriptive filenames. Copies and renames files to the destination folder.
     """
-    rename_mode(target_dir=target_dir, dest_dir=dest_dir)
+    cache = _build_cache(cache_dir, no_cache)
+    ocr_pool = _build_ocr(ocr, ocr_workers, ocr_pages, cache)
+    llm_client = _build_llm_client(
+        rpm, tpm, rate_limit_file, llm_cache, llm_cache_path, refresh_llm_cache
+    )
+    options = dict(
+        llm_client=llm_client,
+        target_dir=target_dir,
+        dest_dir=dest_dir,
+        workers=workers,
+        cache=cache,
+        use_metadata=not no_metadata,
+        extraction_timeout=timeout,
+        memory_limit_mb=memory_limit_mb,
+        ocr=ocr_pool,
+        select_regions=not leading_text,
+        compress_tokens=compress_tokens,
+        preprocess=not no_preprocess,
+    )
+    try:
+        if concurrency > 1:
+            asyncio.run(arename_mode(concurrency=concurrency, **options))
+        else:
+            rename_mode(**options)
+    finally:
+        if ocr_pool:
+            ocr_pool.shutdown(wait=False)
+    _report_llm_cache(llm_client)
 
 
 
@@ -38,7 +160,48 @@ def rename(target_dir, dest_dir):
 @click.option('--source-dir', default=None, help='Source folder to scan for PDFs.')
 @click.option('--dest-dir', default=None, help='Destination folder to copy relevant PDFs.')
 @click.option('--details-file', default='Research_details.md', help='Path to a .md file containing research topic, aim, questions, objectives, and rationale.')
-def research(source_dir, dest_dir, details_file):
+@click.option('--workers', default=1, type=int,
+              help='Number of extraction worker processes (0 = one per CPU core).')
+@click.option('--cache-dir', default=DEFAULT_CACHE_DIR,
+              help='Directory of the persistent extraction cache.')
+@click.option('--no-cache', is_flag=True, help='Disable the persistent extraction cache.')
+@click.option('--timeout', default=None, type=float,
+              help='Seconds allowed to extract one file before it is moved to the Error folder.')
+@click.option('--memory-limit-mb', default=None, type=int,
+              help='Address-space limit per extraction worker, in MB (POSIX only).')
+@click.option('--ocr', is_flag=True,
+              help='OCR the first pages of scanned PDFs that have no text layer '
+                   '(needs tesseract and pdftoppm).')
+@click.option('--ocr-workers', default=1, type=int, help='Number of PDFs OCR\'d at the same time.')
+@click.option('--ocr-pages', default=3, type=int, help='Leading pages OCR\'d per scanned PDF.')
+@click.option('--leading-text', is_flag=True,
+              help='Send the first part of each document instead of its most informative '
+                   'regions.')
+@click.option('--compress-tokens', default=None, type=int,
+              help='Compress each prompt\'s document text to about this many tokens '
+                   '(local TextRank summary).')
+@click.option('--no-preprocess', is_flag=True,
+              help='Send extracted text as is, without removing running headers/footers, '
+                   'page numbers and hyphenation.')
+@click.option('--concurrency', default=1, type=int,
+              help='LLM requests in flight at once (above 1 uses the async Gemini client).')
+@click.option('--rpm', default=None, type=int,
+              help='Gemini requests per minute allowed (defaults to the model\'s tier 1 quota).')
+@click.option('--tpm', default=None, type=int,
+              help='Gemini input plus output tokens per minute allowed.')
+@click.option('--rate-limit-file', default=None,
+              help='File that shares the request/token quotas between concurrent runs.')
+@click.option('--llm-cache', is_flag=True,
+              help='Reuse stored Gemini responses for prompts already answered '
+                   '(same model and parameters).')
+@click.option('--llm-cache-path', default=DEFAULT_RESPONSE_CACHE_PATH,
+              help='SQLite file of the LLM response cache.')
+@click.option('--refresh-llm-cache', is_flag=True,
+              help='Ignore stored responses for this run, but store the fresh ones.')
+def research(source_dir, dest_dir, details_file, workers, cache_dir, no_cache, timeout,
+             memory_limit_mb, ocr, ocr_workers, ocr_pages, leading_text, compress_tokens,
+             no_preprocess, concurrency, rpm, tpm, rate_limit_file, llm_cache, llm_cache_path,
+             refresh_llm_cache):
     """
     Run Research Filter Mode.
     Scans a directory for PDFs, uses the LLM to score/filter them, and copies relevant files to a target directory.
@@ -55,7 +218,31 @@ def research(source_dir, dest_dir, details_file):
         "is this document relevant to the research? Reply with a score from 0 to 1.\n\n"
         f"{research_details}"
     )
-    research_filter_mode(source_dir=source_dir, dest_dir=dest_dir, query=query)
+    cache = _build_cache(cache_dir, no_cache)
+    ocr_pool = _build_ocr(ocr, ocr_workers, ocr_pages, cache)
+    llm_client = _build_llm_client(
+        rpm, tpm, rate_limit_file, llm_cache, llm_cache_path, refresh_llm_cache
+    )
+    try:
+        research_filter_mode(
+            source_dir=source_dir,
+            dest_dir=dest_dir,
+            query=query,
+            workers=workers,
+            cache=cache,
+            extraction_timeout=timeout,
+            memory_limit_mb=memory_limit_mb,
+            ocr=ocr_pool,
+            select_regions=not leading_text,
+            compress_tokens=compress_tokens,
+            preprocess=not no_preprocess,
+            concurrency=concurrency,
+            llm_client=llm_client,
+        )
+    finally:
+        if ocr_pool:
+            ocr_pool.shutdown(wait=False)
+    _report_llm_cache(llm_client)
 
 
 if __name__ == "__main__":
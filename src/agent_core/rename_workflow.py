@@ -1,17 +1,53 @@
+import asyncio
 import os
 import re
-from typing import List, Optional, Dict, Type
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from src.services.llm_client import LLMClient
-from src.handlers.pdf_handler import PdfHandler
-from src.handlers.txt_handler import TxtHandler
-from src.handlers.docx_handler import DocxHandler
+from src.services.extraction_engine import ExtractionEngine
+from src.services.extraction_cache import ExtractionCache
+from src.services.file_io import copy_file
+from src.services.archive_io import ArchiveError, is_archive, list_members
+from src.services.ocr_service import OcrPool, apply_ocr
+from src.services.salient_regions import select_salient_text
+from src.services.text_compression import compress_text
+from src.services.token_estimator import TokenEstimator
+from src.handlers.base_handler import ROUTE_SKIP
+from src.handlers.registry import default_registry
 
 
-HANDLER_MAP: Dict[str, Type] = {
-    '.pdf': PdfHandler,
-    '.txt': TxtHandler,
-    '.docx': DocxHandler,
-}
+# Files are routed by content sniffing; handler modules are imported on first use.
+HANDLER_REGISTRY = default_registry
+# Extension -> handler class view of the registry, used for the default scan extensions.
+HANDLER_MAP = HANDLER_REGISTRY.extension_map()
+
+# Characters extracted per token of prompt budget. Prose averages 4-5 characters per estimated
+# token, so this normally covers the first prompt chunk with room to spare. It is not a bound:
+# a whitespace run costs one token however long it is, so layout-padded text can fill less than
+# a full chunk.
+EXTRACT_CHARS_PER_TOKEN = 10
+# With salient-region selection, this many times the prompt's worth of text is extracted to pick
+# from, so the abstract and (for most papers) the conclusion are within reach.
+SALIENT_SCAN_FACTOR = 8
+
+# Prefixes that authoring tools prepend to the source file name, e.g. "Microsoft Word - Document1".
+METADATA_TITLE_PREFIX = re.compile(
+    r'^(microsoft\s+(office\s+)?)?(word|powerpoint|excel)\s*-\s*', re.IGNORECASE
+)
+# Placeholder titles that say nothing about the document.
+JUNK_METADATA_TITLE = re.compile(
+    r'^(untitled|no title|title|document|doc|presentation|slide|book|paper|draft|template|'
+    r'abstract|unknown|none|null|pdf|print|scan(ned)?( document)?|microsoft word)[\s_-]*\d*$',
+    re.IGNORECASE,
+)
+# Titles that are really a file name or path ("report_final.docx", "C:\\tmp\\x.tex").
+FILENAME_LIKE_TITLE = re.compile(
+    r'(\.(docx?|pdf|txt|rtf|tex|dvi|ps|odt|pptx?|xlsx?|indd|qxd|html?)$)|[\\/]', re.IGNORECASE
+)
+# Author values written by default installs rather than real people.
+JUNK_METADATA_AUTHOR = re.compile(
+    r'^(administrator|admin|user|owner|author|unknown|guest|root|microsoft.*)$', re.IGNORECASE
+)
 
 """
 Module: rename_workflow.py
@@ -19,21 +55,36 @@ Implements the Rename Mode workflow for the Document Intelligence Agent.
 Scans for supported files, extracts text, generates new filenames using LLM, and renames files.
 """
 
-def scan_files(directory: str, exts: Optional[List[str]] = None) -> List[str]:
+def scan_files(
+    directory: str, exts: Optional[List[str]] = None, archives: bool = True
+) -> List[str]:
     """
     Recursively scan for files with given extensions in a directory.
     Args:
         directory (str): Directory to scan.
         exts (Optional[List[str]]): List of file extensions to include (e.g., ['.pdf', '.txt']). If None, all files are included.
+        archives (bool): If True, ZIP/TAR archives are listed in place and their matching
+            members are returned as virtual paths ('<archive>/<member>') instead of the
+            archive itself.
     Returns:
         List[str]: List of file paths matching the extensions.
     """
     matches = []
     for root, _, files in os.walk(directory):
         for f in files:
+            path = os.path.join(root, f)
+            if archives and is_archive(f):
+                try:
+                    members = list_members(path)
+                except ArchiveError:
+                    members = []  # Unreadable archives are left alone.
+                for member in members:
+                    if exts is None or os.path.splitext(member)[1].lower() in exts:
+                        matches.append(os.path.join(path, *member.split('/')))
+                continue
             ext = os.path.splitext(f)[1].lower()
             if exts is None or ext in exts:
-                matches.append(os.path.join(root, f))
+                matches.append(path)
     return matches
 
 def sanitize_filename(name: str, ext: str) -> str:
@@ -67,7 +118,73 @@ def resolve_collision(directory: str, filename: str) -> str:
         counter += 1
     return candidate
 
-import shutil
+def clean_metadata_title(title: Optional[str]) -> Optional[str]:
+    """
+    Return a document title from metadata if it is trustworthy, otherwise None.
+    Authoring-tool prefixes are stripped; placeholders, file names and titles with fewer
+    than two words are rejected.
+    Args:
+        title (Optional[str]): Raw title from the document metadata.
+    Returns:
+        Optional[str]: The cleaned title, or None if it is missing or junk.
+    """
+    if not title:
+        return None
+    title = METADATA_TITLE_PREFIX.sub('', ' '.join(title.split())).strip()
+    if not title or JUNK_METADATA_TITLE.match(title) or FILENAME_LIKE_TITLE.search(title):
+        return None
+    if len(re.findall(r'[^\W\d_]{2,}', title)) < 2:
+        return None
+    return title
+
+def clean_metadata_author(author: Optional[str]) -> Optional[str]:
+    """
+    Reduce a metadata author field to the first author's surname.
+    Args:
+        author (Optional[str]): Raw author/creator value (may list several authors).
+    Returns:
+        Optional[str]: The surname, or None if the value is missing or a placeholder.
+    """
+    if not author:
+        return None
+    first = re.split(r';|&|\band\b|\n', author, maxsplit=1)[0].strip()
+    if not first or JUNK_METADATA_AUTHOR.match(first):
+        return None
+    if ',' in first:
+        surname = first.split(',', 1)[0].strip()
+    else:
+        surname = first.split()[-1]
+    return surname if re.search(r'[^\W\d_]', surname) else None
+
+def name_from_metadata(metadata: Dict[str, str]) -> Optional[str]:
+    """
+    Build a filename (without extension) straight from document metadata.
+    Args:
+        metadata (Dict[str, str]): Metadata from a handler's read_metadata ('title', 'author',
+            'created').
+    Returns:
+        Optional[str]: "<title> <author surname> <year>" with the parts that are available, or None
+        when the title is missing or junk and the LLM has to name the file.
+    """
+    title = clean_metadata_title(metadata.get('title'))
+    if not title:
+        return None
+    parts = [title]
+    author = clean_metadata_author(metadata.get('author'))
+    if author:
+        parts.append(author)
+    year = re.search(r'(19|20)\d{2}', metadata.get('created', ''))
+    if year:
+        parts.append(year.group(0))
+    return ' '.join(parts)
+
+def has_trustworthy_metadata(metadata: Dict[str, str]) -> bool:
+    """
+    Return True when the metadata alone is good enough to name the file.
+    Used by the extraction engine to skip body extraction for such files.
+    """
+    return name_from_metadata(metadata) is not None
+
 
 def rename_mode(
     target_dir: Optional[str] = None,
@@ -77,110 +194,370 @@ def rename_mode(
     llm_client: Optional[LLMClient] = None,
     chunk_size: int = 1000,
     chunk_overlap: int = 100,
-    verbose: bool = True
+    verbose: bool = True,
+    max_pages: Optional[int] = None,
+    workers: Optional[int] = 1,
+    cache: Optional[ExtractionCache] = None,
+    use_metadata: bool = True,
+    extraction_timeout: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+    ocr: Optional[OcrPool] = None,
+    select_regions: bool = True,
+    compress_tokens: Optional[int] = None,
+    preprocess: bool = True
 ) -> List[tuple]:
     """
     Orchestrate the renaming process: scan files, extract text, generate new names, sanitize, and rename.
+    Files are named one LLM call at a time; see arename_mode for concurrent naming.
     Args:
         target_dir (str): Directory to scan for files to rename.
         exts (Optional[List[str]]): List of file extensions to include. If None, all supported types are included.
         dry_run (bool): If True, do not actually rename files (just print actions).
         llm_client (Optional[LLMClient]): LLM client instance to use. If None, a new one is created.
-        chunk_size (int): Max tokens per chunk for LLM input.
+        chunk_size (int): Max Gemini tokens per chunk for LLM input.
         chunk_overlap (int): Overlap between chunks.
         verbose (bool): If True, print progress and errors.
+        max_pages (Optional[int]): Optional cap on pages parsed per document. Extraction always
+            stops once enough text for the first prompt chunk has been collected.
+        workers (Optional[int]): Number of extraction worker processes. None or 0 uses one per
+            CPU core; 1 extracts in-process.
+        cache (Optional[ExtractionCache]): Persistent extraction cache; unchanged files are not
+            re-parsed.
+        use_metadata (bool): If True, files whose metadata carries a trustworthy title are named
+            from it directly, without parsing the body or calling the LLM.
+        extraction_timeout (Optional[float]): Seconds allowed per file. When set (or
+            memory_limit_mb is), extraction runs in recycled, supervised worker processes and files
+            that exceed the limit are copied to the Error folder instead of stalling the run.
+        memory_limit_mb (Optional[int]): Address-space limit per extraction worker, in MB (POSIX
+            only).
+        ocr (Optional[OcrPool]): OCR pool for scanned PDFs with no text layer. Their first pages
+            are OCR'd in the background while other files are named; None sends them to the
+            Error folder.
+        select_regions (bool): If True, the prompt is assembled from the document's most
+            informative regions (title lines, abstract, headings, conclusion, high TF-IDF blocks)
+            within chunk_size tokens; if False, the first chunk_size tokens are sent.
+        compress_tokens (Optional[int]): If set, the prompt text is further compressed to about this
+            many tokens by local extractive summarization (TextRank over its sentences).
+        preprocess (bool): If True, extracted text goes through the handler's preprocess (running
+            headers/footers, page numbers, hyphenation and extra whitespace removed) and the tokens
+            saved are reported per file.
     Returns:
         List[tuple]: List of (old_path, new_path) tuples for renamed files.
     """
-    if target_dir is None:
-        target_dir = input("Enter the source folder to scan for files: ").strip()
-        if not target_dir:
-            if verbose:
-                print("No source folder provided. Aborting.")
-            return []
-    if dest_dir is None:
-        dest_dir = input("Enter the destination folder to copy and rename files: ").strip()
-        if not dest_dir:
-            if verbose:
-                print("No destination folder provided. Aborting.")
-            return []
-    if not os.path.exists(dest_dir):
-        os.makedirs(dest_dir)
-    if exts is None:
-        exts = list(HANDLER_MAP.keys())
-    files = scan_files(target_dir, exts)
-    if not files:
-        if verbose:
-            print(f"No files found in {target_dir} with extensions: {exts}")
+    run = _RenameRun.start(
+        target_dir, dest_dir, exts=exts, dry_run=dry_run, llm_client=llm_client,
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap, verbose=verbose, max_pages=max_pages,
+        workers=workers, cache=cache, use_metadata=use_metadata,
+        extraction_timeout=extraction_timeout, memory_limit_mb=memory_limit_mb, ocr=ocr,
+        select_regions=select_regions, compress_tokens=compress_tokens, preprocess=preprocess,
+    )
+    if run is None:
         return []
-    if llm_client is None:
-        llm_client = LLMClient()
-    results = []
-    error_files = []
-    for file_path in files:
-        ext = os.path.splitext(file_path)[1].lower()
-        handler_cls = HANDLER_MAP.get(ext)
-        error_occurred = False
-        retry_attempted = False
-        new_name = os.path.basename(file_path)  # Ensure new_name is always defined
-        if not handler_cls:
+    names = {}
+    for file_path in run.files:
+        # Prompts are prepared file by file, so OCR of later files overlaps the LLM calls.
+        plan = run.plan(file_path)
+        if plan.prompt is None:
+            names[file_path] = (plan.name, plan.error)
+        else:
+            names[file_path] = run.name_with_llm(plan)
+    return run.finish(names)
+
+
+async def arename_mode(
+    target_dir: Optional[str] = None,
+    dest_dir: Optional[str] = None,
+    concurrency: int = 8,
+    **kwargs
+) -> List[tuple]:
+    """
+    Async variant of rename_mode that keeps up to concurrency LLM requests in flight.
+    Extraction, prompt preparation and copying work as in rename_mode; results, collision
+    handling and the Error folder are identical, in file order.
+    Args:
+        target_dir (str): Directory to scan for files to rename.
+        dest_dir (str): Destination folder for the renamed copies.
+        concurrency (int): Maximum simultaneous LLM requests.
+        **kwargs: Any other rename_mode keyword argument.
+    Returns:
+        List[tuple]: List of (old_path, new_path) tuples for renamed files.
+    """
+    run = _RenameRun.start(target_dir, dest_dir, **kwargs)
+    if run is None:
+        return []
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def name_one(file_path: str):
+        future = run.ocr_jobs.get(file_path)
+        if future is not None:
+            # Wait without blocking the event loop; plan() then reads the finished result.
+            await asyncio.wait([asyncio.wrap_future(future)])
+        # Preprocessing, region selection, TextRank and any count_tokens call are CPU- or
+        # network-bound: run them off the event loop so in-flight requests keep going.
+        plan = await asyncio.to_thread(run.plan, file_path)
+        if plan.prompt is None:
+            return plan.name, plan.error
+        async with semaphore:
+            return await run.aname_with_llm(plan)
+
+    names = await asyncio.gather(*(name_one(file_path) for file_path in run.files))
+    return run.finish(dict(zip(run.files, names)))
+
+
+class RenamePlan(NamedTuple):
+    """
+    Prepared naming of one file: a name decided without the LLM (prompt is None), or the prompt
+    to ask it with. error marks files that belong in the Error folder.
+    """
+    file_path: str
+    name: str
+    prompt: Optional[str] = None
+    error: bool = False
+
+
+class _RenameRun:
+    """
+    State shared by the phases of one rename run: extraction of every file up-front, per-file
+    prompt preparation, LLM naming (sequential or concurrent) and copying.
+    """
+    def __init__(self, files, dest_dir, llm_client, chunk_size, chunk_overlap, dry_run, verbose,
+                 select_regions, compress_tokens, preprocess):
+        self.files = files
+        self.dest_dir = dest_dir
+        self.llm_client = llm_client
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.dry_run = dry_run
+        self.verbose = verbose
+        self.select_regions = select_regions
+        self.compress_tokens = compress_tokens
+        self.preprocess = preprocess
+        self.estimator = getattr(llm_client, 'token_estimator', None) or TokenEstimator()
+        # Only one chunk's worth is sent to the LLM, so never extract much more text than it draws
+        # on.
+        self.extract_budget = chunk_size * EXTRACT_CHARS_PER_TOKEN
+        if select_regions:
+            self.extract_budget *= SALIENT_SCAN_FACTOR
+        self.handlers = {}
+        self.handler_objs = {}
+        self.extracted = {}
+        self.ocr_jobs = {}
+        self.total_tokens_saved = 0
+        self._lock = threading.Lock()  # plan() may run on several threads (arename_mode)
+
+    @classmethod
+    def start(
+        cls,
+        target_dir: Optional[str] = None,
+        dest_dir: Optional[str] = None,
+        exts: Optional[List[str]] = None,
+        dry_run: bool = False,
+        llm_client: Optional[LLMClient] = None,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 100,
+        verbose: bool = True,
+        max_pages: Optional[int] = None,
+        workers: Optional[int] = 1,
+        cache: Optional[ExtractionCache] = None,
+        use_metadata: bool = True,
+        extraction_timeout: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+        ocr: Optional[OcrPool] = None,
+        select_regions: bool = True,
+        compress_tokens: Optional[int] = None,
+        preprocess: bool = True
+    ) -> Optional["_RenameRun"]:
+        """
+        Ask for missing folders, scan for files and extract them all; see rename_mode for the
+        arguments.
+        Returns:
+            Optional[_RenameRun]: The run, ready for planning, or None when there is nothing to do.
+        """
+        if target_dir is None:
+            target_dir = input("Enter the source folder to scan for files: ").strip()
+            if not target_dir:
+                if verbose:
+                    print("No source folder provided. Aborting.")
+                return None
+        if dest_dir is None:
+            dest_dir = input("Enter the destination folder to copy and rename files: ").strip()
+            if not dest_dir:
+                if verbose:
+                    print("No destination folder provided. Aborting.")
+                return None
+        if not os.path.exists(dest_dir):
+            os.makedirs(dest_dir)
+        if exts is None:
+            exts = list(HANDLER_MAP.keys())
+        files = scan_files(target_dir, exts)
+        if not files:
+            if verbose:
+                print(f"No files found in {target_dir} with extensions: {exts}")
+            return None
+        if llm_client is None:
+            llm_client = LLMClient()
+        run = cls(files, dest_dir, llm_client, chunk_size, chunk_overlap, dry_run, verbose,
+                  select_regions, compress_tokens, preprocess)
+        run.extract(
+            workers, cache, use_metadata, extraction_timeout, memory_limit_mb, max_pages, ocr
+        )
+        return run
+
+    def extract(
+        self, workers, cache, use_metadata, extraction_timeout, memory_limit_mb, max_pages, ocr
+    ) -> None:
+        """Extract every supported file up-front so parsing can run on all worker processes."""
+        # Handlers are chosen from the file's leading bytes, so mislabeled files never reach the
+        # wrong parser.
+        self.handlers = {file_path: HANDLER_REGISTRY.resolve(file_path) for file_path in self.files}
+        self.handler_objs = {
+            file_path: handler_cls()
+            for file_path, handler_cls in self.handlers.items()
+            if handler_cls
+        }
+        jobs = [(handler, file_path) for file_path, handler in self.handler_objs.items()]
+        engine = ExtractionEngine(
+            max_workers=workers, cache=cache, timeout=extraction_timeout,
+            memory_limit_mb=memory_limit_mb,
+        )
+        self.extracted = {
+            result.path: result
+            for result in engine.extract_many(
+                jobs,
+                metadata_filter=has_trustworthy_metadata if use_metadata else None,
+                max_chars=self.extract_budget,
+                max_pages=max_pages,
+            )
+        }
+        # Scanned PDFs are OCR'd on their own pool while the LLM names the files before them.
+        self.ocr_jobs = ocr.submit_scanned(self.extracted.values()) if ocr else {}
+
+    def plan(self, file_path: str) -> RenamePlan:
+        """
+        Decide how to name one file: from metadata, as an error, or by prompting the LLM.
+        Waits for the file's OCR job, if it has one.
+        Args:
+            file_path (str): A scanned file.
+        Returns:
+            RenamePlan: The name or prompt for the file.
+        """
+        verbose = self.verbose
+        fallback = os.path.basename(file_path)
+        if not self.handlers[file_path]:
             if verbose:
                 print(f"No handler for {file_path}")
-            error_occurred = True
+            return RenamePlan(file_path, fallback, error=True)
+        extraction = self.extracted[file_path]
+        if file_path in self.ocr_jobs:
+            extraction = apply_ocr(
+                extraction, self.ocr_jobs.pop(file_path), max_chars=self.extract_budget
+            )
+        metadata_name = name_from_metadata(extraction.metadata) if extraction.metadata else None
+        if metadata_name:
+            if verbose:
+                print(f"Named {file_path} from document metadata")
+            return RenamePlan(file_path, metadata_name)
+        text = extraction.text
+        if extraction.route == ROUTE_SKIP or (extraction.error and not text):
+            # Triage rejected the file, or extraction failed/timed out: nothing to name it from.
+            if verbose:
+                print(f"Skipped {file_path}: {extraction.error}")
+            return RenamePlan(file_path, fallback, error=True)
+        if extraction.error and verbose:
+            print(f"Failed to extract text from {file_path}: {extraction.error}")
+        if self.preprocess and text:
+            raw_tokens = self.estimator.estimate(text)
+            text = self.handler_objs[file_path].preprocess(text)
+            tokens_saved = raw_tokens - self.estimator.estimate(text)
+            with self._lock:
+                self.total_tokens_saved += tokens_saved
+            if verbose:
+                print(f"Preprocessed {file_path}: {tokens_saved} of {raw_tokens} tokens saved")
+        if self.select_regions:
+            chunk_for_prompt = select_salient_text(text, self.chunk_size, self.estimator)
         else:
-            handler = handler_cls()
-            # Extraction and LLM retry logic
-            for attempt in range(2):
+            # Only the first chunk is sent, so only its span is computed.
+            spans = self.llm_client.iter_chunk_spans(
+                text, max_tokens=self.chunk_size, overlap=self.chunk_overlap
+            )
+            span = next(spans, None)
+            chunk_for_prompt = text[span[0]:span[1]] if span else ''
+        if self.compress_tokens:
+            chunk_for_prompt = compress_text(chunk_for_prompt, self.compress_tokens, self.estimator)
+        prompt = self.llm_client.render_named_prompt('rename', {'text': chunk_for_prompt})
+        return RenamePlan(file_path, fallback, prompt, error=bool(extraction.error))
+
+    def name_with_llm(self, plan: RenamePlan) -> Tuple[str, bool]:
+        """
+        Ask the LLM for a file name. Transient API failures are retried by the client's retry
+        policy with the same prompt; the text is never extracted again.
+        Returns:
+            Tuple[str, bool]: (name, error); the original file name and True if the call failed.
+        """
+        try:
+            return self.llm_client.generate_content(plan.prompt).strip(), False
+        except Exception as e:
+            return self._llm_failed(plan, e)
+
+    async def aname_with_llm(self, plan: RenamePlan) -> Tuple[str, bool]:
+        """Async name_with_llm, using the client's async API."""
+        try:
+            return (await self.llm_client.agenerate_content(plan.prompt)).strip(), False
+        except Exception as e:
+            return self._llm_failed(plan, e)
+
+    def _llm_failed(self, plan: RenamePlan, error: Exception) -> Tuple[str, bool]:
+        """Report a failed naming call; the file keeps its name and goes to the Error folder."""
+        if self.verbose:
+            print(f"LLM failed for {plan.file_path}: {error}")
+        return plan.name, True
+
+    def finish(self, names: Dict[str, Tuple[str, bool]]) -> List[tuple]:
+        """
+        Sanitize the names, resolve collisions and copy every file (in scan order), then copy the
+        files that failed into the Error folder.
+        Args:
+            names (Dict[str, Tuple[str, bool]]): File path -> (new name, error).
+        Returns:
+            List[tuple]: List of (old_path, new_path) tuples.
+        """
+        verbose = self.verbose
+        dest_dir = self.dest_dir
+        results = []
+        error_files = []
+        for file_path in self.files:
+            new_name, error_occurred = names[file_path]
+            ext = os.path.splitext(file_path)[1].lower()
+            new_name = sanitize_filename(new_name, ext)
+            new_name = resolve_collision(dest_dir, new_name)
+            new_path = os.path.join(dest_dir, new_name)
+            if not self.dry_run:
                 try:
-                    text = handler.extract_text(file_path)
+                    copy_file(file_path, new_path)
                 except Exception as e:
                     if verbose:
-                        print(f"Failed to extract text from {file_path} (attempt {attempt+1}): {e}")
-                    text = ""
+                        print(f"Copy failed {file_path} -> {new_path}: {e}")
                     error_occurred = True
-                # Chunk if needed
-                chunks = llm_client.chunk_text(text, max_tokens=chunk_size, overlap=chunk_overlap) if text else ['']
-                chunk_for_prompt = chunks[0] if chunks else ''
-                prompt = llm_client.render_named_prompt('rename', {'text': chunk_for_prompt})
+            if verbose:
+                print(f"{file_path} -> {new_path}")
+            results.append((file_path, new_path))
+            if error_occurred:
+                error_files.append(file_path)
+        if verbose and self.preprocess and self.total_tokens_saved:
+            print(f"Preprocessing saved {self.total_tokens_saved} prompt tokens in total")
+        # Copy error files to Error folder
+        if error_files:
+            error_dir = os.path.join(dest_dir, 'Error')
+            if not os.path.exists(error_dir):
+                os.makedirs(error_dir)
+            for src in error_files:
+                fname = os.path.basename(src)
+                dest = os.path.join(error_dir, fname)
                 try:
-                    new_name = llm_client.generate_content(prompt).strip()
-                    error_occurred = False
+                    copy_file(src, dest)
+                    if verbose:
+                        print(f"Copied error file: {src} -> {dest}")
                 except Exception as e:
                     if verbose:
-                        print(f"LLM failed for {file_path} (attempt {attempt+1}): {e}")
-                    new_name = os.path.basename(file_path)
-                    error_occurred = True
-                if not error_occurred or attempt == 1:
-                    break
-                retry_attempted = True
-        new_name = sanitize_filename(new_name, ext)
-        new_name = resolve_collision(dest_dir, new_name)
-        new_path = os.path.join(dest_dir, new_name)
-        if not dry_run:
-            try:
-                shutil.copy2(file_path, new_path)
-            except Exception as e:
-                if verbose:
-                    print(f"Copy failed {file_path} -> {new_path}: {e}")
-                error_occurred = True
-        if verbose:
-            print(f"{file_path} -> {new_path}")
-        results.append((file_path, new_path))
-        if error_occurred:
-            error_files.append(file_path)
-    # Copy error files to Error folder
-    if error_files:
-        error_dir = os.path.join(dest_dir, 'Error')
-        if not os.path.exists(error_dir):
-            os.makedirs(error_dir)
-        for src in error_files:
-            fname = os.path.basename(src)
-            dest = os.path.join(error_dir, fname)
-            try:
-                shutil.copy2(src, dest)
-                if verbose:
-                    print(f"Copied error file: {src} -> {dest}")
-            except Exception as e:
-                if verbose:
-                    print(f"Failed to copy error file {src} -> {dest}: {e}")
-    return results
+                        print(f"Failed to copy error file {src} -> {dest}: {e}")
+        return results
@@ -1,29 +1,85 @@
+import asyncio
 import os
 from typing import List, Callable
 
 from src.handlers.pdf_handler import PdfHandler
+from src.handlers.base_handler import ROUTE_OCR, ROUTE_SKIP
 from src.services.llm_client import LLMClient
+from src.services.extraction_engine import ExtractionEngine
+from src.services.extraction_cache import ExtractionCache
+from src.services.file_io import copy_file
+from src.services.archive_io import ArchiveError, is_archive, list_members
+from src.services.ocr_service import apply_ocr
+from src.services.salient_regions import select_salient_text
+from src.services.text_compression import compress_text
+from src.services.token_estimator import TokenEstimator
 
 
-import shutil
 
 class ResearchWorkflow:
     """
     Workflow for filtering and copying relevant PDFs using LLM-based scoring.
     """
-    def __init__(self, llm_client=None, pdf_handler=None):
+    # Number of leading document characters included in each scoring prompt.
+    PROMPT_CHARS = 3000
+    # Token budget of the document text in each scoring prompt when salient regions are selected.
+    PROMPT_TOKENS = 750
+    # Characters extracted per document to select salient regions from.
+    SALIENT_SCAN_CHARS = 60000
+
+    def __init__(
+        self,
+        llm_client=None,
+        pdf_handler=None,
+        workers=1,
+        cache=None,
+        extraction_timeout=None,
+        memory_limit_mb=None,
+        ocr=None,
+        select_regions=True,
+        compress_tokens=None,
+        preprocess=True,
+    ):
         """
         Initialize the ResearchWorkflow.
         Args:
             llm_client: Optional LLMClient instance. If None, a new one is created.
             pdf_handler: Optional PdfHandler instance. If None, a new one is created.
+            workers: Number of extraction worker processes. None or 0 uses one per CPU core;
+                1 extracts in-process.
+            cache: Optional ExtractionCache; unchanged PDFs are not re-parsed on repeat runs.
+            extraction_timeout: Optional seconds allowed per PDF. When set (or memory_limit_mb is),
+                extraction runs in supervised worker processes and slow files become errors.
+            memory_limit_mb: Optional address-space limit per extraction worker, in MB (POSIX only).
+            ocr: Optional OcrPool; scanned PDFs with no text layer are OCR'd in the background
+                instead of being scored 0.
+            select_regions: If True, each prompt is assembled from the document's most informative
+                regions (title lines, abstract, headings, conclusion, high TF-IDF blocks) within
+                PROMPT_TOKENS; if False, the first PROMPT_CHARS characters are sent.
+            compress_tokens: Optional token target; prompt text is further compressed to it by
+                local extractive summarization (TextRank over its sentences).
+            preprocess: If True, extracted text goes through the handler's preprocess (running
+                headers/footers, page numbers, hyphenation and extra whitespace removed); the tokens
+                saved are reported per file.
         """
+        self.ocr = ocr
+        self.select_regions = select_regions
+        self.compress_tokens = compress_tokens
+        self.preprocess = preprocess
         self.llm_client = llm_client or LLMClient()
         self.pdf_handler = pdf_handler or PdfHandler()
+        self.token_estimator = getattr(self.llm_client, 'token_estimator', None) or TokenEstimator()
+        self.extraction_engine = ExtractionEngine(
+            max_workers=workers,
+            cache=cache,
+            timeout=extraction_timeout,
+            memory_limit_mb=memory_limit_mb,
+        )
 
     def filter_pdfs(self, pdf_paths: List[str], score_threshold: float = 0.5, query: str = "Is this document relevant? Reply with a score from 0 to 1.", verbose: bool = True) -> List[str]:
         """
-        Filter a list of PDF files by LLM-generated relevance score.
+        Filter a list of PDF files by LLM-generated relevance score, one LLM call at a time
+        (see afilter_pdfs for concurrent scoring).
         Args:
             pdf_paths (List[str]): List of PDF file paths to process.
             score_threshold (float): Minimum score to consider a file relevant.
@@ -31,59 +87,145 @@ class ResearchWorkflow:
         Returns:
             List[str]: List of file paths deemed relevant.
         """
+        extractions, ocr_jobs, extract_chars = self._extract(pdf_paths)
+        paper_reasons = []
+        for path, extraction in zip(pdf_paths, extractions):
+            # Scanned PDFs are OCR'd while earlier files are being scored.
+            reason, text = self._prepare(
+                path, extraction, ocr_jobs.pop(path, None), extract_chars, verbose
+            )
+            if text is not None:
+                self._record_score(reason, *self._score_text(path, text, query, verbose))
+            paper_reasons.append(reason)
+        return self._finish(paper_reasons, score_threshold)
+
+    async def afilter_pdfs(
+        self,
+        pdf_paths: List[str],
+        score_threshold: float = 0.5,
+        query: str = "Is this document relevant? Reply with a score from 0 to 1.",
+        verbose: bool = True,
+        concurrency: int = 8,
+    ) -> List[str]:
         """
-        Orchestrate research filtering: extract text, score with LLM, and return relevant files.
+        Async variant of filter_pdfs that keeps up to concurrency scoring requests in flight.
+        The selection, the Error list and reason_for_paper_selection.md are the same as with
+        filter_pdfs, in input order.
         Args:
-            pdf_paths: List of PDF file paths to process.
-            score_threshold: Minimum score to consider a file relevant.
-            query: The prompt/question to send to the LLM for scoring.
+            pdf_paths (List[str]): List of PDF file paths to process.
+            score_threshold (float): Minimum score to consider a file relevant.
+            query (str): The prompt/question to send to the LLM for scoring.
+            verbose (bool): If True, print progress and errors.
+            concurrency (int): Maximum simultaneous LLM requests.
+        Returns:
+            List[str]: List of file paths deemed relevant.
+        """
+        extractions, ocr_jobs, extract_chars = self._extract(pdf_paths)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def score_one(path, extraction):
+            future = ocr_jobs.pop(path, None)
+            if future is not None:
+                # Wait without blocking the event loop; _prepare then reads the finished result.
+                await asyncio.wait([asyncio.wrap_future(future)])
+            # Text preparation is CPU-bound (and may call count_tokens): keep it off the event loop.
+            reason, text = await asyncio.to_thread(
+                self._prepare, path, extraction, future, extract_chars, verbose
+            )
+            if text is not None:
+                async with semaphore:
+                    self._record_score(reason, *await self._ascore_text(path, text, query, verbose))
+            return reason
+
+        paper_reasons = await asyncio.gather(
+            *(score_one(path, e) for path, e in zip(pdf_paths, extractions))
+        )
+        return self._finish(list(paper_reasons), score_threshold)
+
+    def _extract(self, pdf_paths: List[str]):
+        """
+        Extract every PDF up-front on the extraction engine and queue scanned ones for OCR.
         Returns:
-            List of file paths deemed relevant.
+            tuple: (extraction results in input order, path -> OCR future, extraction character
+            budget).
+        """
+        extract_chars = self.SALIENT_SCAN_CHARS if self.select_regions else self.PROMPT_CHARS
+        extractions = self.extraction_engine.extract_many(
+            [(self.pdf_handler, path) for path in pdf_paths], max_chars=extract_chars
+        )
+        ocr_jobs = self.ocr.submit_scanned(extractions) if self.ocr else {}
+        return extractions, ocr_jobs, extract_chars
+
+    def _prepare(self, path: str, extraction, ocr_future, extract_chars: int, verbose: bool):
+        """
+        Turn one extraction result into the prompt text to score, or a skip.
+        Args:
+            path (str): The PDF.
+            extraction (ExtractionResult): Its extraction result.
+            ocr_future (Optional[Future]): Pending OCR text for scanned PDFs.
+            extract_chars (int): Extraction character budget (caps OCR text too).
+            verbose (bool): If True, print progress.
+        Returns:
+            tuple: (reason record for reason_for_paper_selection.md, prompt text or None when the
+            file is skipped).
+        """
+        if ocr_future is not None:
+            extraction = apply_ocr(extraction, ocr_future, max_chars=extract_chars)
+        reason = {
+            'file': path,
+            'score': 0.0,
+            'llm_output': "",
+            'error': False,
+            'skip_reason': "",
+            'tokens_saved': 0
+        }
+        text = extraction.text
+        if extraction.error and extraction.route not in (ROUTE_SKIP, ROUTE_OCR):
+            print(f"[WARN] Could not extract text from {path}: {extraction.error}")
+            reason['error'] = True
+        if self.preprocess and text:
+            raw_tokens = self.token_estimator.estimate(text)
+            text = self.pdf_handler.preprocess(text)
+            reason['tokens_saved'] = raw_tokens - self.token_estimator.estimate(text)
+            if verbose:
+                print(
+                    f"\n[AGENT] Preprocessed {path}: "
+                    f"{reason['tokens_saved']} of {raw_tokens} tokens saved"
+                )
+        if extraction.route == ROUTE_SKIP or not text.strip():
+            # Nothing to score: an empty prompt costs a call and cannot succeed.
+            reason['skip_reason'] = extraction.error or "no extractable text"
+            if verbose:
+                print(f"\n[AGENT] Skipping LLM for {path}: {reason['skip_reason']}")
+            reason['error'] = True
+            return reason, None
+        return reason, self._prompt_text(text)
+
+    @staticmethod
+    def _record_score(reason: dict, score: float, llm_output: str, llm_failed: bool) -> None:
+        """Store a scoring outcome in the file's reason record."""
+        reason['score'] = score
+        reason['llm_output'] = llm_output
+        reason['error'] = reason['error'] or llm_failed
+
+    def _finish(self, paper_reasons: List[dict], score_threshold: float) -> List[str]:
+        """
+        Select the relevant files, remember the failed ones for the Error folder and write
+        reason_for_paper_selection.md.
+        Args:
+            paper_reasons (List[dict]): Reason records, in input order.
+            score_threshold (float): Minimum score to consider a file relevant.
+        Returns:
+            List[str]: List of file paths deemed relevant.
         """
         relevant_files = []
         error_files = []
-        paper_reasons = []
-        for path in pdf_paths:
-            score = 0.0
-            error_occurred = False
-            llm_output = ""
-            try:
-                text = self.pdf_handler.extract_text(path)
-            except Exception as e:
-                print(f"[WARN] Could not extract text from {path}: {e}")
-                text = ""
-                error_occurred = True
-            prompt = f"{query}\n\n{text[:3000]}"
-            if verbose:
-                print(f"\n[AGENT] Processing file: {path}")
-                print(f"[AGENT] Sending prompt to LLM:\n{prompt[:1000]}{'...' if len(prompt) > 1000 else ''}")
-            try:
-                response = self.llm_client.generate_content(prompt)
-                llm_output = response
-                if verbose:
-                    print(f"[LLM OUTPUT] {response}")
-                try:
-                    score = float(next(s for s in response.split() if self._is_float(s) and 0 <= float(s) <= 1))
-                except Exception:
-                    score = 0.0
-                if verbose:
-                    print(f"[AGENT] Score parsed: {score}")
-            except Exception as e:
-                print(f"[WARN] LLM failed for {path}: {e}")
-                score = 0.0
-                error_occurred = True
-            # Record reason for paper selection
-            paper_reasons.append({
-                'file': path,
-                'score': score,
-                'llm_output': llm_output,
-                'selected': score >= score_threshold and not error_occurred,
-                'error': error_occurred
-            })
-            if score >= score_threshold and not error_occurred:
-                relevant_files.append(path)
-            elif error_occurred:
-                error_files.append(path)
+        for reason in paper_reasons:
+            reason['selected'] = reason['score'] >= score_threshold and not reason['error']
+            if reason['selected']:
+                relevant_files.append(reason['file'])
+            elif reason['error']:
+                error_files.append(reason['file'])
         self._error_files = error_files
         # Write reasons to .md file
         with open('reason_for_paper_selection.md', 'w', encoding='utf-8') as f:
@@ -92,14 +234,94 @@ class ResearchWorkflow:
                 f.write(f"## File: {os.path.basename(reason['file'])}\n")
                 f.write(f"**Selected:** {'Yes' if reason['selected'] else 'No'}  ")
                 f.write(f"**Score:** {reason['score']}  ")
-                if reason['error']:
+                if reason['tokens_saved']:
+                    f.write(f"**Tokens saved by preprocessing:** {reason['tokens_saved']}  ")
+                if reason['skip_reason']:
+                    f.write(f"**Skipped:** {reason['skip_reason']}\n")
+                elif reason['error']:
                     f.write('**Error occurred during processing**\n')
                 f.write('\n')
                 if reason['llm_output']:
                     f.write(f"### LLM Output/Justification:\n{reason['llm_output']}\n\n")
         return relevant_files
 
-    def copy_relevant_pdfs(self, source_dir: str, dest_dir: str, score_threshold: float = 0.5, query: str = "Is this document relevant? Reply with a score from 0 to 1.", verbose: bool = True) -> List[str]:
+    def _prompt_text(self, text: str) -> str:
+        """
+        Document text for a scoring prompt: its salient regions or its leading characters,
+        compressed if configured.
+        """
+        if self.select_regions:
+            text = select_salient_text(text, self.PROMPT_TOKENS, self.token_estimator)
+        else:
+            text = text[:self.PROMPT_CHARS]
+        if self.compress_tokens:
+            text = compress_text(text, self.compress_tokens, self.token_estimator)
+        return text
+
+    def _score_text(self, path: str, text: str, query: str, verbose: bool = True):
+        """
+        Ask the LLM to score one document's text against the query. Transient API failures are
+        retried by the client's retry policy; a file whose call still fails goes to the Error
+        folder.
+        Args:
+            path (str): File the text came from (for logging).
+            text (str): Document text for the prompt (see _prompt_text).
+            query (str): The prompt/question to send to the LLM for scoring.
+            verbose (bool): If True, print the prompt, output and parsed score.
+        Returns:
+            tuple: (score, llm_output, failed) where failed is True if the LLM call raised.
+        """
+        prompt = self._scoring_prompt(path, text, query, verbose)
+        try:
+            response = self.llm_client.generate_content(prompt)
+        except Exception as e:
+            print(f"[WARN] LLM failed for {path}: {e}")
+            return 0.0, "", True
+        return self._parse_score(response, verbose), response, False
+
+    async def _ascore_text(self, path: str, text: str, query: str, verbose: bool = True):
+        """Async _score_text, using the client's async API."""
+        prompt = self._scoring_prompt(path, text, query, verbose)
+        try:
+            response = await self.llm_client.agenerate_content(prompt)
+        except Exception as e:
+            print(f"[WARN] LLM failed for {path}: {e}")
+            return 0.0, "", True
+        return self._parse_score(response, verbose), response, False
+
+    @staticmethod
+    def _scoring_prompt(path: str, text: str, query: str, verbose: bool) -> str:
+        """Build the scoring prompt for one document, printing it when verbose."""
+        prompt = f"{query}\n\n{text}"
+        if verbose:
+            print(f"\n[AGENT] Processing file: {path}")
+            ellipsis = '...' if len(prompt) > 1000 else ''
+            print(f"[AGENT] Sending prompt to LLM:\n{prompt[:1000]}{ellipsis}")
+        return prompt
+
+    def _parse_score(self, response: str, verbose: bool) -> float:
+        """Read the first number between 0 and 1 in the LLM output as the score (0.0 if none)."""
+        if verbose:
+            print(f"[LLM OUTPUT] {response}")
+        try:
+            score = float(next(
+                s for s in response.split() if self._is_float(s) and 0 <= float(s) <= 1
+            ))
+        except Exception:
+            score = 0.0
+        if verbose:
+            print(f"[AGENT] Score parsed: {score}")
+        return score
+
+    def copy_relevant_pdfs(
+        self,
+        source_dir: str,
+        dest_dir: str,
+        score_threshold: float = 0.5,
+        query: str = "Is this document relevant? Reply with a score from 0 to 1.",
+        verbose: bool = True,
+        concurrency: int = 1,
+    ) -> List[str]:
         """
         Scan for PDFs in source_dir, filter relevant ones, and copy them to dest_dir.
         Args:
@@ -108,6 +330,7 @@ class ResearchWorkflow:
             score_threshold (float): Minimum score to consider a file relevant.
             query (str): The prompt/question to send to the LLM for scoring.
             verbose (bool): If True, print progress and errors.
+            concurrency (int): LLM scoring requests in flight at once; above 1 uses afilter_pdfs.
         Returns:
             List[str]: List of copied file paths.
         """
@@ -117,15 +340,38 @@ class ResearchWorkflow:
         """
         if not os.path.exists(dest_dir):
             os.makedirs(dest_dir)
-        pdfs = [os.path.join(source_dir, f) for f in os.listdir(source_dir) if f.lower().endswith('.pdf')]
-        relevant = self.filter_pdfs(pdfs, score_threshold=score_threshold, query=query, verbose=verbose)
+        pdfs = []
+        for f in os.listdir(source_dir):
+            path = os.path.join(source_dir, f)
+            if is_archive(f) and os.path.isfile(path):
+                # PDFs inside ZIP/TAR batches are read in place through virtual paths.
+                try:
+                    pdfs.extend(
+                        os.path.join(path, *m.split('/'))
+                        for m in list_members(path)
+                        if m.lower().endswith('.pdf')
+                    )
+                except ArchiveError as e:
+                    if verbose:
+                        print(f"Skipping unreadable archive {path}: {e}")
+            elif f.lower().endswith('.pdf'):
+                pdfs.append(path)
+        if concurrency > 1:
+            relevant = asyncio.run(self.afilter_pdfs(
+                pdfs, score_threshold=score_threshold, query=query, verbose=verbose,
+                concurrency=concurrency,
+            ))
+        else:
+            relevant = self.filter_pdfs(
+                pdfs, score_threshold=score_threshold, query=query, verbose=verbose
+            )
         copied = []
         # Copy relevant files
         for src in relevant:
             fname = os.path.basename(src)
             dest = os.path.join(dest_dir, fname)
             try:
-                shutil.copy2(src, dest)
+                copy_file(src, dest)
                 if verbose:
                     print(f"Copied: {src} -> {dest}")
                 copied.append(dest)
@@ -142,7 +388,7 @@ class ResearchWorkflow:
                 fname = os.path.basename(src)
                 dest = os.path.join(error_dir, fname)
                 try:
-                    shutil.copy2(src, dest)
+                    copy_file(src, dest)
                     if verbose:
                         print(f"Copied error file: {src} -> {dest}")
                 except Exception as e:
@@ -175,7 +421,17 @@ def research_filter_mode(
     dest_dir: Optional[str] = None,
     score_threshold: float = 0.5,
     query: Optional[str] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    workers: Optional[int] = 1,
+    cache: Optional[ExtractionCache] = None,
+    extraction_timeout: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+    ocr=None,
+    select_regions: bool = True,
+    compress_tokens: Optional[int] = None,
+    preprocess: bool = True,
+    concurrency: int = 1,
+    llm_client=None
 ) -> None:
     """
     CLI entry point for research filter mode. Scans source_dir for PDFs, filters relevant ones, and copies them to dest_dir.
@@ -185,6 +441,21 @@ def research_filter_mode(
         score_threshold (float): Minimum score to consider a file relevant.
         query (str): The prompt/question to send to the LLM for scoring.
         verbose (bool): If True, print progress and errors.
+        workers (Optional[int]): Number of extraction worker processes (None or 0 = one per
+            CPU core).
+        cache (Optional[ExtractionCache]): Persistent extraction cache shared across runs.
+        extraction_timeout (Optional[float]): Seconds allowed per PDF before it is treated as an
+            error.
+        memory_limit_mb (Optional[int]): Address-space limit per extraction worker, in MB.
+        ocr (Optional[OcrPool]): OCR pool for scanned PDFs with no text layer; None disables OCR.
+        select_regions (bool): If True, prompts carry the documents' most informative regions
+            instead of their leading characters.
+        compress_tokens (Optional[int]): If set, prompt text is compressed to about this many
+            tokens.
+        preprocess (bool): If True, running headers/footers and other page clutter are removed
+            first.
+        concurrency (int): LLM scoring requests in flight at once.
+        llm_client (Optional[LLMClient]): Client to score with; a default LLMClient if None.
     Returns:
         None
     """
@@ -202,12 +473,17 @@ def research_filter_mode(
             return
     if not query:
         query = "Is this document relevant? Reply with a score from 0 to 1."
-    workflow = ResearchWorkflow()
+    workflow = ResearchWorkflow(
+        llm_client=llm_client, workers=workers, cache=cache, extraction_timeout=extraction_timeout,
+        memory_limit_mb=memory_limit_mb, ocr=ocr, select_regions=select_regions,
+        compress_tokens=compress_tokens, preprocess=preprocess
+    )
     copied = workflow.copy_relevant_pdfs(
         source_dir=source_dir,
         dest_dir=dest_dir,
         score_threshold=score_threshold,
         query=query,
-        verbose=verbose
+        verbose=verbose,
+        concurrency=concurrency
     )
     print("Copied relevant PDFs:", copied)
@@ -3,37 +3,202 @@ Base Handler Interface for Document Intelligence Agent
 Defines the common interface for all file handlers (TXT, PDF, DOCX, etc.).
 References: AGENTS.md, Agent_Building_Guidlines, copilot-instructions.md
 """
+import io
+import os
 from abc import ABC, abstractmethod
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, NamedTuple, Optional, Union
+
+from .text_cleanup import clean_text
 
 # Context sources checked: MCP Context7 (no relevant handler interface library found), Exa web search (best practices confirm use of abc.ABC and @abstractmethod for Python handler interfaces; see e.g. langchain, semchunk, semantic-text-splitter). Standard Python abstract base class pattern used; no additional context found via MCP Context7 or Exa.
 # See copilot-instructions.md for compliance details.
 
+# A file path, or a binary file-like object positioned anywhere (handlers rewind it).
+Source = Union[str, BinaryIO]
+
+
+def source_name(source: Source) -> str:
+    """
+    Human-readable name of a source for messages: the path, or the stream's name attribute.
+    """
+    if isinstance(source, str):
+        return source
+    return str(getattr(source, "name", "") or "<stream>")
+
+
+@contextmanager
+def open_binary(source: Source) -> Iterator[BinaryIO]:
+    """
+    Open a source for binary reading. Paths (including virtual paths of archive members) are
+    opened and closed here; streams are rewound and left open, since the caller owns them.
+    Args:
+        source (Source): File path or binary file-like object.
+    Yields:
+        BinaryIO: A readable binary stream positioned at the start.
+    """
+    if isinstance(source, str):
+        try:
+            f = open(source, "rb")
+        except (FileNotFoundError, NotADirectoryError):
+            # Possibly a member inside a ZIP/TAR archive, addressed as '<archive>/<member>'.
+            from src.services.archive_io import is_virtual_path, open_member
+            if not is_virtual_path(source):
+                raise
+            f = open_member(source)
+        with f:
+            yield f
+    else:
+        source.seek(0)
+        yield source
+
+
+def source_size(source: Source) -> int:
+    """
+    Size in bytes of a path or seekable stream.
+    """
+    if isinstance(source, str):
+        if os.path.exists(source):
+            return os.path.getsize(source)
+        with open_binary(source) as stream:
+            return stream.seek(0, io.SEEK_END)
+    position = source.tell()
+    try:
+        return source.seek(0, io.SEEK_END)
+    finally:
+        source.seek(position)
+
+
+# Triage routes: never worth processing, process only the first pages, process normally,
+# no text layer (only OCR can read it).
+ROUTE_SKIP = "skip"
+ROUTE_FAST = "fast"
+ROUTE_FULL = "full"
+ROUTE_OCR = "ocr"
+
+
+class TriageReport(NamedTuple):
+    """
+    Result of a quick pre-extraction assessment of a file.
+    route is one of ROUTE_SKIP, ROUTE_FAST, ROUTE_FULL or ROUTE_OCR; max_pages is the page budget
+    the extraction should use (None for no limit). parsed is optional handler-specific state from
+    the assessment (e.g. an open document) that extraction receives as triage_state, so the file
+    is not parsed twice.
+    """
+    route: str
+    reason: str
+    page_count: int = 0
+    encrypted: bool = False
+    has_text: bool = False
+    size_bytes: int = 0
+    max_pages: Optional[int] = None
+    parsed: Any = None
+
+
 class BaseHandler(ABC):
     """
     Abstract base class for all document/file handlers.
-    All handlers must implement the extract_text method.
+    All handlers must implement the iter_sections generator; extract_text joins its output.
     """
 
+    # Separator placed between consecutive sections when they are joined into one text.
+    section_separator = "\n"
+    # Bump in a subclass whenever its output changes, so cached extractions are invalidated.
+    version = "1"
+    # Handlers accept a binary file-like object wherever a file path is accepted, which lets
+    # callers parse from an in-memory buffer instead of re-reading the file.
+    accepts_streams = True
+
     @abstractmethod
-    def extract_text(self, file_path: str, **kwargs) -> str:
+    def iter_sections(self, file_path: Source, **kwargs) -> Iterator[str]:
         """
-        Extract text content from the given file.
+        Lazily yield the text of the given file one section at a time.
+        A section is the handler's natural unit (a PDF page, a DOCX paragraph, a TXT block).
+        Only the sections that are consumed are parsed, so callers can stop early.
         Args:
-            file_path (str): Path to the file to extract text from.
+            file_path (Source): Path to the file, or a binary stream of its content.
             **kwargs: Additional handler-specific options.
+        Yields:
+            str: Text of the next section.
+        """
+        pass
+
+    def extract_text(self, file_path: Source, max_chars: Optional[int] = None, **kwargs) -> str:
+        """
+        Extract text content from the given file.
+        Args:
+            file_path (Source): Path to the file, or a binary stream of its content.
+            max_chars (Optional[int]): Stop reading sections once this many characters have
+                been collected; the result is truncated to this length.
+            **kwargs: Additional handler-specific options, passed to iter_sections.
         Returns:
             str: Extracted text content.
         """
-        pass
+        return self.join_sections(self.iter_sections(file_path, **kwargs), max_chars=max_chars)
+
+    def join_sections(self, sections: Iterable[str], max_chars: Optional[int] = None) -> str:
+        """
+        Join sections into a single text, consuming only as many as the budget requires.
+        Args:
+            sections (Iterable[str]): Sections, usually from iter_sections.
+            max_chars (Optional[int]): Character budget. None consumes every section.
+        Returns:
+            str: The joined, stripped text.
+        """
+        parts = []
+        collected = 0
+        try:
+            for section in sections:
+                if not section:
+                    continue
+                parts.append(section)
+                collected += len(section) + len(self.section_separator)
+                if max_chars is not None and collected >= max_chars:
+                    break
+        finally:
+            # Close generators promptly so the underlying file is released on early exit.
+            close = getattr(sections, "close", None)
+            if close is not None:
+                close()
+        text = self.section_separator.join(parts).strip()
+        return text if max_chars is None else text[:max_chars]
+
+    def read_metadata(self, file_path: Source, **kwargs) -> Dict[str, str]:
+        """
+        Read document-level metadata without parsing the body content.
+        Handlers for formats that carry metadata (PDF info dictionary/XMP, DOCX core
+        properties, ...) override this; the default reports no metadata.
+        Args:
+            file_path (Source): Path to the file, or a binary stream of its content.
+            **kwargs: Additional handler-specific options.
+        Returns:
+            Dict[str, str]: Any of the keys 'title', 'author' and 'created' that are present and
+            non-empty.
+        """
+        return {}
+
+    def triage(self, file_path: Source, **kwargs) -> Optional[TriageReport]:
+        """
+        Optional: cheaply decide how a file should be processed before full extraction.
+        Handlers for formats with expensive failure modes (e.g. PDF) override this.
+        Args:
+            file_path (Source): Path to the file, or a binary stream of its content.
+            **kwargs: Additional handler-specific options.
+        Returns:
+            Optional[TriageReport]: The routing decision, or None when the handler does no triage.
+        """
+        return None
 
     def preprocess(self, content: str, **kwargs) -> Any:
         """
-        Optional: Preprocess extracted text (e.g., cleaning, normalization).
+        Normalize extracted text before it is sent to the LLM: running headers/footers and page
+        numbers repeated across pages are removed (pages are separated by PAGE_BREAK, which paged
+        handlers use as their section_separator), words hyphenated at line breaks are rejoined
+        and whitespace is collapsed.
         Args:
             content (str): Raw extracted text.
             **kwargs: Additional options.
         Returns:
-            Any: Preprocessed content (default: returns input).
+            Any: Preprocessed content.
         """
-        return content
+        return clean_text(content)
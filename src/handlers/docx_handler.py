@@ -1,24 +1,235 @@
-from .base_handler import BaseHandler
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional
+
+from .base_handler import BaseHandler, Source, open_binary, source_name
+
+# Namespaces of the OOXML core properties part (docProps/core.xml).
+CORE_PROPERTIES_NS = {
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "dcterms": "http://purl.org/dc/terms/",
+}
+
+
+def read_core_properties(file_path: Source) -> Dict[str, str]:
+    """
+    Read title, author and creation date from an OOXML package's docProps/core.xml.
+    Only that small part is decompressed; the document body is never touched.
+    Args:
+        file_path (Source): Path to the OOXML package (.docx, .pptx, .xlsx), or a binary stream
+            of it.
+    Returns:
+        Dict[str, str]: Non-empty values for 'title', 'author' and 'created'.
+    """
+    with open_binary(file_path) as stream, zipfile.ZipFile(stream) as package:
+        try:
+            root = ET.fromstring(package.read("docProps/core.xml"))
+        except KeyError:
+            return {}
+    fields = {"title": "dc:title", "author": "dc:creator", "created": "dcterms:created"}
+    metadata = {}
+    for key, tag in fields.items():
+        value = root.findtext(tag, namespaces=CORE_PROPERTIES_NS)
+        if value and value.strip():
+            metadata[key] = value.strip()
+    return metadata
+
+
+def read_relationships(package: zipfile.ZipFile, part_name: str) -> Dict[str, str]:
+    """
+    Map relationship ids of an OOXML part to the package paths of their targets.
+    Args:
+        package (zipfile.ZipFile): The open package.
+        part_name (str): Part whose relationships to read, e.g. 'ppt/presentation.xml'.
+    Returns:
+        Dict[str, str]: rId -> target part name (empty if the part has no relationships).
+    """
+    folder, name = posixpath.split(part_name)
+    try:
+        root = ET.fromstring(package.read(posixpath.join(folder, "_rels", name + ".rels")))
+    except KeyError:
+        return {}
+    targets = {}
+    for rel in root:
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") == "External" or not target:
+            continue
+        if target.startswith("/"):
+            targets[rel.get("Id")] = target.lstrip("/")
+        else:
+            targets[rel.get("Id")] = posixpath.normpath(posixpath.join(folder, target))
+    return targets
+
+
+def _local_name(tag: str) -> str:
+    """Strip the namespace from an XML tag, so transitional and strict OOXML both match."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _relationship_id(elem) -> Optional[str]:
+    """Return an element's namespaced r:id attribute (e.g. on <sheet> or <sldId>), if any."""
+    ids = (v for k, v in elem.attrib.items() if k.startswith("{") and _local_name(k) == "id")
+    return next(ids, None)
+
+
+def _detach(elem, parents: List) -> None:
+    """
+    Drop a handled element from the tree iterparse is building. Clearing it alone would leave an
+    empty element attached to its parent for every block, so the tree would still grow with the
+    document; removing it lets it be freed.
+    Args:
+        elem: The element whose end event was just handled.
+        parents (List): Elements whose end has not been reached yet, innermost last.
+    """
+    if parents:
+        parents[-1].remove(elem)
+    else:
+        elem.clear()
+
+
+def iter_wordml_blocks(part) -> Iterator[str]:
+    """
+    Stream text blocks out of a WordprocessingML part (document, header or footer XML)
+    with an incremental parser. Handled paragraphs and tables are detached from the parsed tree,
+    so memory stays flat regardless of document size.
+    Each body paragraph is one block; each table row is one block with its cells joined by " | ".
+    Args:
+        part: Binary file-like object of the XML part (e.g. from ZipFile.open).
+    Yields:
+        str: Text of each non-empty paragraph or table row.
+    """
+    runs = []        # Text pieces of the paragraph being parsed
+    cell_parts = []  # Paragraph texts of the table cell being parsed
+    row_cells = []   # Cell texts of the table row being parsed
+    table_depth = 0
+    parents = []     # Open ancestors of the current element
+    for event, elem in ET.iterparse(part, events=("start", "end")):
+        name = _local_name(elem.tag)
+        if event == "start":
+            parents.append(elem)
+            if name == "tbl":
+                table_depth += 1
+            continue
+        parents.pop()
+        if name == "t":
+            runs.append(elem.text or "")
+        elif name == "tab":
+            runs.append("\t")
+        elif name in ("br", "cr"):
+            runs.append("\n")
+        elif name == "p":
+            text = "".join(runs).strip()
+            runs = []
+            if table_depth:
+                if text:
+                    cell_parts.append(text)
+            elif text:
+                yield text
+            _detach(elem, parents)
+        elif name == "tc":
+            row_cells.append(" ".join(cell_parts))
+            cell_parts = []
+        elif name == "tr":
+            row = " | ".join(cell for cell in row_cells if cell)
+            row_cells = []
+            if row:
+                yield row
+            _detach(elem, parents)
+        elif name == "tbl":
+            table_depth -= 1
+            _detach(elem, parents)
 
 
 class DocxHandler(BaseHandler):
-    def extract_text(self, file_path: str, **kwargs) -> str:
+    # v2: the streaming backend also extracts table rows.
+    version = "2"
+
+    def __init__(self, backend: str = "auto", include_headers: bool = False):
         """
-        Extract text from a DOCX file using python-docx.
+        Initialize the DOCX handler.
         Args:
-            file_path (str): Path to the DOCX file.
-        Returns:
-            str: Extracted text content.
+            backend (str): 'stream' parses word/document.xml directly with an incremental XML
+                parser; 'python-docx' uses the full python-docx object model; 'auto' streams and
+                falls back to python-docx if the package cannot be streamed.
+            include_headers (bool): If True (stream backend only), header text is yielded before
+                the body and footer text after it.
+        """
+        if backend not in ("auto", "stream", "python-docx"):
+            raise ValueError(f"Unknown DOCX backend '{backend}'.")
+        self.backend = backend
+        self.include_headers = include_headers
+
+    def iter_sections(self, file_path: Source, **kwargs) -> Iterator[str]:
+        """
+        Yield the text of a DOCX file paragraph by paragraph (table rows as single blocks).
+        Args:
+            file_path (Source): Path to the DOCX file, or a binary stream of it.
+        Yields:
+            str: Text of each non-empty paragraph or table row.
         Raises:
             RuntimeError: If the file cannot be read or parsed as DOCX.
         """
+        if self.backend == "python-docx":
+            yield from self._iter_python_docx(file_path)
+            return
+        yielded = False
+        try:
+            for block in self._iter_stream(file_path):
+                yielded = True
+                yield block
+        except Exception as e:
+            # E.g. a main part not at word/document.xml, which python-docx resolves via
+            # relationships. Falling back after partial output would duplicate text, so only fall
+            # back cleanly.
+            recoverable = isinstance(e, (KeyError, ET.ParseError))
+            if self.backend == "stream" or yielded or not recoverable:
+                raise RuntimeError(
+                    f"Failed to extract text from DOCX file '{source_name(file_path)}': {e}"
+                )
+            yield from self._iter_python_docx(file_path)
+
+    def _iter_stream(self, file_path: Source) -> Iterator[str]:
+        """Stream paragraphs and table rows out of the package's XML parts."""
+        with open_binary(file_path) as stream, zipfile.ZipFile(stream) as package:
+            names = package.namelist() if self.include_headers else []
+            headers = sorted(n for n in names if re.match(r"word/header\d*\.xml$", n))
+            footers = sorted(n for n in names if re.match(r"word/footer\d*\.xml$", n))
+            for part_name in headers + ["word/document.xml"] + footers:
+                with package.open(part_name) as part:
+                    yield from iter_wordml_blocks(part)
+
+    def _iter_python_docx(self, file_path: Source) -> Iterator[str]:
+        """Yield non-empty paragraphs using the python-docx object model."""
         try:
             import docx
         except ImportError as e:
             raise RuntimeError("python-docx is required to extract DOCX text. Please install it via 'pip install python-docx'.") from e
         try:
-            doc = docx.Document(file_path)
-            text = "\n".join([p.text for p in doc.paragraphs if p.text])
-            return text.strip()
+            with open_binary(file_path) as stream:
+                doc = docx.Document(stream)
+            for p in doc.paragraphs:
+                if p.text:
+                    yield p.text
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to extract text from DOCX file '{source_name(file_path)}': {e}"
+            )
+
+    def read_metadata(self, file_path: Source, **kwargs) -> Dict[str, str]:
+        """
+        Read title, author and creation date from the DOCX core properties.
+        Args:
+            file_path (Source): Path to the DOCX file, or a binary stream of it.
+        Returns:
+            Dict[str, str]: Non-empty values for 'title', 'author' and 'created'.
+        Raises:
+            RuntimeError: If the file is not a readable DOCX package.
+        """
+        try:
+            return read_core_properties(file_path)
         except Exception as e:
-            raise RuntimeError(f"Failed to extract text from DOCX file '{file_path}': {e}")
+            raise RuntimeError(
+                f"Failed to read metadata from DOCX file '{source_name(file_path)}': {e}"
+            )
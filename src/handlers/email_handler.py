@@ -0,0 +1,209 @@
+import io
+import re
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesFeedParser, BytesParser
+from email.utils import getaddresses, parsedate_to_datetime
+from typing import Dict, Iterator
+
+from .base_handler import BaseHandler, Source, open_binary, source_name
+from .html_handler import iter_html_blocks
+from .registry import default_registry
+
+# Reply/forward markers stripped from subjects ("Re: Fwd: AW: Budget" -> "Budget").
+REPLY_PREFIX = re.compile(
+    r"^\s*((re|fwd?|aw|wg|sv|vs|tr|antw)\s*(\[\d+\])?\s*:\s*)+", re.IGNORECASE
+)
+# Separator line that starts each message in an mbox file.
+MBOX_FROM_LINE = re.compile(rb"^From \S*")
+# mboxrd quoting of body lines that would look like a separator (">From ", ">>From ", ...).
+MBOX_QUOTED_FROM = re.compile(rb"^>(>*From )")
+# Nested message/attachment levels followed before attachments are ignored.
+MAX_ATTACHMENT_DEPTH = 3
+MBOX_BLOCK_SIZE = 64 * 1024
+
+
+def iter_mbox_messages(stream) -> Iterator[EmailMessage]:
+    """
+    Parse an mbox stream one message at a time. Only the message being parsed is held in
+    memory, so exports of any size are read in constant memory.
+    Args:
+        stream: Binary stream positioned at the start of the mbox data.
+    Yields:
+        EmailMessage: Each message, in file order.
+    """
+    parser = None
+    previous_blank = True
+    pending = b""
+    while True:
+        block = stream.read(MBOX_BLOCK_SIZE)
+        lines = (pending + block).split(b"\n")
+        # The last piece has no newline yet; keep it for the next block unless the stream ended.
+        pending = lines.pop() if block else b""
+        if not block and lines == [b""]:
+            lines = []
+        body = []  # Lines of the current message in this block, fed to the parser in one call
+        for raw in lines:
+            line = raw + b"\n"
+            if previous_blank and MBOX_FROM_LINE.match(line):
+                if parser is not None:
+                    parser.feed(b"".join(body))
+                    yield parser.close()
+                body = []
+                parser = BytesFeedParser(policy=policy.default)
+            elif parser is not None:
+                body.append(MBOX_QUOTED_FROM.sub(rb"\1", line) if line.startswith(b">") else line)
+            previous_blank = not raw.rstrip(b"\r")
+        if parser is not None and body:
+            parser.feed(b"".join(body))
+        if not block:
+            break
+    if parser is not None:
+        yield parser.close()
+
+
+def message_metadata(message: EmailMessage) -> Dict[str, str]:
+    """
+    Turn a message's headers into document metadata.
+    Args:
+        message (EmailMessage): Parsed message.
+    Returns:
+        Dict[str, str]: 'title' (subject without reply/forward prefixes), 'author' (sender's display
+        name, or the local part of the address) and 'created' (ISO date), where available.
+    """
+    metadata = {}
+    subject = REPLY_PREFIX.sub("", str(message.get("subject", "") or "")).strip()
+    if subject:
+        metadata["title"] = subject
+    senders = getaddresses([str(message.get("from", "") or "")])
+    if senders:
+        display_name, address = senders[0]
+        author = display_name.strip() or address.split("@", 1)[0]
+        if author:
+            metadata["author"] = author
+    try:
+        metadata["created"] = parsedate_to_datetime(str(message["date"])).isoformat()
+    except (TypeError, ValueError, KeyError):
+        pass
+    return metadata
+
+
+class EmailHandler(BaseHandler):
+    def __init__(self, include_attachments: bool = True):
+        """
+        Initialize the email handler.
+        Args:
+            include_attachments (bool): If True, attachments are extracted through the handler
+                registry after the message body.
+        """
+        self.include_attachments = include_attachments
+
+    def iter_sections(self, file_path: Source, **kwargs) -> Iterator[str]:
+        """
+        Yield the text of an .eml message, or of every message in an mbox file in turn.
+        For each message: a header block (subject, sender, date), the body (plain text preferred,
+        HTML stripped otherwise), then each attachment's text, extracted in memory by the handler
+        the registry picks for it.
+        Args:
+            file_path (Source): Path to the .eml/.mbox file, or a binary stream of it.
+        Yields:
+            str: Header block, body text and attachment sections of each message.
+        Raises:
+            RuntimeError: If the file cannot be read.
+        """
+        try:
+            with open_binary(file_path) as stream:
+                if self._is_mbox(stream):
+                    for message in iter_mbox_messages(stream):
+                        yield from self._iter_message(message, 0)
+                else:
+                    message = BytesParser(policy=policy.default).parse(stream)
+                    yield from self._iter_message(message, 0)
+        except OSError as e:
+            raise RuntimeError(
+                f"Failed to extract text from email file '{source_name(file_path)}': {e}"
+            )
+
+    @staticmethod
+    def _is_mbox(stream) -> bool:
+        """True if the stream starts with an mbox separator line; rewinds the stream."""
+        head = stream.read(5)
+        stream.seek(0)
+        return head == b"From "
+
+    def _iter_message(self, message: EmailMessage, depth: int) -> Iterator[str]:
+        """Yield the header block, body and attachment text of one message."""
+        names = ("Subject", "From", "To", "Date")
+        headers = [f"{name}: {message[name]}" for name in names if message[name]]
+        if headers:
+            yield "\n".join(headers)
+        body = message.get_body(preferencelist=("plain", "html"))
+        if body is not None:
+            try:
+                content = body.get_content()
+            except (LookupError, UnicodeError):
+                content = body.get_payload(decode=True).decode("latin-1")
+            if body.get_content_subtype() == "html":
+                yield from iter_html_blocks([content])
+            elif content.strip():
+                yield content.strip()
+        if self.include_attachments and depth < MAX_ATTACHMENT_DEPTH:
+            for attachment in message.iter_attachments():
+                yield from self._iter_attachment(attachment, depth + 1)
+
+    def _iter_attachment(self, part: EmailMessage, depth: int) -> Iterator[str]:
+        """Yield the text of one attachment, routed through the handler registry in memory."""
+        if part.get_content_type() == "message/rfc822":
+            for nested in part.iter_parts():
+                yield from self._iter_message(nested, depth)
+            return
+        filename = part.get_filename() or ""
+        data = part.get_payload(decode=True)
+        if not data:
+            return
+        stream = io.BytesIO(data)
+        stream.name = filename
+        handler_cls = default_registry.resolve(stream, filename)
+        if handler_cls is None:
+            return
+        handler = handler_cls()
+        if isinstance(handler, EmailHandler):
+            handler.include_attachments = self.include_attachments
+            stream.seek(0)
+            attached = BytesParser(policy=policy.default).parse(stream)
+            sections = handler._iter_message(attached, depth)
+        else:
+            sections = handler.iter_sections(stream)
+        try:
+            first = True
+            for section in sections:
+                if first:
+                    yield f"[Attachment: {filename or handler_cls.__name__}]"
+                    first = False
+                yield section
+        except RuntimeError:
+            return  # An unreadable attachment should not lose the message text already yielded.
+        finally:
+            sections.close()
+
+    def read_metadata(self, file_path: Source, **kwargs) -> Dict[str, str]:
+        """
+        Read title (subject), author (sender) and date from the headers of an .eml message.
+        Only the header block is parsed. mbox files hold many messages and return no metadata.
+        Args:
+            file_path (Source): Path to the .eml/.mbox file, or a binary stream of it.
+        Returns:
+            Dict[str, str]: Non-empty values for 'title', 'author' and 'created'.
+        Raises:
+            RuntimeError: If the file cannot be read.
+        """
+        try:
+            with open_binary(file_path) as stream:
+                if self._is_mbox(stream):
+                    return {}
+                message = BytesParser(policy=policy.default).parse(stream, headersonly=True)
+        except OSError as e:
+            raise RuntimeError(
+                f"Failed to read metadata from email file '{source_name(file_path)}': {e}"
+            )
+        return message_metadata(message)
@@ -0,0 +1,108 @@
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List
+from urllib.parse import unquote
+
+from .base_handler import BaseHandler, Source, open_binary, source_name
+from .docx_handler import _local_name
+from .html_handler import iter_html_blocks
+from .txt_handler import TxtHandler
+
+CONTAINER_NS = {"c": "urn:oasis:names:tc:opendocument:xmlns:container"}
+OPF_NS = {"opf": "http://www.idpf.org/2007/opf", "dc": "http://purl.org/dc/elements/1.1/"}
+XHTML_MEDIA_TYPES = ("application/xhtml+xml", "text/html")
+
+
+def read_package_document(package: zipfile.ZipFile):
+    """
+    Locate and parse the EPUB package document (OPF) named in META-INF/container.xml.
+    Args:
+        package (zipfile.ZipFile): The open EPUB container.
+    Returns:
+        tuple: (OPF root element, OPF part name).
+    """
+    container = ET.fromstring(package.read("META-INF/container.xml"))
+    rootfile = container.find(".//c:rootfile", CONTAINER_NS)
+    if rootfile is None or not rootfile.get("full-path"):
+        raise KeyError("META-INF/container.xml names no package document")
+    opf_name = rootfile.get("full-path")
+    return ET.fromstring(package.read(opf_name)), opf_name
+
+
+def spine_documents(opf: ET.Element, opf_name: str) -> List[str]:
+    """
+    Return the part names of the book's content documents in reading (spine) order, leaving out
+    the navigation document and items marked linear="no" (notes, covers and other back matter).
+    Args:
+        opf (ET.Element): Root of the package document.
+        opf_name (str): Part name of the package document; hrefs are relative to its folder.
+    Returns:
+        List[str]: Part names of XHTML documents.
+    """
+    folder = posixpath.dirname(opf_name)
+    manifest = {}
+    for item in opf.iter():
+        if _local_name(item.tag) == "item":
+            properties = (item.get("properties") or "").split()
+            if item.get("media-type") in XHTML_MEDIA_TYPES and "nav" not in properties:
+                href = unquote(item.get("href", ""))
+                manifest[item.get("id")] = posixpath.normpath(posixpath.join(folder, href))
+    documents = []
+    for itemref in opf.iter():
+        if _local_name(itemref.tag) == "itemref" and itemref.get("linear", "yes") != "no":
+            if itemref.get("idref") in manifest:
+                documents.append(manifest[itemref.get("idref")])
+    return documents
+
+
+class EpubHandler(BaseHandler):
+    def iter_sections(self, file_path: Source, **kwargs) -> Iterator[str]:
+        """
+        Yield the main text of an EPUB book in reading order, streaming one spine document at a
+        time through the HTML boilerplate stripper.
+        Args:
+            file_path (Source): Path to the EPUB file, or a binary stream of it.
+        Yields:
+            str: Text of each non-empty block (heading, paragraph, list item, ...).
+        Raises:
+            RuntimeError: If the file cannot be read or parsed as EPUB.
+        """
+        try:
+            with open_binary(file_path) as stream, zipfile.ZipFile(stream) as package:
+                opf, opf_name = read_package_document(package)
+                names = set(package.namelist())
+                for document in spine_documents(opf, opf_name):
+                    if document not in names:
+                        continue
+                    with package.open(document) as part:
+                        yield from iter_html_blocks(TxtHandler().iter_sections(part))
+        except (OSError, KeyError, RuntimeError, zipfile.BadZipFile, ET.ParseError) as e:
+            raise RuntimeError(
+                f"Failed to extract text from EPUB file '{source_name(file_path)}': {e}"
+            )
+
+    def read_metadata(self, file_path: Source, **kwargs) -> Dict[str, str]:
+        """
+        Read title, author and date from the EPUB package document.
+        Args:
+            file_path (Source): Path to the EPUB file, or a binary stream of it.
+        Returns:
+            Dict[str, str]: Non-empty values for 'title', 'author' and 'created'.
+        Raises:
+            RuntimeError: If the file is not a readable EPUB container.
+        """
+        try:
+            with open_binary(file_path) as stream, zipfile.ZipFile(stream) as package:
+                opf, _ = read_package_document(package)
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to read metadata from EPUB file '{source_name(file_path)}': {e}"
+            )
+        fields = {"title": ".//dc:title", "author": ".//dc:creator", "created": ".//dc:date"}
+        metadata = {}
+        for key, path in fields.items():
+            value = opf.findtext(path, namespaces=OPF_NS)
+            if value and value.strip():
+                metadata[key] = value.strip()
+        return metadata
@@ -0,0 +1,221 @@
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .base_handler import BaseHandler, Source, source_name
+from .txt_handler import TxtHandler
+
+# Elements whose whole subtree is markup or page chrome rather than main text.
+SKIPPED_ELEMENTS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object",
+    "nav", "aside", "footer", "form", "button", "select",
+}
+# Whole class/id/role tokens that mark boilerplate containers on pages without semantic elements.
+# Tokens are matched exactly: "sidebar" is chrome, "has-sidebar" or "share-price-report" is not.
+BOILERPLATE_HINTS = frozenset({
+    "nav", "navbar", "menu", "main-menu", "sidebar", "footer", "site-footer", "cookie", "cookies",
+    "cookie-banner", "cookie-consent", "consent", "breadcrumb", "breadcrumbs", "share",
+    "share-buttons", "social", "social-links", "advert", "ads", "banner", "navigation",
+    "contentinfo", "complementary", "skip-link",
+})
+# Containers of the main text itself; hints on them (e.g. <body class="has-sidebar">) are ignored.
+UNHINTED_ELEMENTS = {"html", "body", "main", "article"}
+# Elements whose end tag may be omitted. A skipped subtree waits for its end tag, so hints never
+# start skipping on these (an unclosed <li class="menu"> would swallow the rest of the page).
+OPTIONAL_END_ELEMENTS = {
+    "li", "p", "dt", "dd", "tr", "td", "th", "thead", "tbody", "tfoot", "option", "optgroup",
+    "colgroup", "rt", "rp", "caption", "head",
+}
+# Elements that end the current block of text.
+BLOCK_ELEMENTS = {
+    "title", "p", "div", "section", "article", "main", "header", "h1", "h2", "h3", "h4", "h5", "h6",
+    "li", "ul", "ol", "dl", "dt", "dd", "tr", "table", "blockquote", "pre", "figcaption", "br",
+    "hr",
+}
+# Elements without an end tag; they must never open a skipped subtree.
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track",
+    "wbr",
+}
+
+
+class HtmlTextExtractor(HTMLParser):
+    """
+    Incremental HTML-to-text converter: feed markup in chunks and collect finished text blocks.
+    Scripts, styles, navigation, forms and containers whose class/id/role marks them as page
+    chrome are dropped as they are parsed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[str] = []
+        self._current: List[str] = []
+        self._skip_tag: Optional[str] = None
+        self._skip_depth = 0
+        self._pre_depth = 0
+
+    def _flush(self) -> None:
+        text = "".join(self._current)
+        self._current = []
+        text = text.strip() if self._pre_depth else re.sub(r"\s+", " ", text).strip()
+        if text:
+            self.blocks.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag not in VOID_ELEMENTS:
+            if tag in SKIPPED_ELEMENTS or self._is_hinted_boilerplate(tag, attrs):
+                self._flush()
+                self._skip_tag, self._skip_depth = tag, 1
+                return
+        if tag in BLOCK_ELEMENTS:
+            self._flush()
+        elif tag in ("td", "th") and self._current:
+            self._current.append(" | ")
+        if tag == "pre":
+            self._pre_depth += 1
+
+    @staticmethod
+    def _is_hinted_boilerplate(tag, attrs) -> bool:
+        """True if a class/id/role token marks the element as chrome that can safely be skipped."""
+        if tag in UNHINTED_ELEMENTS or tag in OPTIONAL_END_ELEMENTS:
+            return False
+        tokens = {
+            token.lower()
+            for name, value in attrs if name in ("class", "id", "role")
+            for token in (value or "").split()
+        }
+        return not tokens.isdisjoint(BOILERPLATE_HINTS)
+
+    def handle_endtag(self, tag):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._skip_tag = None
+            return
+        if tag in BLOCK_ELEMENTS:
+            self._flush()
+        if tag == "pre" and self._pre_depth:
+            self._pre_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_tag:
+            self._current.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def iter_html_blocks(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Convert streamed HTML/XHTML to main-text blocks, yielding each block as soon as it is complete.
+    Args:
+        chunks (Iterable[str]): Decoded markup, in pieces of any size.
+    Yields:
+        str: Text of each non-empty block (heading, paragraph, list item, table row, ...).
+    """
+    parser = HtmlTextExtractor()
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.blocks
+        parser.blocks = []
+    parser.close()
+    yield from parser.blocks
+
+
+class HtmlHeadParser(HTMLParser):
+    """Collects <title> and author/date <meta> tags, stopping interest at <body>."""
+
+    META_FIELDS = {
+        "author": "author", "dc.creator": "author", "citation_author": "author",
+        "dc.title": "title", "citation_title": "title", "og:title": "title",
+        "date": "created", "dc.date": "created", "citation_date": "created",
+        "article:published_time": "created",
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.metadata: Dict[str, str] = {}
+        self.done = False
+        self._in_title = False
+        self._title: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.done = True
+        elif tag == "title" and not self.done:
+            self._in_title = True
+        elif tag == "meta" and not self.done:
+            attrs = dict(attrs)
+            key = self.META_FIELDS.get((attrs.get("name") or attrs.get("property") or "").lower())
+            content = (attrs.get("content") or "").strip()
+            if key and content:
+                self.metadata.setdefault(key, content)
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "head":
+            self.done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title.append(data)
+
+    @property
+    def title(self) -> str:
+        return re.sub(r"\s+", " ", "".join(self._title)).strip()
+
+
+class HtmlHandler(BaseHandler):
+    def iter_sections(self, file_path: Source, **kwargs) -> Iterator[str]:
+        """
+        Yield the main text of an HTML page block by block, stripping markup and boilerplate
+        (scripts, styles, navigation, forms) while streaming.
+        Args:
+            file_path (Source): Path to the HTML file, or a binary stream of it.
+        Yields:
+            str: Text of each non-empty block; the <title> comes first when present.
+        Raises:
+            RuntimeError: If the file cannot be read.
+        """
+        try:
+            yield from iter_html_blocks(TxtHandler().iter_sections(file_path))
+        except RuntimeError as e:
+            raise RuntimeError(
+                f"Failed to extract text from HTML file '{source_name(file_path)}': {e}"
+            )
+
+    def read_metadata(self, file_path: Source, **kwargs) -> Dict[str, str]:
+        """
+        Read title, author and date from the page's <head> (<title> and common <meta> tags).
+        Parsing stops at <body>, so only the start of the file is read.
+        Args:
+            file_path (Source): Path to the HTML file, or a binary stream of it.
+        Returns:
+            Dict[str, str]: Non-empty values for 'title', 'author' and 'created'.
+        Raises:
+            RuntimeError: If the file cannot be read.
+        """
+        parser = HtmlHeadParser()
+        sections = TxtHandler().iter_sections(file_path, block_size=16 * 1024)
+        try:
+            for chunk in sections:
+                parser.feed(chunk)
+                if parser.done:
+                    break
+        except RuntimeError as e:
+            raise RuntimeError(
+                f"Failed to read metadata from HTML file '{source_name(file_path)}': {e}"
+            )
+        finally:
+            sections.close()
+        metadata = dict(parser.metadata)
+        if parser.title:
+            metadata.setdefault("title", parser.title)
+        return metadata
@@ -0,0 +1,174 @@
+import re
+from typing import Dict, Iterable, Iterator, List
+
+from .base_handler import BaseHandler, Source, source_name
+from .html_handler import HtmlTextExtractor
+from .txt_handler import TxtHandler
+
+FENCE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+LINK_DEFINITION = re.compile(r"^\s{0,3}\[[^\]]+\]:\s*\S+")
+TABLE_DIVIDER = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+HORIZONTAL_RULE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+SETEXT_UNDERLINE = re.compile(r"^\s{0,3}=+\s*$")
+# Inline markup, applied in order: images keep their alt text, links their label.
+INLINE_RULES = (
+    (re.compile(r"!\[([^\]]*)\]\([^)]*\)"), r"\1"),
+    (re.compile(r"\[([^\]]+)\]\([^)]*\)"), r"\1"),
+    (re.compile(r"\[([^\]]+)\]\[[^\]]*\]"), r"\1"),
+    (re.compile(r"<https?://[^>]+>"), ""),
+    (re.compile(r"`([^`]*)`"), r"\1"),
+    (re.compile(r"(\*\*|__)(.+?)\1"), r"\2"),
+    (re.compile(r"(?<![\w*])([*_])(?!\s)(.+?)(?<!\s)\1(?![\w*])"), r"\2"),
+    (re.compile(r"~~(.+?)~~"), r"\1"),
+)
+# Block prefixes: ATX heading marks, blockquote markers and list bullets/numbers.
+LINE_PREFIX = re.compile(r"^\s*(#{1,6}\s+|>\s?)*(([-*+]|\d+[.)])\s+(\[[ xX]\]\s+)?)?")
+FRONT_MATTER_FIELD = re.compile(r"^(title|author|date)\s*:\s*(.+?)\s*$", re.IGNORECASE)
+# Lines searched for the end of front matter before giving up on metadata.
+FRONT_MATTER_MAX_LINES = 200
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Split streamed text into lines without line endings, carrying partial lines across chunks."""
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + chunk).splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            yield line.rstrip("\r\n")
+    if pending:
+        yield pending
+
+
+def _strip_inline(line: str) -> str:
+    """Remove inline Markdown and HTML markup from a line of text."""
+    if "<" in line:
+        parser = HtmlTextExtractor()
+        parser.feed(line)
+        parser.close()
+        line = " ".join(parser.blocks)
+    for pattern, replacement in INLINE_RULES:
+        line = pattern.sub(replacement, line)
+    return line.strip()
+
+
+def iter_markdown_blocks(lines: Iterable[str], include_code: bool = False) -> Iterator[str]:
+    """
+    Convert streamed Markdown lines to plain-text blocks.
+    YAML front matter, link definitions, rules and (unless include_code) fenced code blocks are
+    dropped; inline markup is stripped; table rows keep their cells separated by " | ".
+    Args:
+        lines (Iterable[str]): Lines of Markdown.
+        include_code (bool): If True, keep the contents of fenced code blocks.
+    Yields:
+        str: Text of each paragraph, heading, list item or table row.
+    """
+    paragraph: List[str] = []
+    fence = None
+    in_front_matter = False
+    for number, line in enumerate(lines):
+        if number == 0 and line.strip() == "---":
+            in_front_matter = True
+            continue
+        if in_front_matter:
+            in_front_matter = line.strip() not in ("---", "...")
+            continue
+        match = FENCE.match(line)
+        if fence:
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence):
+                fence = None
+            elif include_code and line.strip():
+                yield line.rstrip()
+            continue
+        if match:
+            fence = match.group(1)
+            if paragraph:
+                yield " ".join(paragraph)
+                paragraph = []
+            continue
+        stripped = line.strip()
+        if not stripped or any(
+            pattern.match(line)
+            for pattern in (LINK_DEFINITION, TABLE_DIVIDER, HORIZONTAL_RULE, SETEXT_UNDERLINE)
+        ):
+            if paragraph:
+                yield " ".join(paragraph)
+                paragraph = []
+            continue
+        block_start = LINE_PREFIX.match(line).group(0)
+        text = _strip_inline(line[len(block_start):])
+        if stripped.startswith("|"):
+            text = " | ".join(cell.strip() for cell in text.strip("| ").split("|") if cell.strip())
+        # Headings, list items and table rows are blocks of their own.
+        if block_start.strip() or stripped.startswith("|"):
+            if paragraph:
+                yield " ".join(paragraph)
+                paragraph = []
+            if text:
+                yield text
+        elif text:
+            paragraph.append(text)
+    if paragraph:
+        yield " ".join(paragraph)
+
+
+class MarkdownHandler(BaseHandler):
+    def __init__(self, include_code: bool = False):
+        """
+        Initialize the Markdown handler.
+        Args:
+            include_code (bool): If True, keep the contents of fenced code blocks.
+        """
+        self.include_code = include_code
+
+    def iter_sections(self, file_path: Source, **kwargs) -> Iterator[str]:
+        """
+        Yield the plain text of a Markdown file block by block, stripping markup while streaming.
+        Args:
+            file_path (Source): Path to the Markdown file, or a binary stream of it.
+        Yields:
+            str: Text of each paragraph, heading, list item or table row.
+        Raises:
+            RuntimeError: If the file cannot be read.
+        """
+        try:
+            lines = iter_lines(TxtHandler().iter_sections(file_path))
+            yield from iter_markdown_blocks(lines, include_code=self.include_code)
+        except RuntimeError as e:
+            raise RuntimeError(
+                f"Failed to extract text from Markdown file '{source_name(file_path)}': {e}"
+            )
+
+    def read_metadata(self, file_path: Source, **kwargs) -> Dict[str, str]:
+        """
+        Read title, author and date from YAML front matter (simple 'key: value' lines).
+        Args:
+            file_path (Source): Path to the Markdown file, or a binary stream of it.
+        Returns:
+            Dict[str, str]: Non-empty values for 'title', 'author' and 'created'.
+        Raises:
+            RuntimeError: If the file cannot be read.
+        """
+        metadata = {}
+        sections = TxtHandler().iter_sections(file_path, block_size=4096)
+        try:
+            for number, line in enumerate(iter_lines(sections)):
+                if number == 0:
+                    if line.strip() != "---":
+                        break
+                    continue
+                if line.strip() in ("---", "...") or number > FRONT_MATTER_MAX_LINES:
+                    break
+                match = FRONT_MATTER_FIELD.match(line)
+                if match:
+                    key = {"date": "created"}.get(match.group(1).lower(), match.group(1).lower())
+                    value = match.group(2).strip("'\"").strip()
+                    if value:
+                        metadata[key] = value
+        except RuntimeError as e:
+            raise RuntimeError(
+                f"Failed to read metadata from Markdown file '{source_name(file_path)}': {e}"
+            )
+        finally:
+            sections.close()
+        return metadata
@@ -0,0 +1,137 @@
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator
+
+from .base_handler import BaseHandler, Source, open_binary, source_name
+from .docx_handler import _detach, _local_name
+
+# Namespaces of the ODF metadata part (meta.xml).
+ODF_META_NS = {
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "meta": "urn:oasis:names:tc:opendocument:xmlns:meta:1.0",
+}
+ODF_TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+# Inline elements whose content is not part of the paragraph's own text.
+SKIPPED_INLINE = ("note", "annotation", "tracked-changes")
+
+
+def _paragraph_text(elem) -> str:
+    """Text of an ODF paragraph or heading, expanding <text:s>, <text:tab> and <text:line-break>."""
+    parts = [elem.text or ""]
+    for child in elem:
+        name = _local_name(child.tag)
+        if name == "s":
+            parts.append(" " * int(child.get(f"{{{ODF_TEXT_NS}}}c", "1")))
+        elif name == "tab":
+            parts.append("\t")
+        elif name == "line-break":
+            parts.append("\n")
+        elif name not in SKIPPED_INLINE:
+            parts.append(_paragraph_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def iter_odf_blocks(part) -> Iterator[str]:
+    """
+    Stream text blocks out of an ODF content.xml part with an incremental parser.
+    Each heading or paragraph is one block; each table row is one block with its cells joined
+    by " | ".
+    Args:
+        part: Binary file-like object of content.xml.
+    Yields:
+        str: Text of each non-empty heading, paragraph or table row.
+    """
+    cell_parts = []  # Paragraph texts of the table cell being parsed
+    row_cells = []   # Cell texts of the table row being parsed
+    table_depth = 0
+    paragraph_depth = 0
+    parents = []  # Open ancestors of the current element
+    for event, elem in ET.iterparse(part, events=("start", "end")):
+        name = _local_name(elem.tag)
+        if event == "start":
+            parents.append(elem)
+            if name == "table":
+                table_depth += 1
+            elif name in ("p", "h"):
+                paragraph_depth += 1
+            continue
+        parents.pop()
+        if name in ("p", "h"):
+            paragraph_depth -= 1
+            if paragraph_depth:
+                continue  # Nested in a note or frame; its text belongs to the enclosing paragraph.
+            text = _paragraph_text(elem).strip()
+            if table_depth:
+                if text:
+                    cell_parts.append(text)
+            elif text:
+                yield text
+            _detach(elem, parents)
+        elif name == "table-cell":
+            row_cells.append(" ".join(cell_parts))
+            cell_parts = []
+        elif name == "table-row":
+            row = " | ".join(cell for cell in row_cells if cell)
+            row_cells = []
+            if row:
+                yield row
+            _detach(elem, parents)
+        elif name == "table":
+            table_depth -= 1
+            _detach(elem, parents)
+
+
+class OdtHandler(BaseHandler):
+    def iter_sections(self, file_path: Source, **kwargs) -> Iterator[str]:
+        """
+        Yield the text of an ODT file paragraph by paragraph, streamed from content.xml.
+        Args:
+            file_path (Source): Path to the ODT file, or a binary stream of it.
+        Yields:
+            str: Text of each non-empty heading, paragraph or table row.
+        Raises:
+            RuntimeError: If the file cannot be read or parsed as ODT.
+        """
+        try:
+            with open_binary(file_path) as stream, zipfile.ZipFile(stream) as package:
+                with package.open("content.xml") as part:
+                    yield from iter_odf_blocks(part)
+        except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+            raise RuntimeError(
+                f"Failed to extract text from ODT file '{source_name(file_path)}': {e}"
+            )
+
+    def read_metadata(self, file_path: Source, **kwargs) -> Dict[str, str]:
+        """
+        Read title, author and creation date from the ODT meta.xml part.
+        Args:
+            file_path (Source): Path to the ODT file, or a binary stream of it.
+        Returns:
+            Dict[str, str]: Non-empty values for 'title', 'author' and 'created'.
+        Raises:
+            RuntimeError: If the file is not a readable ODT package.
+        """
+        try:
+            with open_binary(file_path) as stream, zipfile.ZipFile(stream) as package:
+                try:
+                    root = ET.fromstring(package.read("meta.xml"))
+                except KeyError:
+                    return {}
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to read metadata from ODT file '{source_name(file_path)}': {e}"
+            )
+        fields = {
+            "title": ".//dc:title",
+            "author": ".//meta:initial-creator",
+            "created": ".//meta:creation-date",
+        }
+        metadata = {}
+        for key, path in fields.items():
+            value = root.findtext(path, namespaces=ODF_META_NS)
+            if key == "author" and not (value and value.strip()):
+                value = root.findtext(".//dc:creator", namespaces=ODF_META_NS)
+            if value and value.strip():
+                metadata[key] = value.strip()
+        return metadata
@@ -1,14 +1,54 @@
-from .base_handler import BaseHandler
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+from .base_handler import (
+    BaseHandler,
+    Source,
+    TriageReport,
+    ROUTE_SKIP,
+    ROUTE_FAST,
+    ROUTE_FULL,
+    ROUTE_OCR,
+    source_name,
+    source_size,
+)
+from .text_cleanup import PAGE_BREAK
+
+class PdfTriageState(NamedTuple):
+    """Parse state handed from triage to extraction: the open reader and the page texts sampled."""
+    reader: Any
+    page_texts: Dict[int, str]
+
 
 class PdfHandler(BaseHandler):
-    def extract_text(self, file_path: str, **kwargs) -> str:
+    # Pages are joined with a page break so preprocess can find running headers and footers.
+    section_separator = PAGE_BREAK
+    version = "2"
+    # Documents longer than this are routed to the fast path by triage.
+    LARGE_DOCUMENT_PAGES = 300
+    # Pages extracted for documents on the fast path.
+    FAST_PATH_PAGES = 5
+    # Minimum characters on a sampled page for the PDF to count as having a text layer.
+    MIN_TEXT_CHARS = 20
+
+    def iter_sections(
+        self,
+        file_path: Source,
+        max_pages: Optional[int] = None,
+        triage_state: Optional[PdfTriageState] = None,
+        **kwargs,
+    ) -> Iterator[str]:
         """
-        Extracts text from a PDF file using pypdf.
+        Yield the text of a PDF file page by page using pypdf.
+        Pages are only parsed when the caller asks for them, so stopping early skips the rest
+        of the document.
         Args:
-            file_path (str): Path to the PDF file.
+            file_path (Source): Path to the PDF file, or a binary stream of it.
+            max_pages (Optional[int]): Maximum number of pages to parse. None parses all pages.
+            triage_state (Optional[PdfTriageState]): State from triage of the same file; its
+                reader and already-extracted sample pages are reused.
             **kwargs: Additional options (not used).
-        Returns:
-            str: Extracted text content from all pages.
+        Yields:
+            str: Extracted text of each page (empty for pages without a text layer).
         Raises:
             RuntimeError: If the file cannot be read or parsed as PDF.
         """
@@ -17,13 +57,133 @@ class PdfHandler(BaseHandler):
         except ImportError as e:
             raise RuntimeError("pypdf is required to extract PDF text. Please install it via 'pip install pypdf'.") from e
 
+        reader, page_texts = triage_state or (None, {})
+        try:
+            if reader is None:
+                reader = PdfReader(self._rewind(file_path))
+            for index, page in enumerate(reader.pages):
+                if max_pages is not None and index >= max_pages:
+                    break
+                text = page_texts.get(index)
+                yield (page.extract_text() or "") if text is None else text
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to extract text from PDF file '{source_name(file_path)}': {e}"
+            )
+
+    def read_metadata(self, file_path: Source, **kwargs) -> Dict[str, str]:
+        """
+        Read title, author and creation date from the PDF document info dictionary,
+        falling back to XMP metadata. Page content is never parsed.
+        Args:
+            file_path (Source): Path to the PDF file, or a binary stream of it.
+        Returns:
+            Dict[str, str]: Non-empty values for 'title', 'author' and 'created'.
+        Raises:
+            RuntimeError: If the file cannot be read or parsed as PDF.
+        """
+        try:
+            from pypdf import PdfReader
+        except ImportError as e:
+            raise RuntimeError(
+                "pypdf is required to read PDF metadata. "
+                "Please install it via 'pip install pypdf'."
+            ) from e
+
+        try:
+            reader = PdfReader(self._rewind(file_path))
+            info = reader.metadata
+            metadata = {
+                "title": info.title if info else None,
+                "author": info.author if info else None,
+                "created": info.creation_date_raw if info else None,
+            }
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to read metadata from PDF file '{source_name(file_path)}': {e}"
+            )
+        if not all(metadata.values()):
+            try:
+                xmp = reader.xmp_metadata
+            except Exception:
+                xmp = None  # Malformed XMP is common; the info dictionary is still usable.
+            if xmp is not None:
+                titles = xmp.dc_title or {}
+                creators = xmp.dc_creator or []
+                created = xmp.xmp_create_date
+                title = titles.get("x-default") or next(iter(titles.values()), None)
+                metadata["title"] = metadata["title"] or title
+                metadata["author"] = metadata["author"] or "; ".join(creators)
+                metadata["created"] = metadata["created"] or (created and created.isoformat())
+        values = {key: str(value).strip() for key, value in metadata.items() if value}
+        return {key: value for key, value in values.items() if value}
+
+    def triage(self, file_path: Source, sample_pages: int = 3, **kwargs) -> TriageReport:
+        """
+        Quickly assess a PDF before extraction: size, page count, encryption and whether a text
+        layer exists (by extracting a few evenly spaced sample pages).
+        Files that can never yield text (empty, truncated, zero pages, encrypted with a user
+        password) are routed to skip; scans without a text layer are routed to OCR; very long
+        documents are routed to the fast path with a small page budget; everything else is
+        processed in full.
+        Args:
+            file_path (Source): Path to the PDF file, or a binary stream of it.
+            sample_pages (int): Number of pages sampled for the text-layer check.
+        Returns:
+            TriageReport: The routing decision and the facts it was based on.
+        Raises:
+            RuntimeError: If pypdf is not installed.
+        """
+        try:
+            from pypdf import PdfReader
+        except ImportError as e:
+            raise RuntimeError(
+                "pypdf is required to triage PDF files. "
+                "Please install it via 'pip install pypdf'."
+            ) from e
+
         try:
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            return text.strip()
+            size = source_size(file_path)
+        except OSError as e:
+            return TriageReport(ROUTE_SKIP, f"unreadable file: {e}")
+        if size == 0:
+            return TriageReport(ROUTE_SKIP, "empty file")
+        try:
+            reader = PdfReader(self._rewind(file_path))
+            encrypted = reader.is_encrypted
+            if encrypted and not reader.decrypt(""):
+                return TriageReport(ROUTE_SKIP, "encrypted", encrypted=True, size_bytes=size)
+            page_count = len(reader.pages)
         except Exception as e:
-            raise RuntimeError(f"Failed to extract text from PDF file '{file_path}': {e}")
+            return TriageReport(ROUTE_SKIP, f"truncated or malformed PDF: {e}", size_bytes=size)
+        if page_count == 0:
+            return TriageReport(ROUTE_SKIP, "no pages", encrypted=encrypted, size_bytes=size)
+        count = max(1, min(sample_pages, page_count))
+        indices = sorted({round(i * (page_count - 1) / max(1, count - 1)) for i in range(count)})
+        has_text = False
+        page_texts = {}
+        for index in indices:
+            try:
+                page_texts[index] = reader.pages[index].extract_text() or ""
+            except Exception:
+                continue
+            if len(page_texts[index].strip()) >= self.MIN_TEXT_CHARS:
+                has_text = True
+                break
+        facts = dict(page_count=page_count, encrypted=encrypted, has_text=has_text, size_bytes=size)
+        if not has_text:
+            return TriageReport(ROUTE_OCR, "no text layer on sampled pages", **facts)
+        # Extraction continues from this reader and sample instead of parsing the file again.
+        facts["parsed"] = PdfTriageState(reader, page_texts)
+        if page_count > self.LARGE_DOCUMENT_PAGES:
+            return TriageReport(
+                ROUTE_FAST, f"{page_count} pages", max_pages=self.FAST_PATH_PAGES, **facts
+            )
+        return TriageReport(ROUTE_FULL, f"{page_count} pages", **facts)
+
+    @staticmethod
+    def _rewind(file_path: Source) -> Source:
+        """Return the source ready for PdfReader: streams are rewound, paths passed through."""
+        if not isinstance(file_path, str):
+            file_path.seek(0)
+        return file_path
@@ -0,0 +1,135 @@
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Tuple
+
+from .base_handler import BaseHandler, Source, open_binary, source_name
+from .docx_handler import (
+    _detach,
+    _local_name,
+    _relationship_id,
+    read_core_properties,
+    read_relationships,
+)
+
+# Placeholder types that hold a slide's title.
+TITLE_PLACEHOLDERS = ("title", "ctrTitle")
+# Slides whose titles are collected up-front; later slides keep their title with their body.
+MAX_TITLE_SLIDES = 50
+
+
+def iter_slide_shapes(part) -> Iterator[Tuple[bool, str]]:
+    """
+    Stream the text of each shape (text box, placeholder or table) on a slide.
+    Args:
+        part: Binary file-like object of a slide XML part.
+    Yields:
+        Tuple[bool, str]: (is_title, text) for each shape with text; paragraphs are joined by
+        newlines.
+    """
+    runs = []        # Text pieces of the paragraph being parsed
+    paragraphs = []  # Paragraph texts of the shape being parsed
+    is_title = False
+    parents = []  # Open ancestors of the current element
+    for event, elem in ET.iterparse(part, events=("start", "end")):
+        name = _local_name(elem.tag)
+        if event == "start":
+            parents.append(elem)
+            if name in ("sp", "graphicFrame"):
+                is_title = False
+            continue
+        parents.pop()
+        if name == "t":
+            runs.append(elem.text or "")
+        elif name == "br":
+            runs.append("\n")
+        elif name == "ph":
+            is_title = is_title or elem.get("type") in TITLE_PLACEHOLDERS
+        elif name == "p":
+            text = "".join(runs).strip()
+            runs = []
+            if text:
+                paragraphs.append(text)
+        elif name in ("sp", "graphicFrame"):
+            if paragraphs:
+                yield is_title and name == "sp", "\n".join(paragraphs)
+            paragraphs = []
+            _detach(elem, parents)
+
+
+class PptxHandler(BaseHandler):
+    def iter_sections(
+        self, file_path: Source, max_title_slides: int = MAX_TITLE_SLIDES, **kwargs
+    ) -> Iterator[str]:
+        """
+        Yield the text of a PPTX deck straight from its slide XML parts.
+        The titles of the first slides come first (one section, most useful for naming),
+        followed by the remaining text of each slide in presentation order.
+        Args:
+            file_path (Source): Path to the PPTX file, or a binary stream of it.
+            max_title_slides (int): Number of slides whose titles are collected up-front.
+        Yields:
+            str: The slide titles, then the body text of each slide.
+        Raises:
+            RuntimeError: If the file cannot be read or parsed as PPTX.
+        """
+        try:
+            with open_binary(file_path) as stream, zipfile.ZipFile(stream) as package:
+                slides = self._slide_parts(package)
+                titles = []
+                for slide in slides[:max_title_slides]:
+                    with package.open(slide) as part:
+                        shapes = list(iter_slide_shapes(part))
+                    titles.extend(text for is_title, text in shapes if is_title)
+                if titles:
+                    yield "\n".join(titles)
+                # Slides are re-parsed for their bodies; they are small, and the budget usually
+                # stops extraction after the first few.
+                for index, slide in enumerate(slides):
+                    titled = index < max_title_slides
+                    with package.open(slide) as part:
+                        shapes = list(iter_slide_shapes(part))
+                    body = [text for is_title, text in shapes if not (is_title and titled)]
+                    if body:
+                        yield "\n".join(body)
+        except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+            raise RuntimeError(
+                f"Failed to extract text from PPTX file '{source_name(file_path)}': {e}"
+            )
+
+    @staticmethod
+    def _slide_parts(package: zipfile.ZipFile) -> List[str]:
+        """Return slide part names in presentation order (numeric if the deck has no slide list)."""
+        names = set(package.namelist())
+        try:
+            root = ET.fromstring(package.read("ppt/presentation.xml"))
+            rels = read_relationships(package, "ppt/presentation.xml")
+            ordered = []
+            for elem in root.iter():
+                if _local_name(elem.tag) == "sldId":
+                    rel_id = _relationship_id(elem)
+                    if rels.get(rel_id) in names:
+                        ordered.append(rels[rel_id])
+            if ordered:
+                return ordered
+        except KeyError:
+            pass
+        slides = [n for n in names if re.match(r"ppt/slides/slide\d+\.xml$", n)]
+        return sorted(slides, key=lambda n: int(re.search(r"(\d+)\.xml$", n).group(1)))
+
+    def read_metadata(self, file_path: Source, **kwargs) -> Dict[str, str]:
+        """
+        Read title, author and creation date from the PPTX core properties.
+        Args:
+            file_path (Source): Path to the PPTX file, or a binary stream of it.
+        Returns:
+            Dict[str, str]: Non-empty values for 'title', 'author' and 'created'.
+        Raises:
+            RuntimeError: If the file is not a readable PPTX package.
+        """
+        try:
+            return read_core_properties(file_path)
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to read metadata from PPTX file '{source_name(file_path)}': {e}"
+            )
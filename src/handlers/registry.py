@@ -0,0 +1,276 @@
+"""
+Handler Registry for the Document Intelligence Agent
+Maps document types to handler classes that are imported only when a file of that type is
+first seen, and routes files by sniffing their leading bytes, using the extension only as
+a fallback.
+- Built-in handlers are registered by import path, so their modules are not imported up front
+- Third-party handlers are discovered through the 'document_agent.handlers' entry point group
+  (entry point name = type name = primary extension without the dot)
+"""
+import importlib
+import re
+import zipfile
+from importlib.metadata import entry_points
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Type, Union
+
+from .base_handler import BaseHandler, Source, open_binary
+
+ENTRY_POINT_GROUP = "document_agent.handlers"
+# Bytes read from the start of a file for sniffing.
+SNIFF_BYTES = 8192
+# The PDF header may be preceded by junk; readers accept it within the first 1KB.
+PDF_SIGNATURE_WINDOW = 1024
+# Generic type for content that looks like plain text; resolved further by extension.
+TEXT_TYPE = "text"
+
+# Built-in handlers: type name -> (import path, extensions, text_based).
+BUILTIN_HANDLERS = {
+    "pdf": ("src.handlers.pdf_handler:PdfHandler", (".pdf",), False),
+    "docx": ("src.handlers.docx_handler:DocxHandler", (".docx",), False),
+    "pptx": ("src.handlers.pptx_handler:PptxHandler", (".pptx",), False),
+    "xlsx": ("src.handlers.xlsx_handler:XlsxHandler", (".xlsx",), False),
+    "odt": ("src.handlers.odt_handler:OdtHandler", (".odt",), False),
+    "epub": ("src.handlers.epub_handler:EpubHandler", (".epub",), False),
+    "eml": ("src.handlers.email_handler:EmailHandler", (".eml",), True),
+    "mbox": ("src.handlers.email_handler:EmailHandler", (".mbox",), True),
+    "html": ("src.handlers.html_handler:HtmlHandler", (".html", ".htm", ".xhtml"), True),
+    "md": ("src.handlers.markdown_handler:MarkdownHandler", (".md", ".markdown"), True),
+    "txt": ("src.handlers.txt_handler:TxtHandler", (".txt",), True),
+}
+# Types that always carry a recognizable signature. A file whose extension claims one of these
+# but whose bytes do not match is mislabeled, and is not sent to that parser.
+SIGNATURE_TYPES = {"pdf", "docx", "pptx", "xlsx", "odt", "epub"}
+# Top-level folders of the main part in OOXML packages.
+OOXML_PREFIXES = (("word/", "docx"), ("ppt/", "pptx"), ("xl/", "xlsx"))
+# Leading markup of HTML documents (checked case-insensitively after leading whitespace).
+HTML_PREFIXES = (b"<!doctype html", b"<html")
+# mbox separator line, and RFC 5322 headers that start an exported message.
+MBOX_SEPARATOR = re.compile(rb"From \S+ .*\d{4}")
+EMAIL_HEADER = re.compile(
+    rb"^(Return-Path|Received|Delivered-To|From|To|Subject|Date|Message-ID|MIME-Version):",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Mimetypes stored in the 'mimetype' member of ODF and EPUB containers.
+ZIP_MIMETYPES = {
+    "application/vnd.oasis.opendocument.text": "odt",
+    "application/epub+zip": "epub",
+}
+
+
+def _sniff_zip(source: Source, head: bytes) -> Optional[str]:
+    """Identify a zip container from its stored mimetype or its member names."""
+    # ODF and EPUB store an uncompressed 'mimetype' member first, readable straight from the head.
+    if head[30:38] == b"mimetype":
+        name_length = int.from_bytes(head[26:28], "little")
+        extra_length = int.from_bytes(head[28:30], "little")
+        start = 30 + name_length + extra_length
+        size = int.from_bytes(head[18:22], "little")
+        mimetype = head[start:start + size].decode("ascii", errors="ignore").strip()
+        if mimetype in ZIP_MIMETYPES:
+            return ZIP_MIMETYPES[mimetype]
+    try:
+        with open_binary(source) as stream, zipfile.ZipFile(stream) as package:
+            names = package.namelist()
+    except (zipfile.BadZipFile, OSError):
+        return None
+    if "[Content_Types].xml" in names:
+        for prefix, type_name in OOXML_PREFIXES:
+            if any(name.startswith(prefix) for name in names):
+                return type_name
+    if "mimetype" in names:
+        return None  # Unknown ODF-style container.
+    return "zip"
+
+
+def _looks_like_text(head: bytes) -> bool:
+    """Heuristic: no NUL bytes (or a UTF-16/32 BOM) and few control characters."""
+    if head.startswith((b"\xff\xfe", b"\xfe\xff", b"\xef\xbb\xbf")):
+        return True
+    if b"\x00" in head:
+        return False
+    control = sum(1 for byte in head if byte < 32 and byte not in (9, 10, 12, 13, 27))
+    return control <= len(head) * 0.02
+
+
+def sniff_type(source: Source) -> Optional[str]:
+    """
+    Identify a file's type from its leading bytes.
+    Args:
+        source (Source): File path or binary stream.
+    Returns:
+        Optional[str]: A type name ('pdf', 'docx', 'pptx', 'xlsx', 'odt', 'epub', 'zip', 'html',
+        'eml', 'mbox'), TEXT_TYPE for other plain-text-like content, or None if unknown or empty.
+    """
+    with open_binary(source) as stream:
+        head = stream.read(SNIFF_BYTES)
+    if not head:
+        return None
+    if b"%PDF-" in head[:PDF_SIGNATURE_WINDOW]:
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return _sniff_zip(source, head)
+    if _looks_like_text(head):
+        start = head.lstrip(b"\xef\xbb\xbf \t\r\n")
+        if start.lower().startswith(HTML_PREFIXES):
+            return "html"
+        if MBOX_SEPARATOR.match(start):
+            return "mbox"
+        header_block = start.split(b"\n\n", 1)[0].split(b"\r\n\r\n", 1)[0]
+        if EMAIL_HEADER.match(start) and len(EMAIL_HEADER.findall(header_block)) >= 3:
+            return "eml"
+        return TEXT_TYPE
+    return None
+
+
+class HandlerRegistry:
+    """
+    Lazily-imported handler classes keyed by type name, with extension and content routing.
+    """
+
+    def __init__(self, load_entry_points: bool = True):
+        """
+        Initialize the registry with the built-in handlers.
+        Args:
+            load_entry_points (bool): If True, also register handlers advertised by installed
+                packages under the ENTRY_POINT_GROUP entry point group.
+        """
+        self._targets: Dict[str, Union[str, Type[BaseHandler]]] = {}
+        self._extensions: Dict[str, str] = {}
+        self._text_types = set()
+        for type_name, (target, extensions, text_based) in BUILTIN_HANDLERS.items():
+            self.register(type_name, target, extensions, text_based=text_based)
+        if load_entry_points:
+            self._register_entry_points()
+
+    def register(
+        self,
+        type_name: str,
+        target: Union[str, Type[BaseHandler]],
+        extensions: Iterable[str] = (),
+        text_based: bool = False,
+    ) -> None:
+        """
+        Register (or replace) the handler for a document type.
+        Args:
+            type_name (str): Type name, e.g. 'pdf'.
+            target (Union[str, Type[BaseHandler]]): Handler class, or 'module:Class' to import
+                lazily.
+            extensions (Iterable[str]): Extensions routed to this type when sniffing is
+                inconclusive.
+                Defaults to '.<type_name>'.
+            text_based (bool): True if files of this type sniff as plain text (e.g. Markdown), so
+                their extension decides between this type and plain TXT.
+        """
+        self._targets[type_name] = target
+        for ext in extensions or (f".{type_name}",):
+            self._extensions[ext.lower()] = type_name
+        if text_based:
+            self._text_types.add(type_name)
+
+    def _register_entry_points(self) -> None:
+        try:
+            eps = entry_points()
+            if hasattr(eps, "select"):
+                selected = eps.select(group=ENTRY_POINT_GROUP)
+            else:
+                selected = eps.get(ENTRY_POINT_GROUP, [])
+        except Exception:
+            return
+        for ep in selected:
+            self.register(ep.name, ep.value)
+
+    def get(self, type_name: str) -> Optional[Type[BaseHandler]]:
+        """
+        Return the handler class for a type, importing its module on first use.
+        Args:
+            type_name (str): Registered type name.
+        Returns:
+            Optional[Type[BaseHandler]]: The handler class, or None if the type is not registered.
+        Raises:
+            ImportError: If a lazily registered handler cannot be imported.
+        """
+        target = self._targets.get(type_name)
+        if target is None or not isinstance(target, str):
+            return target
+        module_name, _, class_name = target.partition(":")
+        handler_cls = getattr(importlib.import_module(module_name), class_name)
+        self._targets[type_name] = handler_cls
+        return handler_cls
+
+    def extensions(self) -> List[str]:
+        """Return every extension routed to a registered handler."""
+        return list(self._extensions)
+
+    def type_for_extension(self, ext: str) -> Optional[str]:
+        """Return the type name registered for an extension (e.g. '.pdf'), if any."""
+        return self._extensions.get(ext.lower())
+
+    def resolve_type(self, source: Source, filename: Optional[str] = None) -> Optional[str]:
+        """
+        Decide which registered type should handle a file.
+        The sniffed content type wins; text-like content is refined by the extension (so
+        '.md' goes to a Markdown handler and anything else to TXT); the extension is only
+        used alone when sniffing is inconclusive, and never for signature-bearing types.
+        Args:
+            source (Source): File path or binary stream.
+            filename (Optional[str]): Name used for the extension (defaults to the path).
+        Returns:
+            Optional[str]: Registered type name, or None if no handler fits.
+        """
+        name = filename or (source if isinstance(source, str) else "")
+        ext = "." + name.rsplit(".", 1)[-1].lower() if "." in name else ""
+        ext_type = self._extensions.get(ext)
+        try:
+            sniffed = sniff_type(source)
+        except OSError:
+            sniffed = None
+        if sniffed == TEXT_TYPE:
+            if ext_type in self._text_types:
+                return ext_type
+            return "txt" if "txt" in self._targets else None
+        if sniffed in self._targets:
+            return sniffed
+        if sniffed is None and ext_type and ext_type not in SIGNATURE_TYPES:
+            return ext_type
+        return None
+
+    def resolve(
+        self, source: Source, filename: Optional[str] = None
+    ) -> Optional[Type[BaseHandler]]:
+        """
+        Return the handler class for a file, or None if none applies (see resolve_type).
+        """
+        type_name = self.resolve_type(source, filename)
+        return self.get(type_name) if type_name else None
+
+    def extension_map(self) -> "ExtensionMap":
+        """Return a lazy extension -> handler class mapping view of the registry."""
+        return ExtensionMap(self)
+
+
+class ExtensionMap(Mapping):
+    """Read-only mapping of extension to handler class; classes are imported on access."""
+
+    def __init__(self, registry: HandlerRegistry):
+        self._registry = registry
+
+    def __getitem__(self, ext: str) -> Type[BaseHandler]:
+        type_name = self._registry.type_for_extension(ext)
+        handler_cls = self._registry.get(type_name) if type_name else None
+        if handler_cls is None:
+            raise KeyError(ext)
+        return handler_cls
+
+    def __contains__(self, ext) -> bool:
+        # Membership must not import the handler (Mapping's default goes through __getitem__).
+        return isinstance(ext, str) and self._registry.type_for_extension(ext) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registry.extensions())
+
+    def __len__(self) -> int:
+        return len(self._registry.extensions())
+
+
+# Shared registry used by the workflows.
+default_registry = HandlerRegistry()
@@ -0,0 +1,86 @@
+"""
+Text clean-up used by BaseHandler.preprocess: removes running headers/footers repeated across
+pages, rejoins words hyphenated at line breaks and collapses whitespace, so prompts carry more
+document text per token.
+"""
+import re
+from collections import Counter
+from typing import List
+
+# Page break between sections of paged formats (the form feed, as pdftotext uses).
+PAGE_BREAK = "\f"
+# Lines at the top and bottom of each page checked for running headers/footers.
+EDGE_LINES = 2
+# A normalized edge line repeated on at least this share of pages (and MIN_REPEAT_PAGES) is removed.
+REPEAT_FRACTION = 0.5
+MIN_REPEAT_PAGES = 3
+# Bare page numbers ("12", "Page 3", "3 of 10", "- 4 -") at a page edge.
+PAGE_NUMBER_LINE = re.compile(r"^\W*(page\s*)?\d+(\s*(of|/)\s*\d+)?\W*$", re.IGNORECASE)
+# "inter-\nnational" -> "international"; a capitalized continuation ("Smith-\nJones") is kept.
+HYPHENATED_BREAK = re.compile(r"([^\W\d_])-[ \t]*\r?\n[ \t]*([a-z])")
+HORIZONTAL_SPACE = re.compile(r"[^\S\n]+")
+BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _edge_key(line: str) -> str:
+    """Normalize a header/footer line so that page-specific numbers do not hide repetition."""
+    return re.sub(r"\d+", "#", " ".join(line.lower().split()))
+
+
+def _edge_indexes(lines: List[str]) -> List[int]:
+    """Indexes of the first and last EDGE_LINES non-empty lines of a page."""
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    return sorted(set(filled[:EDGE_LINES] + filled[-EDGE_LINES:]))
+
+
+def remove_repeated_lines(pages: List[str]) -> List[str]:
+    """
+    Remove running headers and footers: lines at a page edge that recur (up to numbers) on
+    many pages, plus bare page numbers at page edges.
+    Args:
+        pages (List[str]): Text of each page, in order.
+    Returns:
+        List[str]: The pages without those lines.
+    """
+    split_pages = [page.split("\n") for page in pages]
+    counts = Counter()
+    for lines in split_pages:
+        counts.update({_edge_key(lines[i]) for i in _edge_indexes(lines)})
+    threshold = max(MIN_REPEAT_PAGES, REPEAT_FRACTION * len(pages))
+    repeated = {key for key, count in counts.items() if count >= threshold}
+    cleaned = []
+    for lines in split_pages:
+        drop = {
+            i for i in _edge_indexes(lines)
+            if _edge_key(lines[i]) in repeated
+            or (len(pages) > 1 and PAGE_NUMBER_LINE.match(lines[i].strip()))
+        }
+        cleaned.append("\n".join(line for i, line in enumerate(lines) if i not in drop))
+    return cleaned
+
+
+def rejoin_hyphenated(text: str) -> str:
+    """Join words split by a hyphen at a line break."""
+    return HYPHENATED_BREAK.sub(r"\1\2", text)
+
+
+def collapse_whitespace(text: str) -> str:
+    """Collapse runs of spaces/tabs to one space, trim lines and keep at most one blank line."""
+    text = HORIZONTAL_SPACE.sub(" ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return BLANK_LINES.sub("\n\n", text).strip()
+
+
+def clean_text(content: str) -> str:
+    """
+    Run the whole clean-up over extracted text. Pages are taken to be separated by PAGE_BREAK;
+    text without page breaks is treated as a single page.
+    Args:
+        content (str): Extracted text.
+    Returns:
+        str: Cleaned text, with page breaks turned into blank lines.
+    """
+    pages = content.split(PAGE_BREAK)
+    if len(pages) > 1:
+        pages = remove_repeated_lines(pages)
+    return collapse_whitespace(rejoin_hyphenated("\n\n".join(pages)))
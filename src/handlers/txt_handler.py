@@ -1,9 +1,137 @@
-from .base_handler import BaseHandler
+import codecs
+import io
+from typing import Iterator, Optional
+
+from .base_handler import BaseHandler, Source, open_binary, source_name
+
+# Byte-order marks, longest first so UTF-32 LE is not mistaken for UTF-16 LE.
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+# Tried in order on the sample when there is no BOM; latin-1 accepts any byte sequence.
+FALLBACK_ENCODINGS = ("utf-8", "cp1252", "latin-1")
+# Bytes inspected for encoding detection.
+DETECTION_SAMPLE_BYTES = 64 * 1024
+
+
+def detect_encoding(sample: bytes):
+    """
+    Detect the text encoding of a file from its first bytes.
+    Checks byte-order marks, then the NUL-byte pattern of BOM-less UTF-16, then tries the
+    FALLBACK_ENCODINGS chain on the sample.
+    Args:
+        sample (bytes): The first bytes of the file (DETECTION_SAMPLE_BYTES is plenty).
+    Returns:
+        tuple: (encoding, bom_length) where bom_length is the number of leading bytes to skip.
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+    pairs = len(sample) // 2
+    if pairs:
+        even_nuls = sample[0:pairs * 2:2].count(0)
+        odd_nuls = sample[1:pairs * 2:2].count(0)
+        # ASCII-heavy UTF-16 puts a NUL in every other byte; plain text almost never has NULs.
+        if odd_nuls > 0.3 * pairs and even_nuls < 0.05 * pairs:
+            return "utf-16-le", 0
+        if even_nuls > 0.3 * pairs and odd_nuls < 0.05 * pairs:
+            return "utf-16-be", 0
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            # Not final: the sample may end in the middle of a multi-byte character.
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding, 0
+        except UnicodeDecodeError:
+            continue
+    return "latin-1", 0
+
 
 class TxtHandler(BaseHandler):
-    def extract_text(self, file_path: str, **kwargs) -> str:
+    # Blocks are cut at fixed sizes, so they are concatenated back without a separator.
+    section_separator = ""
+    # v2: encoding detection and undecodable bytes are replaced instead of failing.
+    version = "2"
+
+    def iter_sections(
+        self,
+        file_path: Source,
+        block_size: int = 64 * 1024,
+        encoding: Optional[str] = None,
+        sample_blocks: int = 0,
+        head_bytes: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[str]:
+        """
+        Yield the text of a TXT file in fixed-size blocks, reading only what is consumed.
+        The encoding is detected from a BOM and a small sample unless given. With sample_blocks,
+        only the head of the file is read sequentially, followed by a few blocks taken at evenly
+        spaced offsets via seek, so huge files (multi-GB logs) cost the same as small ones.
+        Args:
+            file_path (Source): Path to the TXT file, or a binary stream of it.
+            block_size (int): Number of bytes decoded per block.
+            encoding (Optional[str]): Force an encoding instead of detecting one.
+            sample_blocks (int): Number of blocks sampled from the rest of the file after the head.
+            head_bytes (Optional[int]): Bytes read from the start when sampling (default:
+                block_size).
+        Yields:
+            str: The next block of text (sampled blocks are prefixed with a "[...]" marker line).
+        Raises:
+            RuntimeError: If the file cannot be read.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except (FileNotFoundError, UnicodeDecodeError) as e:
-            raise RuntimeError(f"Failed to read TXT file '{file_path}': {e}")
+            with open_binary(file_path) as f:
+                sample = f.read(DETECTION_SAMPLE_BYTES)
+                detected, bom_length = detect_encoding(sample)
+                encoding = encoding or detected
+                unit = 4 if "32" in encoding else 2 if "16" in encoding else 1
+                # Reuse the detection sample as the first bytes of the head instead of re-reading
+                # it.
+                pending = sample[bom_length:]
+                decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+                head_limit = (head_bytes or block_size) if sample_blocks else None
+                consumed = bom_length
+                while head_limit is None or consumed < head_limit:
+                    want = block_size
+                    if head_limit is not None:
+                        want = min(want, head_limit - consumed)
+                    block = pending[:want]
+                    pending = pending[want:]
+                    if len(block) < want:
+                        block += f.read(want - len(block))
+                    consumed += len(block)
+                    text = decoder.decode(block, final=not block)
+                    if text:
+                        yield text
+                    if not block:
+                        return
+                if sample_blocks:
+                    yield from self._iter_sampled_blocks(
+                        f, consumed, block_size, sample_blocks, encoding, unit
+                    )
+        except (OSError, LookupError) as e:
+            raise RuntimeError(f"Failed to read TXT file '{source_name(file_path)}': {e}")
+
+    @staticmethod
+    def _iter_sampled_blocks(
+        f, start: int, block_size: int, count: int, encoding: str, unit: int
+    ) -> Iterator[str]:
+        """Yield `count` blocks read at evenly spaced offsets between start and the end of f."""
+        size = f.seek(0, io.SEEK_END)
+        span = size - start
+        if span <= 0:
+            return
+        for i in range(count):
+            offset = start + span * (i + 1) // (count + 1)
+            offset -= offset % unit  # Keep multi-byte code units aligned.
+            f.seek(offset)
+            text = f.read(block_size).decode(encoding, errors="replace")
+            # Drop the partial line cut by the seek.
+            newline = text.find("\n")
+            if newline != -1:
+                text = text[newline + 1:]
+            if text.strip():
+                yield f"\n[...]\n{text}"
@@ -0,0 +1,226 @@
+"""
+Archive Members as Virtual Files for the Document Intelligence Agent
+Lets ZIP and TAR (optionally gzip/bz2/xz-compressed) archives be scanned and processed in place:
+each member is addressed by a virtual path, '<archive path>/<member name>', and read straight
+from the archive stream. Nothing is unpacked to disk; selected members are written directly
+to their destination.
+- ZIP members are decompressed individually (random access via the central directory)
+- TAR members are read sequentially; an open archive is kept per process so members requested
+  in archive order cost a single pass over a compressed tarball
+"""
+import io
+import os
+import shutil
+import tarfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from typing import BinaryIO, List, Optional, Tuple
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+# Open archive handles kept per process.
+MAX_OPEN_ARCHIVES = 4
+COPY_CHUNK_SIZE = 1024 * 1024
+
+_open_archives: "OrderedDict[str, object]" = OrderedDict()
+_archive_lock = threading.RLock()
+
+
+class ArchiveError(OSError):
+    """Raised when an archive or one of its members cannot be read."""
+
+
+def is_archive(path: str) -> bool:
+    """True if the path names a supported archive (by suffix)."""
+    lower = path.lower()
+    return lower.endswith(ZIP_SUFFIXES) or lower.endswith(TAR_SUFFIXES)
+
+
+def split_virtual_path(path: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a virtual path into (archive path, member name).
+    Args:
+        path (str): A path that may point inside an archive,
+            e.g. 'scans/batch.zip/2024/invoice.pdf'.
+    Returns:
+        Optional[Tuple[str, str]]: (archive path, member name with '/' separators), or None for
+        regular paths.
+    """
+    if os.path.exists(path):
+        return None
+    parent = path
+    while True:
+        parent = os.path.dirname(parent)
+        if not parent or parent == os.path.dirname(parent):
+            return None
+        if is_archive(parent) and os.path.isfile(parent):
+            member = path[len(parent):].lstrip(os.sep).replace(os.sep, "/")
+            return parent, member
+
+
+def is_virtual_path(path: str) -> bool:
+    """True if the path points at a member inside an archive."""
+    return split_virtual_path(path) is not None
+
+
+def _open_archive(archive_path: str):
+    """Return a cached open ZipFile or TarFile for the archive (caller holds _archive_lock)."""
+    archive = _open_archives.get(archive_path)
+    if archive is not None:
+        _open_archives.move_to_end(archive_path)
+        return archive
+    try:
+        if archive_path.lower().endswith(ZIP_SUFFIXES):
+            archive = zipfile.ZipFile(archive_path)
+        else:
+            archive = tarfile.open(archive_path, "r:*")
+    except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+        raise ArchiveError(f"Cannot open archive '{archive_path}': {e}") from e
+    _open_archives[archive_path] = archive
+    while len(_open_archives) > MAX_OPEN_ARCHIVES:
+        _, oldest = _open_archives.popitem(last=False)
+        oldest.close()
+    return archive
+
+
+def _tar_member(archive: tarfile.TarFile, name: str) -> tarfile.TarInfo:
+    """Find a TAR member, reading headers forward only as far as needed (unlike getmember)."""
+    for info in reversed(archive.members):
+        if info.name == name:
+            return info
+    while True:
+        info = archive.next()
+        if info is None:
+            raise KeyError(name)
+        if info.name == name:
+            return info
+
+
+def _is_safe_member(name: str) -> bool:
+    """Reject absolute and parent-relative member names, which cannot form a virtual path."""
+    parts = name.replace("\\", "/").split("/")
+    if not name or name.startswith(("/", "\\")):
+        return False
+    return ".." not in parts and ":" not in parts[0]
+
+
+def list_members(archive_path: str) -> List[str]:
+    """
+    List the regular-file members of an archive without extracting anything.
+    Members with absolute or '..' names are left out.
+    Args:
+        archive_path (str): Path to a .zip or .tar(.gz/.bz2/.xz) archive.
+    Returns:
+        List[str]: Member names in archive order.
+    Raises:
+        ArchiveError: If the archive cannot be read.
+    """
+    with _archive_lock:
+        archive = _open_archive(archive_path)
+        try:
+            if isinstance(archive, zipfile.ZipFile):
+                names = [info.filename for info in archive.infolist() if not info.is_dir()]
+            else:
+                names = [info.name for info in archive.getmembers() if info.isfile()]
+            return [name for name in names if _is_safe_member(name)]
+        except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError) as e:
+            raise ArchiveError(f"Cannot list archive '{archive_path}': {e}") from e
+
+
+def read_member(path: str) -> bytes:
+    """
+    Read a member's content into memory straight from the archive.
+    Args:
+        path (str): Virtual path of the member.
+    Returns:
+        bytes: Member content.
+    Raises:
+        ArchiveError: If the path is not inside an archive or the member cannot be read.
+    """
+    with open_member(path) as stream:
+        return stream.read()
+
+
+def open_member(path: str) -> BinaryIO:
+    """
+    Open a member for binary reading. ZIP members are decompressed as they are read; TAR members
+    are read into memory, since the shared sequential TAR stream cannot serve several readers.
+    Args:
+        path (str): Virtual path of the member.
+    Returns:
+        BinaryIO: A seekable binary stream; the caller closes it.
+    Raises:
+        ArchiveError: If the path is not inside an archive or the member cannot be read.
+    """
+    parts = split_virtual_path(path)
+    if parts is None:
+        raise ArchiveError(f"'{path}' is not inside an archive")
+    archive_path, member = parts
+    with _archive_lock:
+        archive = _open_archive(archive_path)
+        try:
+            if isinstance(archive, zipfile.ZipFile):
+                return archive.open(member)
+            with archive.extractfile(_tar_member(archive, member)) as stream:
+                data = stream.read()
+        except (KeyError, OSError, EOFError, zipfile.BadZipFile, tarfile.TarError) as e:
+            raise ArchiveError(f"Cannot read '{member}' from archive '{archive_path}': {e}") from e
+    stream = io.BytesIO(data)
+    stream.name = path
+    return stream
+
+
+def member_mtime(path: str) -> Optional[float]:
+    """Modification time recorded for a member in its archive, if any."""
+    parts = split_virtual_path(path)
+    if parts is None:
+        return None
+    archive_path, member = parts
+    with _archive_lock:
+        archive = _open_archive(archive_path)
+        try:
+            if isinstance(archive, zipfile.ZipFile):
+                return time.mktime(archive.getinfo(member).date_time + (0, 0, -1))
+            return float(_tar_member(archive, member).mtime)
+        except (KeyError, ValueError, OverflowError, tarfile.TarError):
+            return None
+
+
+def copy_member(path: str, dest_path: str) -> str:
+    """
+    Write a member directly to dest_path, keeping its recorded modification time.
+    Args:
+        path (str): Virtual path of the member.
+        dest_path (str): Destination file path.
+    Returns:
+        str: The destination path.
+    Raises:
+        ArchiveError: If the member cannot be read.
+    """
+    with open_member(path) as src, open(dest_path, "wb") as dest:
+        shutil.copyfileobj(src, dest, COPY_CHUNK_SIZE)
+    mtime = member_mtime(path)
+    if mtime is not None:
+        os.utime(dest_path, (mtime, mtime))
+    return dest_path
+
+
+def close_archives() -> None:
+    """Close every archive handle kept open by this process."""
+    with _archive_lock:
+        while _open_archives:
+            _, archive = _open_archives.popitem()
+            archive.close()
+
+
+def _reset_after_fork() -> None:
+    # A forked worker shares the parent's file offsets; it must open its own handles.
+    global _archive_lock
+    _archive_lock = threading.RLock()
+    _open_archives.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,236 @@
+"""
+Extraction Cache for the Document Intelligence Agent
+Persistent, content-addressed store of extracted text so repeat runs over the same
+files skip parsing entirely.
+- Keys combine the file's SHA-256, the handler class, the handler version and the extraction options
+- Entries are zlib-compressed and evicted least-recently-used once the cache exceeds its size bound
+- Writes are atomic (temp file + os.replace), so several processes can share one cache directory
+- The total size is kept in a file next to the entries, updated under a lock file by every writer,
+  so checking the bound does not walk the directory (the lock is POSIX only)
+"""
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+DEFAULT_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", os.path.join(".cache", "extraction"))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512MB of compressed text
+# Larger files are not cached: hashing them would read far more than budgeted extraction does.
+DEFAULT_MAX_FILE_BYTES = 256 * 1024 * 1024
+HASH_BLOCK_SIZE = 1024 * 1024
+# Bookkeeping files in the cache directory; dot-prefixed names are never entries.
+SIZE_FILE = ".size"
+LOCK_FILE = ".lock"
+
+
+class ExtractionCache:
+    """
+    On-disk LRU cache of extracted text, keyed by content hash, handler and handler version.
+    Instances hold no open resources and are picklable, so they can be sent to worker processes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    ):
+        """
+        Initialize the cache.
+        Args:
+            cache_dir (str): Directory holding the cache entries (created if missing).
+            max_bytes (int): Size bound for the compressed entries; older entries are evicted
+                beyond it.
+            max_file_bytes (int): Source files larger than this bypass the cache, since hashing
+                them costs a full read while extraction only reads a bounded head.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        # Seeded once here, so the copies sent to worker processes never need to scan.
+        with self._locked():
+            if self._read_size() is None:
+                self._write_size(self._scan()[1])
+
+    @staticmethod
+    def file_digest(file_path: str) -> str:
+        """
+        Compute the SHA-256 hex digest of a file's content.
+        Args:
+            file_path (str): File to hash.
+        Returns:
+            str: Hex digest.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def accepts_size(self, size: int) -> bool:
+        """Return True if a source file of this many bytes should go through the cache."""
+        return size <= self.max_file_bytes
+
+    def make_key(
+        self, content_digest: str, handler: Any, options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build the cache key for a file extracted by a given handler.
+        Args:
+            content_digest (str): SHA-256 of the file content.
+            handler: Handler instance; its class path and `version` attribute are part of the key.
+            options (Optional[dict]): Extraction options (budgets etc.) that change the output.
+        Returns:
+            str: Hex key identifying the cache entry.
+        """
+        handler_cls = type(handler)
+        material = json.dumps(
+            {
+                "content": content_digest,
+                "handler": f"{handler_cls.__module__}.{handler_cls.__qualname__}",
+                "version": str(getattr(handler, "version", "")),
+                "options": options or {},
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key[2:])
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up an entry and mark it as recently used.
+        Args:
+            key (str): Key from make_key.
+        Returns:
+            Optional[str]: The cached text, or None on a miss or unreadable entry.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # Bump mtime: it is the LRU clock used by eviction.
+            return zlib.decompress(data).decode("utf-8")
+        except (OSError, zlib.error, UnicodeDecodeError):
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        """
+        Store an entry atomically and evict old entries if the size bound is exceeded.
+        Failures are ignored: the cache is an optimization, never a source of errors.
+        Args:
+            key (str): Key from make_key.
+            text (str): Extracted text to store.
+        """
+        path = self._entry_path(key)
+        data = zlib.compress(text.encode("utf-8"), 6)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            with self._locked():
+                total = self._read_size()
+                total = self._scan()[1] if total is None else total + len(data) - replaced
+                self._write_size(total)
+        except OSError:
+            return
+        if total > self.max_bytes:
+            self.evict()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the cache directory's lock file (POSIX only; elsewhere writes are unserialized)."""
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        with open(os.path.join(self.cache_dir, LOCK_FILE), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_size(self) -> Optional[int]:
+        """The running total from the size file, or None if it is missing or unreadable."""
+        try:
+            with open(os.path.join(self.cache_dir, SIZE_FILE), encoding="utf-8") as f:
+                return max(0, int(f.read()))
+        except (OSError, ValueError):
+            return None
+
+    def _write_size(self, total: int) -> None:
+        """Replace the size file atomically, so unlocked readers never see a torn value."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(str(total))
+        os.replace(tmp_path, os.path.join(self.cache_dir, SIZE_FILE))
+
+    def _scan(self):
+        """Return ([(mtime, size, path), ...], total_size) for all committed entries."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue  # Removed concurrently by another process.
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        return entries, total
+
+    def evict(self) -> None:
+        """
+        Delete least-recently-used entries until the cache is back under 90% of max_bytes.
+        The scan also resets the running total, correcting any drift.
+        """
+        with self._locked():
+            entries, total = self._scan()
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+            try:
+                self._write_size(total)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._locked():
+            for _, _, path in self._scan()[0]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            try:
+                self._write_size(0)
+            except OSError:
+                pass
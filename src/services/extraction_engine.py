@@ -0,0 +1,417 @@
+"""
+Extraction Engine for the Document Intelligence Agent
+Runs file handlers across a pool of worker processes so that CPU-bound parsing
+(pypdf is pure Python) uses every core during batch runs.
+- Default mode uses a ProcessPoolExecutor
+- Watchdog mode (any time/memory/recycling limit set) runs each file in a supervised worker
+  that is killed on timeout, memory-capped and restarted after a fixed number of files
+"""
+import importlib
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.handlers.base_handler import ROUTE_OCR, ROUTE_SKIP
+from .extraction_cache import ExtractionCache
+from .file_io import open_buffer
+
+# Parser modules imported once per worker process, before the first task arrives.
+PRELOAD_MODULES = ("pypdf", "docx")
+# Files a watchdog worker handles before it is replaced, unless configured otherwise.
+DEFAULT_MAX_TASKS_PER_WORKER = 100
+# How often (seconds) the watchdog checks running files against their deadline.
+WATCHDOG_POLL_INTERVAL = 0.1
+# Seconds a worker may take, on top of the timeout, to start up and acknowledge a file; the
+# per-file timeout only runs from the acknowledgement, so interpreter start-up is not charged to it.
+WORKER_STARTUP_ALLOWANCE = 30.0
+
+
+class PageTimeout(Exception):
+    """Raised inside a watchdog worker when a single page/section exceeds its time limit."""
+
+
+class ExtractionResult(NamedTuple):
+    """
+    Outcome of extracting one file. error is None on success; route is the handler's triage
+    route (None when the file was not triaged).
+    """
+    path: str
+    text: str
+    error: Optional[str] = None
+    metadata: Optional[Dict[str, str]] = None
+    route: Optional[str] = None
+
+
+def _init_worker() -> None:
+    """
+    Worker initializer: pre-import the parser libraries so their import cost is paid once
+    per process instead of on the first file each worker receives.
+    """
+    for module in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+
+def _extract_one(
+    handler: Any,
+    path: str,
+    options: Dict[str, Any],
+    cache: Optional[ExtractionCache] = None,
+    metadata_filter: Optional[Callable[[Dict[str, str]], bool]] = None,
+) -> ExtractionResult:
+    """
+    Extract a single file, converting any failure into a per-file error.
+    Order of work: metadata fast path, cache lookup, handler triage, then body extraction.
+    Files triaged as not worth processing come back with route ROUTE_SKIP and an error; files
+    without a text layer come back the same way with route ROUTE_OCR, for an OCR pass.
+    For handlers that accept streams the file (or archive member) is read once into a FileBuffer,
+    and the cache hash, metadata reader, triage and parser all consume that same buffer.
+    Args:
+        handler: Handler instance exposing extract_text.
+        path (str): File to extract.
+        options (dict): Keyword arguments forwarded to extract_text.
+        cache (Optional[ExtractionCache]): Cache consulted before parsing and filled afterwards.
+        metadata_filter (Optional[Callable]): When given, document metadata is read first and
+            body extraction is skipped if the filter returns True for it.
+    Returns:
+        ExtractionResult: The extracted text or the error message.
+    """
+    buffer = None
+    metadata = None
+    try:
+        if getattr(handler, "accepts_streams", False):
+            buffer = open_buffer(path)
+
+        def source():
+            return buffer.stream() if buffer is not None else path
+
+        if metadata_filter is not None and hasattr(handler, "read_metadata"):
+            try:
+                metadata = handler.read_metadata(source())
+            except Exception:
+                metadata = {}  # Unreadable metadata just means the body has to be parsed.
+            if metadata_filter(metadata):
+                return ExtractionResult(path, "", None, metadata)
+        key = None
+        size = buffer.size if buffer is not None else os.path.getsize(path)
+        if cache is not None and cache.accepts_size(size):
+            digest = buffer.digest() if buffer is not None else cache.file_digest(path)
+            key = cache.make_key(digest, handler, options)
+            cached = cache.get(key)
+            if cached is not None:
+                return ExtractionResult(path, cached, None, metadata)
+        route = None
+        extract_options = options
+        report = handler.triage(source()) if hasattr(handler, "triage") else None
+        if report is not None:
+            route = report.route
+            if route in (ROUTE_SKIP, ROUTE_OCR):
+                return ExtractionResult(path, "", f"skipped: {report.reason}", metadata, route)
+            if report.max_pages is not None:
+                budget = min(options.get("max_pages") or report.max_pages, report.max_pages)
+                extract_options = dict(options, max_pages=budget)
+            if report.parsed is not None:
+                # Reuse what triage already parsed instead of opening the file again.
+                extract_options = dict(extract_options, triage_state=report.parsed)
+        text = handler.extract_text(source(), **extract_options)
+        if key is not None:
+            cache.put(key, text)
+        return ExtractionResult(path, text, None, metadata, route)
+    except Exception as e:
+        # Some exceptions (e.g. MemoryError) have an empty message; never report a falsy error.
+        return ExtractionResult(path, "", str(e) or type(e).__name__, metadata)
+    finally:
+        if buffer is not None:
+            buffer.close()
+
+
+def _limit_memory(limit_mb: int) -> None:
+    """
+    Cap the address space of the current process. Only available on POSIX; elsewhere the
+    limit is silently not applied. Note the cap includes the interpreter itself.
+    """
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _raise_page_timeout(signum, frame):
+    raise PageTimeout("page extraction timed out")
+
+
+def _timed_sections(sections, seconds: float):
+    """Re-yield sections, arming a SIGALRM timer around the production of each one."""
+    iterator = iter(sections)
+    while True:
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+        try:
+            section = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        yield section
+
+
+def _install_page_timeout(handler: Any, seconds: float) -> None:
+    """
+    Make the handler's iter_sections enforce a per-section time limit (POSIX only).
+    Applies to handlers whose extract_text is built on iter_sections.
+    """
+    if not hasattr(signal, "setitimer") or not hasattr(handler, "iter_sections"):
+        return
+    signal.signal(signal.SIGALRM, _raise_page_timeout)
+    original = handler.iter_sections
+
+    def iter_sections(*args, **kwargs):
+        return _timed_sections(original(*args, **kwargs), seconds)
+
+    handler.iter_sections = iter_sections
+
+
+def _watchdog_worker_main(
+    conn, memory_limit_mb: Optional[int], page_timeout: Optional[float], max_tasks: int
+) -> None:
+    """
+    Entry point of a watchdog worker: apply limits, then extract files received over conn
+    until max_tasks is reached or a None sentinel arrives. Each file is acknowledged with
+    (index, None) when it arrives, and answered with (index, result) when done.
+    """
+    _init_worker()
+    if memory_limit_mb:
+        _limit_memory(memory_limit_mb)
+    for _ in range(max_tasks):
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        index, handler, path, options, cache, metadata_filter = task
+        conn.send((index, None))
+        if page_timeout:
+            _install_page_timeout(handler, page_timeout)
+        conn.send((index, _extract_one(handler, path, options, cache, metadata_filter)))
+    conn.close()
+
+
+class _WatchdogWorker:
+    """A supervised worker process and the task it is currently running."""
+
+    def __init__(self, ctx, memory_limit_mb, page_timeout, max_tasks):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_watchdog_worker_main,
+            args=(child_conn, memory_limit_mb, page_timeout, max_tasks),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.max_tasks = max_tasks
+        self.completed = 0
+        # (job index, time sent or acknowledged, whether the worker has acknowledged it)
+        self.task: Optional[Tuple[int, float, bool]] = None
+
+    def stop(self, kill: bool = False) -> None:
+        """Stop the worker, killing it outright if it may be stuck."""
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ExtractionEngine:
+    """
+    Extracts text from many files in parallel with a ProcessPoolExecutor.
+    Results are returned in input order and failures are reported per file, so one
+    broken document never aborts the batch.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache: Optional[ExtractionCache] = None,
+        timeout: Optional[float] = None,
+        page_timeout: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+        max_tasks_per_worker: Optional[int] = None,
+    ):
+        """
+        Initialize the engine.
+        Setting any of timeout, page_timeout, memory_limit_mb or max_tasks_per_worker switches
+        to watchdog mode, where extraction always runs in supervised subprocesses.
+        Args:
+            max_workers (Optional[int]): Number of worker processes. None or 0 uses one per
+                CPU core; 1 extracts in the calling process without starting a pool.
+            cache (Optional[ExtractionCache]): Persistent extraction cache. Every extraction goes
+                through it when given, so unchanged files are never parsed twice.
+            timeout (Optional[float]): Wall-clock seconds allowed per file, counted from when a
+                worker picks it up; the worker is killed and the file reported as an error when
+                exceeded.
+            page_timeout (Optional[float]): Seconds allowed per page/section (POSIX only).
+            memory_limit_mb (Optional[int]): Address-space limit per worker in MB (POSIX only).
+            max_tasks_per_worker (Optional[int]): Files a worker handles before it is replaced,
+                to contain parser leaks. Defaults to DEFAULT_MAX_TASKS_PER_WORKER in watchdog mode.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache = cache
+        self.timeout = timeout
+        self.page_timeout = page_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+
+    @property
+    def watchdog(self) -> bool:
+        """True when extraction runs in supervised, limited worker processes."""
+        limits = (self.timeout, self.page_timeout, self.memory_limit_mb, self.max_tasks_per_worker)
+        return any(value is not None for value in limits)
+
+    def extract_many(
+        self,
+        jobs: Sequence[Tuple[Any, str]],
+        metadata_filter: Optional[Callable[[Dict[str, str]], bool]] = None,
+        **kwargs,
+    ) -> List[ExtractionResult]:
+        """
+        Extract text for a batch of files.
+        Args:
+            jobs (Sequence[Tuple[handler, str]]): (handler instance, file path) pairs. Handlers
+                must be picklable when more than one worker is used.
+            metadata_filter (Optional[Callable]): Picklable predicate over a file's metadata. When
+                given, metadata is read first and files it accepts skip body extraction.
+            **kwargs: Options forwarded to every handler's extract_text (e.g. max_chars).
+        Returns:
+            List[ExtractionResult]: One result per job, in the same order as jobs.
+        """
+        if not jobs:
+            return []
+        if self.watchdog:
+            return self._extract_supervised(jobs, metadata_filter, kwargs)
+        if self.max_workers <= 1 or len(jobs) <= 1:
+            return [
+                _extract_one(handler, path, kwargs, self.cache, metadata_filter)
+                for handler, path in jobs
+            ]
+        workers = min(self.max_workers, len(jobs))
+        results = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [
+                pool.submit(_extract_one, handler, path, kwargs, self.cache, metadata_filter)
+                for handler, path in jobs
+            ]
+            for (_, path), future in zip(jobs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # Pickling errors or a crashed worker: report against this file only.
+                    results.append(ExtractionResult(path, "", str(e)))
+        return results
+
+    def _extract_supervised(self, jobs, metadata_filter, options) -> List[ExtractionResult]:
+        """
+        Watchdog mode: dispatch one file at a time to each worker, kill workers whose file
+        exceeds the timeout, and replace workers that crash, time out or reach their task limit.
+        """
+        ctx = multiprocessing.get_context()
+        max_tasks = self.max_tasks_per_worker or DEFAULT_MAX_TASKS_PER_WORKER
+
+        def spawn():
+            return _WatchdogWorker(ctx, self.memory_limit_mb, self.page_timeout, max_tasks)
+
+        results: List[Optional[ExtractionResult]] = [None] * len(jobs)
+        pending = deque(range(len(jobs)))
+        # Slots hold a live worker or None; replacements are only started while work remains.
+        workers: List[Optional[_WatchdogWorker]] = [None] * min(self.max_workers, len(jobs))
+        redispatched = set()
+        try:
+            while pending or any(worker and worker.task for worker in workers):
+                for slot, worker in enumerate(workers):
+                    while pending and (worker is None or worker.task is None):
+                        if worker is None:
+                            worker = workers[slot] = spawn()
+                        index = pending.popleft()
+                        handler, path = jobs[index]
+                        job = (index, handler, path, options, self.cache, metadata_filter)
+                        try:
+                            worker.conn.send(job)
+                        except (OSError, EOFError) as e:
+                            # The idle worker died (broken pipe): replace it and dispatch the file
+                            # once more.
+                            worker.stop(kill=True)
+                            worker = workers[slot] = None
+                            if index in redispatched:
+                                error = f"extraction worker unavailable: {e}"
+                                results[index] = ExtractionResult(path, "", error)
+                            else:
+                                redispatched.add(index)
+                                pending.appendleft(index)
+                            continue
+                        except Exception as e:
+                            # The job itself cannot be sent (e.g. an unpicklable handler); only
+                            # it fails.
+                            results[index] = ExtractionResult(path, "", str(e))
+                            continue
+                        worker.task = (index, time.monotonic(), False)
+                busy = [worker for worker in workers if worker and worker.task]
+                ready = wait([worker.conn for worker in busy], timeout=WATCHDOG_POLL_INTERVAL)
+                for slot, worker in enumerate(workers):
+                    if worker is None or worker.task is None:
+                        continue
+                    index, started, acknowledged = worker.task
+                    path = jobs[index][1]
+                    if worker.conn in ready:
+                        try:
+                            _, result = worker.conn.recv()
+                        except (EOFError, OSError):
+                            worker.stop(kill=True)
+                            code = worker.process.exitcode
+                            error = f"extraction worker crashed (exit code {code})"
+                            results[index] = ExtractionResult(path, "", error)
+                            workers[slot] = None
+                            continue
+                        if result is None:
+                            # The worker is up and has the file: its timeout starts now.
+                            worker.task = (index, time.monotonic(), True)
+                            continue
+                        results[index] = result
+                        worker.task = None
+                        worker.completed += 1
+                        if worker.completed >= worker.max_tasks:
+                            worker.stop()
+                            workers[slot] = None
+                    elif self.timeout is not None:
+                        limit = self.timeout
+                        if not acknowledged:
+                            limit += WORKER_STARTUP_ALLOWANCE
+                        if time.monotonic() - started <= limit:
+                            continue
+                        if acknowledged:
+                            error = f"extraction timed out after {self.timeout}s"
+                        else:
+                            error = f"extraction worker did not start within {limit}s"
+                        results[index] = ExtractionResult(path, "", error)
+                        worker.stop(kill=True)
+                        workers[slot] = None
+        finally:
+            for worker in workers:
+                if worker is not None:
+                    worker.stop(kill=worker.task is not None)
+        return results
@@ -0,0 +1,220 @@
+"""
+Single-read File I/O for the Document Intelligence Agent
+Maps each input file into memory once and hands the same bytes to the hasher (cache keys),
+the parsers (as independent in-memory streams) and, when needed, the copy step.
+Copies that do not have a buffer at hand use a kernel-side copy (copy_file_range/sendfile),
+so file content never makes a second trip through Python.
+"""
+import hashlib
+import io
+import mmap
+import os
+import shutil
+from typing import List, Optional, Union
+
+from .archive_io import copy_member, is_virtual_path, read_member
+
+COPY_BLOCK_SIZE = 64 * 1024 * 1024
+
+
+class BufferReader(io.BufferedIOBase):
+    """
+    Read-only, seekable binary stream over a shared buffer.
+    Each reader has its own position, so several parsers can read the same mapped file
+    without copying it.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], name: str = ""):
+        super().__init__()
+        self._view = memoryview(buffer)
+        self._pos = 0
+        self.name = name
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed BufferReader")
+        end = len(self._view)
+        if size is not None and size >= 0:
+            end = min(end, self._pos + size)
+        data = self._view[self._pos:end].tobytes()
+        self._pos = max(self._pos, end)
+        return data
+
+    read1 = read
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._pos = offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class FileBuffer:
+    """
+    A file read from disk exactly once: memory-mapped (lazily paged in by the OS) and shared
+    by every consumer. Use as a context manager; streams handed out are closed with it.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open and map the file.
+        Args:
+            path (str): File to read.
+        Raises:
+            OSError: If the file cannot be opened.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map empty files; an empty bytes object behaves the same for readers.
+        self._buffer: Union[bytes, mmap.mmap] = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        )
+        self._readers: List[BufferReader] = []
+        self._digest: Optional[str] = None
+
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str) -> "FileBuffer":
+        """
+        Wrap bytes that are already in memory (e.g. an archive member or email attachment).
+        Args:
+            data (bytes): File content.
+            name (str): Display name used as the stream name.
+        Returns:
+            FileBuffer: A buffer with no backing file.
+        """
+        buffer = cls.__new__(cls)
+        buffer.path = name
+        buffer._file = None
+        buffer.size = len(data)
+        buffer._buffer = data
+        buffer._readers = []
+        buffer._digest = None
+        return buffer
+
+    def digest(self) -> str:
+        """
+        SHA-256 hex digest of the content, computed from the shared buffer and memoized.
+        Returns:
+            str: Hex digest.
+        """
+        if self._digest is None:
+            self._digest = hashlib.sha256(self._buffer).hexdigest()
+        return self._digest
+
+    def stream(self) -> BufferReader:
+        """
+        Return a new independent binary stream positioned at the start of the content.
+        Returns:
+            BufferReader: Seekable stream over the shared buffer.
+        """
+        reader = BufferReader(self._buffer, name=self.path)
+        self._readers.append(reader)
+        return reader
+
+    def copy_to(self, dest_path: str) -> None:
+        """
+        Write the buffered content to dest_path without re-reading the source, preserving the
+        source's timestamps and permission bits when it is a real file (like shutil.copy2).
+        Args:
+            dest_path (str): Destination file path.
+        """
+        with open(dest_path, "wb") as dest:
+            view = memoryview(self._buffer)
+            try:
+                for start in range(0, len(view), COPY_BLOCK_SIZE):
+                    dest.write(view[start:start + COPY_BLOCK_SIZE])
+            finally:
+                view.release()
+        if self._file is not None:
+            shutil.copystat(self.path, dest_path)
+
+    def close(self) -> None:
+        """Close all streams handed out, unmap the file and close it."""
+        for reader in self._readers:
+            reader.close()
+        self._readers = []
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> "FileBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def open_buffer(path: str) -> FileBuffer:
+    """
+    Open a FileBuffer for a regular file, or for an archive member addressed by a virtual path
+    (read straight from the archive into memory).
+    Args:
+        path (str): File path or virtual archive member path.
+    Returns:
+        FileBuffer: The buffered content.
+    Raises:
+        OSError: If a regular file cannot be opened.
+        ArchiveError: If an archive member cannot be read.
+    """
+    if is_virtual_path(path):
+        return FileBuffer.from_bytes(read_member(path), path)
+    return FileBuffer(path)
+
+
+def copy_file(src: str, dest: str) -> str:
+    """
+    Copy a file with metadata (like shutil.copy2) using a kernel-side copy: copy_file_range
+    where available (which lets NFS 4.2/SMB servers copy without the data crossing the
+    network), falling back to shutil's sendfile-based copy. Archive members (virtual paths)
+    are written straight from the archive.
+    Args:
+        src (str): Source file path or virtual archive member path.
+        dest (str): Destination file path.
+    Returns:
+        str: The destination path.
+    """
+    if is_virtual_path(src):
+        return copy_member(src, dest)
+    copied = False
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    count = min(remaining, COPY_BLOCK_SIZE)
+                    sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), count)
+                    if sent == 0:
+                        break
+                    remaining -= sent
+                copied = remaining <= 0
+        except OSError:
+            copied = False  # Unsupported by this filesystem pair; fall back below.
+    if not copied:
+        shutil.copyfile(src, dest)
+    shutil.copystat(src, dest)
+    return dest
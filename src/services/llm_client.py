@@ -2,34 +2,58 @@
 LLM Client Service for Gemini API (Google Generative AI)
 References: see AGENTS.md and Agent_Building_Guidlines for agent protocols and best practices.
 """
+import asyncio
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple, Union
 from google import genai
 from promptl_ai import Promptl, PromptlError
+from .rate_limiter import DEFAULT_QUOTAS, EXPECTED_OUTPUT_TOKENS, RateLimiter, RateQuota
+from .response_cache import ResponseCache
+from .retry_policy import RetryPolicy
+from .token_estimator import TokenEstimator
 from .web_search_service import WebSearchService
 
 class LLMClient:
+    def iter_chunk_spans(
+        self, text: str, max_tokens: int = 1000, overlap: int = 100
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Lazily split a large text into overlapping chunks for LLM processing, on token budgets.
+        Tokens are estimated locally (CJK text, URLs and encoded blobs are priced by what they cost
+        Gemini, not by word count); with exact_token_counts (the default), the estimate is
+        calibrated per text against the count_tokens API. Only the chunks consumed are computed.
+        Args:
+            text (str): The input text to split.
+            max_tokens (int): Maximum Gemini tokens per chunk.
+            overlap (int): Number of tokens to overlap between chunks.
+        Yields:
+            Tuple[int, int]: (start, end) character offsets of each chunk in text.
+        """
+        return self.token_estimator.iter_chunk_spans(text, max_tokens=max_tokens, overlap=overlap)
+
     def chunk_text(self, text: str, max_tokens: int = 1000, overlap: int = 100) -> list:
         """
-        Split a large text into overlapping chunks for LLM processing.
+        Split a large text into overlapping chunks for LLM processing; see iter_chunk_spans.
         Args:
             text (str): The input text to split.
-            max_tokens (int): Maximum tokens (approx. words) per chunk.
-            overlap (int): Number of words to overlap between chunks.
+            max_tokens (int): Maximum Gemini tokens per chunk.
+            overlap (int): Number of tokens to overlap between chunks.
         Returns:
             list: List of text chunks.
         """
-        words = text.split()
-        chunks = []
-        start = 0
-        while start < len(words):
-            end = min(start + max_tokens, len(words))
-            chunk = ' '.join(words[start:end])
-            chunks.append(chunk)
-            if end == len(words):
-                break
-            start = end - overlap
-        return chunks
+        spans = self.iter_chunk_spans(text, max_tokens=max_tokens, overlap=overlap)
+        return [text[start:end] for start, end in spans]
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Count the Gemini tokens in a text: exactly (cached) when exact_token_counts is on (the
+        default) and the API answers, otherwise by local estimate.
+        Args:
+            text (str): The text to count.
+        Returns:
+            int: Token count.
+        """
+        return self.token_estimator.count(text)
     """Handles all Gemini API interactions via google-generativeai SDK, with prompt templating support."""
     # Default prompt templates for major tasks
     PROMPT_TEMPLATES = {
@@ -46,9 +70,30 @@ class LLMClient:
         ),
     }
 
-    def __init__(self, api_key: Optional[str] = None, exa_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        exa_api_key: Optional[str] = None,
+        exact_token_counts: bool = True,
+        rate_limits: Optional[Dict[str, RateQuota]] = None,
+        rate_limit_file: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
         """
         Initialize the LLMClient for Gemini API.
+        Args:
+            api_key (Optional[str]): Gemini API key; defaults to GEMINI_API_KEY.
+            exa_api_key (Optional[str]): Exa API key; defaults to EXA_API_KEY.
+            exact_token_counts (bool): If True (the default), chunking calibrates its token
+                estimates with the (cached) count_tokens API; False uses the local estimate alone.
+            rate_limits (Optional[Dict[str, RateQuota]]): Per-model RPM/TPM quotas, overriding
+                DEFAULT_QUOTAS for the models given (RateQuota() removes a model's limits).
+            rate_limit_file (Optional[str]): State file that shares the quotas with other processes.
+            retry_policy (Optional[RetryPolicy]): Retries of transient API failures; RetryPolicy()
+                by default, RetryPolicy(max_attempts=1) disables them.
+            response_cache (Optional[ResponseCache]): Persistent cache of generate_content
+                responses; None (the default) sends every prompt.
         References: AGENTS.md, Agent_Building_Guidlines for agent protocols and best practices.
         """
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
@@ -62,6 +107,15 @@ class LLMClient:
             raise ValueError("EXA_API_KEY is required for WebSearchService.")
         self.web_search = WebSearchService(api_key=exa_key)
         self.promptl = Promptl()
+        self.token_estimator = TokenEstimator(
+            self.client, self.model_name, exact=exact_token_counts
+        )
+        # Shared by every thread and coroutine using this client.
+        self.rate_limiter = RateLimiter(
+            {**DEFAULT_QUOTAS, **(rate_limits or {})}, state_file=rate_limit_file
+        )
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.response_cache = response_cache
 
     def get_prompt_template(self, name: str) -> str:
         """
@@ -126,26 +180,154 @@ class LLMClient:
         except PromptlError as e:
             raise RuntimeError(f"PromptL rendering failed: {e.cause.message}")
 
-    def generate_content(self, prompt: str, model: Optional[str] = None, **kwargs) -> str:
+    def generate_content(
+        self, prompt: str, model: Optional[str] = None, bypass_cache: bool = False, **kwargs
+    ) -> str:
         """
-        Generate content from the Gemini LLM for a given prompt.
+        Generate content from the Gemini LLM for a given prompt. Transient failures (429, 5xx,
+        timeouts) are retried according to retry_policy. With a response_cache, a prompt already
+        answered for the same model and parameters is served from the cache without an API call.
         Args:
             prompt (str): The prompt to send to the LLM.
             model (Optional[str]): Optional model name override.
+            bypass_cache (bool): If True, skip the cache lookup (the fresh response is still
+                stored).
             **kwargs: Additional parameters for the LLM API.
         Returns:
             str: The generated text response.
         Raises:
-            RuntimeError: If the LLM API call fails.
+            RuntimeError: If the LLM API call fails permanently or retries are exhausted (the API
+                error is its __cause__).
         References: AGENTS.md, Agent_Building_Guidlines
         """
         model_name = model or self.model_name
+        key, cached = self._cache_lookup(model_name, prompt, kwargs, bypass_cache)
+        if cached is not None:
+            return cached
+        reserved = self._quota_tokens(prompt, kwargs)
+
+        def attempt():
+            # Every attempt is a request of its own against the quotas.
+            self.rate_limiter.acquire(model_name, reserved)
+            return self.client.models.generate_content(model=model_name, contents=prompt, **kwargs)
+
         try:
-            response = self.client.models.generate_content(model=model_name, contents=prompt, **kwargs)
-            return response.text or ""
+            response = self.retry_policy.call(attempt)
         except Exception as e:
             # Log or handle error as per agent protocols
-            raise RuntimeError(f"LLMClient.generate_content failed: {e}")
+            raise RuntimeError(f"LLMClient.generate_content failed: {e}") from e
+        self.rate_limiter.settle(model_name, reserved, self._used_tokens(response))
+        return self._cache_store(key, model_name, response.text or "")
+
+    async def agenerate_content(
+        self, prompt: str, model: Optional[str] = None, bypass_cache: bool = False, **kwargs
+    ) -> str:
+        """
+        Async generate_content, using the SDK's async client (client.aio).
+        Args:
+            prompt (str): The prompt to send to the LLM.
+            model (Optional[str]): Optional model name override.
+            bypass_cache (bool): If True, skip the cache lookup (the fresh response is still
+                stored).
+            **kwargs: Additional parameters for the LLM API.
+        Returns:
+            str: The generated text response.
+        Raises:
+            RuntimeError: If the LLM API call fails.
+        """
+        model_name = model or self.model_name
+        key, cached = self._cache_lookup(model_name, prompt, kwargs, bypass_cache)
+        if cached is not None:
+            return cached
+        reserved = self._quota_tokens(prompt, kwargs)
+
+        async def attempt():
+            await self.rate_limiter.aacquire(model_name, reserved)
+            return await self.client.aio.models.generate_content(
+                model=model_name, contents=prompt, **kwargs
+            )
+
+        try:
+            response = await self.retry_policy.acall(attempt)
+        except Exception as e:
+            raise RuntimeError(f"LLMClient.agenerate_content failed: {e}") from e
+        self.rate_limiter.settle(model_name, reserved, self._used_tokens(response))
+        return self._cache_store(key, model_name, response.text or "")
+
+    def _cache_lookup(
+        self, model_name: str, prompt: str, kwargs: Dict[str, Any], bypass: bool
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """(cache key, cached response) for a call; (None, None) without a response cache."""
+        if self.response_cache is None:
+            return None, None
+        key = self.response_cache.make_key(model_name, prompt, kwargs)
+        return key, None if bypass else self.response_cache.get(key)
+
+    def _cache_store(self, key: Optional[str], model_name: str, text: str) -> str:
+        """Store a response under its cache key (empty responses are not cached) and return it."""
+        if key is not None and text:
+            self.response_cache.put(key, model_name, text)
+        return text
+
+    def _quota_tokens(self, prompt: str, kwargs: Dict[str, Any]) -> int:
+        """
+        Tokens reserved against the TPM quota for a call: the prompt's estimate plus its output
+        allowance.
+        """
+        config = kwargs.get("config")
+        if isinstance(config, dict):
+            max_output = config.get("max_output_tokens")
+        else:
+            max_output = getattr(config, "max_output_tokens", None)
+        return self.token_estimator.estimate(prompt) + (max_output or EXPECTED_OUTPUT_TOKENS)
+
+    @staticmethod
+    def _used_tokens(response) -> Optional[int]:
+        """Total tokens Gemini reports for a response, or None if it reports none."""
+        total = getattr(getattr(response, "usage_metadata", None), "total_token_count", None)
+        return total if isinstance(total, int) else None
+
+    async def agenerate_many(
+        self, prompts: Sequence[str], concurrency: int = 8, model: Optional[str] = None, **kwargs
+    ) -> List[Union[str, Exception]]:
+        """
+        Generate responses for many prompts with at most concurrency requests in flight.
+        Args:
+            prompts (Sequence[str]): Prompts to send.
+            concurrency (int): Maximum simultaneous requests.
+            model (Optional[str]): Optional model name override.
+            **kwargs: Additional parameters for the LLM API.
+        Returns:
+            List[Union[str, Exception]]: One entry per prompt, in prompt order: the response text,
+            or the exception raised for that prompt (one failure does not cancel the others).
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def generate(prompt: str) -> str:
+            async with semaphore:
+                return await self.agenerate_content(prompt, model=model, **kwargs)
+
+        return await asyncio.gather(
+            *(generate(prompt) for prompt in prompts), return_exceptions=True
+        )
+
+    def generate_many(
+        self, prompts: Sequence[str], concurrency: int = 8, model: Optional[str] = None, **kwargs
+    ) -> List[Union[str, Exception]]:
+        """
+        Blocking wrapper around agenerate_many for synchronous callers (not from a running event
+        loop).
+        Args:
+            prompts (Sequence[str]): Prompts to send.
+            concurrency (int): Maximum simultaneous requests.
+            model (Optional[str]): Optional model name override.
+            **kwargs: Additional parameters for the LLM API.
+        Returns:
+            List[Union[str, Exception]]: Response text or exception per prompt, in prompt order.
+        """
+        return asyncio.run(
+            self.agenerate_many(prompts, concurrency=concurrency, model=model, **kwargs)
+        )
 
     def generate_content_stream(self, prompt: str, model: Optional[str] = None, **kwargs):
         """
@@ -160,9 +342,13 @@ class LLMClient:
             RuntimeError: If the LLM API call fails.
         References: AGENTS.md, Agent_Building_Guidlines, MCP Context7, Google GenAI SDK docs
         """
+        model_name = model or self.model_name
+        reserved = self._quota_tokens(prompt, kwargs)
+        self.rate_limiter.acquire(model_name, reserved)
+        chunk = None
         try:
             for chunk in self.client.models.generate_content_stream(
-                model=model or self.model_name,
+                model=model_name,
                 contents=prompt,
                 **kwargs
             ):
@@ -170,6 +356,10 @@ class LLMClient:
         except Exception as e:
             # Log or handle error as per agent protocols
             raise RuntimeError(f"LLMClient.generate_content_stream failed: {e}")
+        finally:
+            # The last chunk carries the usage of the whole stream; a failed or abandoned stream
+            # settles with what it reported so far (or keeps the reservation if nothing came).
+            self.rate_limiter.settle(model_name, reserved, self._used_tokens(chunk))
 
     def generate_content_with_grounding(self, prompt: str, search_query: Optional[str] = None, model: Optional[str] = None, **kwargs) -> str:
         """
@@ -0,0 +1,224 @@
+"""
+OCR Fallback for the Document Intelligence Agent
+Reads scanned PDFs (no text layer) by rendering their first pages with poppler's pdftoppm and
+recognizing them with tesseract, both run as subprocesses fed through pipes: the PDF bytes go to
+pdftoppm's stdin and its PNG to tesseract's, so no files are written, even for archive members.
+- OCR runs on its own small thread pool, separate from the extraction workers, and at a lower
+  CPU priority with tesseract limited to one thread, so it never starves normal extraction
+- Page text is cached by content hash, page number and OCR settings, so no page is OCR'd twice
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+from src.handlers.base_handler import ROUTE_OCR, open_binary
+from src.handlers.text_cleanup import PAGE_BREAK
+from .extraction_cache import ExtractionCache
+from .extraction_engine import ExtractionResult
+
+# Bumped when the OCR pipeline changes, so cached page text from older versions is not reused.
+OCR_VERSION = "1"
+# Niceness added to OCR subprocesses.
+OCR_NICENESS = 10
+
+
+def _lower_priority() -> None:
+    """Run in the child before exec: make the OCR subprocess yield CPU to extraction workers."""
+    try:
+        os.nice(OCR_NICENESS)
+    except OSError:
+        pass
+
+
+class OcrPool:
+    """
+    Bounded pool that OCRs the first pages of text-less PDFs in the background.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_pages: int = 3,
+        dpi: int = 200,
+        language: str = "eng",
+        cache: Optional[ExtractionCache] = None,
+        timeout: float = 120,
+        tesseract_cmd: str = "tesseract",
+        pdftoppm_cmd: str = "pdftoppm",
+    ):
+        """
+        Initialize the OCR pool.
+        Args:
+            max_workers (int): Documents OCR'd at the same time.
+            max_pages (int): Leading pages rendered and recognized per document.
+            dpi (int): Rendering resolution; 200-300 suits tesseract.
+            language (str): tesseract language code(s), e.g. 'eng' or 'eng+deu'.
+            cache (Optional[ExtractionCache]): Cache for page text, keyed by content hash.
+            timeout (float): Seconds allowed per subprocess call.
+            tesseract_cmd (str): tesseract executable.
+            pdftoppm_cmd (str): pdftoppm executable.
+        """
+        self.max_pages = max_pages
+        self.dpi = dpi
+        self.language = language
+        self.cache = cache
+        self.timeout = timeout
+        self.tesseract_cmd = tesseract_cmd
+        self.pdftoppm_cmd = pdftoppm_cmd
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="ocr"
+        )
+
+    def available(self) -> bool:
+        """True if both tesseract and pdftoppm can be found."""
+        return bool(shutil.which(self.tesseract_cmd) and shutil.which(self.pdftoppm_cmd))
+
+    def submit(self, path: str) -> "Future[str]":
+        """
+        Queue a PDF for OCR.
+        Args:
+            path (str): PDF path (or virtual archive member path).
+        Returns:
+            Future[str]: Resolves to the recognized text of the first max_pages pages.
+        """
+        return self._executor.submit(self.ocr_pdf, path)
+
+    def submit_scanned(self, results: Iterable[ExtractionResult]) -> Dict[str, "Future[str]"]:
+        """
+        Queue every extraction result that triage routed to OCR.
+        Args:
+            results (Iterable[ExtractionResult]): Results from ExtractionEngine.extract_many.
+        Returns:
+            Dict[str, Future[str]]: Path -> pending OCR text, for the files that were queued.
+        """
+        return {
+            result.path: self.submit(result.path) for result in results if result.route == ROUTE_OCR
+        }
+
+    def page_key(self, content_digest: str, page_number: int) -> str:
+        """Cache key for one page's OCR text under the current settings."""
+        payload = json.dumps(
+            {
+                "ocr": OCR_VERSION, "content": content_digest, "page": page_number,
+                "dpi": self.dpi, "lang": self.language,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ocr_pdf(self, path: str) -> str:
+        """
+        OCR the first max_pages pages of a PDF, using cached page text where available.
+        Args:
+            path (str): PDF path (or virtual archive member path).
+        Returns:
+            str: Recognized text, pages separated by PAGE_BREAK.
+        Raises:
+            RuntimeError: If the PDF cannot be read or OCR fails.
+        """
+        try:
+            with open_binary(path) as f:
+                data = f.read()
+        except OSError as e:
+            raise RuntimeError(f"OCR could not read '{path}': {e}") from e
+        digest = hashlib.sha256(data).hexdigest()
+        page_count = self._page_count(data)
+        texts = []
+        for page_number in range(1, min(self.max_pages, page_count) + 1):
+            key = self.page_key(digest, page_number)
+            text = self.cache.get(key) if self.cache is not None else None
+            if text is None:
+                text = self.ocr_page(data, page_number, path)
+                if self.cache is not None:
+                    self.cache.put(key, text)
+            texts.append(text.strip())
+        return PAGE_BREAK.join(text for text in texts if text)
+
+    def ocr_page(self, data: bytes, page_number: int, name: str = "PDF") -> str:
+        """
+        Render one page with pdftoppm and recognize it with tesseract. The PDF is piped to
+        pdftoppm's stdin and the PNG to tesseract's, so nothing is written to disk.
+        Args:
+            data (bytes): Content of the PDF.
+            page_number (int): 1-based page number.
+            name (str): Name of the PDF in error messages.
+        Returns:
+            str: Recognized text of the page.
+        Raises:
+            RuntimeError: If either tool is missing, fails or times out.
+        """
+        page = str(page_number)
+        render_cmd = [
+            self.pdftoppm_cmd, "-f", page, "-l", page, "-r", str(self.dpi), "-gray", "-png", "-"
+        ]
+        ocr_cmd = [self.tesseract_cmd, "stdin", "stdout", "-l", self.language]
+        # tesseract's OpenMP threads would otherwise compete with the extraction workers for every
+        # core.
+        env = dict(os.environ, OMP_THREAD_LIMIT="1")
+        preexec = _lower_priority if os.name == "posix" else None
+        try:
+            image = subprocess.run(
+                render_cmd, input=data, capture_output=True, timeout=self.timeout, check=True,
+                preexec_fn=preexec,
+            ).stdout
+            result = subprocess.run(
+                ocr_cmd, input=image, capture_output=True, timeout=self.timeout, check=True,
+                env=env, preexec_fn=preexec,
+            )
+        except FileNotFoundError as e:
+            raise RuntimeError(f"OCR requires tesseract and poppler's pdftoppm on PATH: {e}") from e
+        except subprocess.CalledProcessError as e:
+            detail = (e.stderr or b"").decode("utf-8", errors="replace").strip()
+            raise RuntimeError(
+                f"OCR failed on page {page_number} of '{name}': {detail or e}"
+            ) from e
+        except subprocess.TimeoutExpired as e:
+            raise RuntimeError(f"OCR timed out on page {page_number} of '{name}'") from e
+        return result.stdout.decode("utf-8", errors="replace")
+
+    def _page_count(self, data: bytes) -> int:
+        """Number of pages in the PDF, or max_pages if it cannot be determined."""
+        try:
+            from pypdf import PdfReader
+            return len(PdfReader(io.BytesIO(data)).pages)
+        except Exception:
+            return self.max_pages
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool; queued documents are cancelled unless wait is True."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self) -> "OcrPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+
+
+def apply_ocr(
+    result: ExtractionResult, future: "Future[str]", max_chars: Optional[int] = None
+) -> ExtractionResult:
+    """
+    Wait for a queued OCR job and fold its text into the file's extraction result.
+    Args:
+        result (ExtractionResult): The text-less extraction result the job was queued for.
+        future (Future[str]): Pending OCR text from OcrPool.submit.
+        max_chars (Optional[int]): Cap on the OCR text kept, matching the extraction budget.
+    Returns:
+        ExtractionResult: The result with the recognized text and no error, or with the OCR
+        error when recognition failed or found no text.
+    """
+    try:
+        text = future.result()
+    except Exception as e:
+        return result._replace(error=f"OCR failed: {e}")
+    if not text.strip():
+        return result._replace(error="OCR found no text")
+    if max_chars is not None:
+        text = text[:max_chars]
+    return result._replace(text=text, error=None)
@@ -0,0 +1,174 @@
+"""
+Client-side Rate Limiting for the Document Intelligence Agent
+Keeps Gemini calls under each model's per-minute request (RPM) and token (TPM) quotas, so
+concurrent runs work at the quota ceiling instead of provoking bursts of 429 errors.
+- Every model has two token buckets (requests and tokens) refilled continuously at its quota per
+  minute; a call reserves one request plus its estimated input and output tokens up front, and the
+  token estimate is settled against the usage Gemini reports afterwards
+- A reservation is booked under a short lock and returns how long the caller must wait, so the
+  same limiter serves threads (time.sleep) and coroutines (asyncio.sleep) without blocking either;
+  coroutines book file-backed reservations in a worker thread
+- With a state file, the bucket levels live in a JSON file guarded by an exclusive file lock and
+  are shared by every process using that file (POSIX only; elsewhere limits are per process)
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+
+class RateQuota(NamedTuple):
+    """Per-minute quotas of one model; None leaves that dimension unlimited."""
+    rpm: Optional[int] = None
+    tpm: Optional[int] = None
+
+
+# Tier 1 quotas of the models the agent calls; override them with LLMClient(rate_limits=...).
+DEFAULT_QUOTAS: Dict[str, RateQuota] = {
+    "models/gemini-2.5-pro": RateQuota(rpm=150, tpm=2_000_000),
+    "models/gemini-2.5-flash": RateQuota(rpm=1000, tpm=1_000_000),
+}
+# Share of each quota the limiter uses. Together with the burst allowance below, no rolling minute
+# carries more than the full quota.
+QUOTA_HEADROOM = 0.9
+# Bucket capacity as a share of the per-minute rate: how much may be sent at once after idling.
+BURST_FRACTION = 0.1
+# Output tokens reserved for a call that sets no max_output_tokens (settled after the response).
+EXPECTED_OUTPUT_TOKENS = 1024
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests and tokens per minute, per model.
+    """
+
+    def __init__(
+        self,
+        quotas: Optional[Dict[str, RateQuota]] = None,
+        state_file: Optional[str] = None,
+        headroom: float = QUOTA_HEADROOM,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the limiter.
+        Args:
+            quotas (Optional[Dict[str, RateQuota]]): Model name -> quotas; models not listed are
+                unlimited. Defaults to DEFAULT_QUOTAS.
+            state_file (Optional[str]): JSON file holding the bucket levels, to share the quotas
+                between processes; None keeps them in memory.
+            headroom (float): Share of each quota to use.
+            clock (Callable[[], float]): Wall-clock seconds (wall time, so processes agree on it).
+        """
+        self.quotas = dict(DEFAULT_QUOTAS if quotas is None else quotas)
+        self.state_file = state_file
+        self.headroom = headroom
+        self.clock = clock
+        self._state: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, model: str, tokens: int) -> float:
+        """
+        Book one request and tokens against a model's quotas. The booking happens at once, so
+        callers that come later queue behind it.
+        Args:
+            model (str): Model the call goes to.
+            tokens (int): Estimated input plus output tokens of the call.
+        Returns:
+            float: Seconds to wait before sending the call (0.0 if it may go now).
+        """
+        quota = self.quotas.get(model)
+        if quota is None or not (quota.rpm or quota.tpm):
+            return 0.0
+        wait = 0.0
+        with self._buckets(model, quota) as levels:
+            for index, (limit, cost) in enumerate(((quota.rpm, 1), (quota.tpm, tokens))):
+                if limit:
+                    levels[index] -= cost
+                    if levels[index] < 0:
+                        wait = max(wait, -levels[index] / self._rate(limit))
+        return wait
+
+    def settle(self, model: str, reserved: int, used: Optional[int]) -> None:
+        """
+        Correct a reservation with the tokens the call actually used.
+        Args:
+            model (str): Model the call went to.
+            reserved (int): Tokens reserved for it.
+            used (Optional[int]): Tokens reported by the API; None keeps the reservation.
+        """
+        quota = self.quotas.get(model)
+        if used is None or quota is None or not quota.tpm:
+            return
+        with self._buckets(model, quota) as levels:
+            levels[1] = min(self._capacity(quota.tpm), levels[1] + reserved - used)
+
+    def acquire(self, model: str, tokens: int) -> None:
+        """Reserve a call and sleep until it may be sent (for threads and synchronous code)."""
+        wait = self.reserve(model, tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, model: str, tokens: int) -> None:
+        """Reserve a call and wait without blocking the event loop until it may be sent."""
+        if self.state_file is None:
+            wait = self.reserve(model, tokens)
+        else:
+            # The state file is locked and fsynced, which can block; keep that off the event loop.
+            wait = await asyncio.to_thread(self.reserve, model, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _rate(self, limit: int) -> float:
+        """Refill rate per second for a per-minute quota."""
+        return limit * self.headroom / 60
+
+    def _capacity(self, limit: int) -> float:
+        """Bucket capacity for a per-minute quota (at least one unit, so a call can always fit)."""
+        return max(1.0, limit * self.headroom * BURST_FRACTION)
+
+    @contextmanager
+    def _buckets(self, model: str, quota: RateQuota) -> Iterator[List[float]]:
+        """Yield the model's [requests, tokens, updated_at] levels, refilled to now; saved after."""
+        with self._lock, self._shared_state() as state:
+            now = self.clock()
+            levels = state.get(model)
+            if levels is None:
+                levels = [self._capacity(quota.rpm or 1), self._capacity(quota.tpm or 1), now]
+            elapsed = max(0.0, now - levels[2])
+            for index, limit in ((0, quota.rpm), (1, quota.tpm)):
+                if limit:
+                    refilled = levels[index] + elapsed * self._rate(limit)
+                    levels[index] = min(self._capacity(limit), refilled)
+            levels[2] = now
+            state[model] = levels
+            yield levels
+
+    @contextmanager
+    def _shared_state(self) -> Iterator[Dict[str, List[float]]]:
+        """The bucket levels: in memory, or read from and written back to the locked state file."""
+        try:
+            import fcntl
+        except ImportError:
+            fcntl = None
+        if self.state_file is None or fcntl is None:
+            yield self._state
+            return
+        with open(self.state_file, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}  # A torn or foreign file: start from full buckets.
+                yield state
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
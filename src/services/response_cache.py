@@ -0,0 +1,217 @@
+"""
+LLM Response Cache for the Document Intelligence Agent
+Persistent store of Gemini responses so re-running a workflow over unchanged files does not pay
+for byte-identical prompts again.
+- Keys hash the model name, the rendered prompt and the generation parameters
+- Entries live in one SQLite database (WAL mode), which several threads and processes can share
+- Entries expire after a TTL and are evicted least-recently-used once the database exceeds its
+  size bound; hit/miss counters report how much was saved
+- The total size is kept in a metadata row that triggers update in the same transaction as each
+  insert, update or delete, so checking the bound does not scan the table
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+DEFAULT_RESPONSE_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH", os.path.join(".cache", "llm_responses.sqlite3")
+)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64MB of response text
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+# Seconds a writer waits for another connection's lock before giving up on the operation.
+SQLITE_TIMEOUT = 10.0
+# Triggers that keep the 'total_size' row of meta equal to SUM(size) of responses.
+SIZE_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS responses_size_insert AFTER INSERT ON responses BEGIN "
+    "UPDATE meta SET value = value + NEW.size WHERE key = 'total_size'; END",
+    "CREATE TRIGGER IF NOT EXISTS responses_size_delete AFTER DELETE ON responses BEGIN "
+    "UPDATE meta SET value = value - OLD.size WHERE key = 'total_size'; END",
+    "CREATE TRIGGER IF NOT EXISTS responses_size_update AFTER UPDATE OF size ON responses BEGIN "
+    "UPDATE meta SET value = value + NEW.size - OLD.size WHERE key = 'total_size'; END",
+)
+
+
+def _jsonable(value: Any) -> Any:
+    """JSON form of generation parameters: SDK config objects by their set fields, else repr."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(exclude_none=True, mode="json")
+    return repr(value)
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of LLM responses with TTL expiry and LRU eviction.
+    Connections are opened per operation, so one instance can be used from any thread.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_RESPONSE_CACHE_PATH,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        bypass: bool = False,
+    ):
+        """
+        Initialize the cache.
+        Args:
+            path (str): SQLite database file (its directory is created if missing).
+            ttl_seconds (Optional[float]): Age after which an entry is no longer served; None keeps
+                entries until evicted.
+            max_bytes (int): Size bound for the stored responses; least recently used entries are
+                evicted beyond it.
+            bypass (bool): If True, lookups always miss but fresh responses are still stored (a
+                refresh run).
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT, response TEXT, size INTEGER, "
+                "created REAL, accessed REAL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+            for trigger in SIZE_TRIGGERS:
+                db.execute(trigger)
+            # Seeded once from the table, so databases written before the triggers existed add up.
+            db.execute(
+                "INSERT OR IGNORE INTO meta (key, value) "
+                "SELECT 'total_size', COALESCE(SUM(size), 0) FROM responses"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection for one operation, committed (or rolled back on error), then closed."""
+        db = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a call.
+        Args:
+            model (str): Model name.
+            prompt (str): Rendered prompt.
+            params (Optional[dict]): Generation parameters (e.g. the config passed to the SDK).
+        Returns:
+            str: Hex key identifying the entry.
+        """
+        material = json.dumps(
+            {"model": model, "prompt": prompt, "params": params or {}},
+            sort_keys=True,
+            default=_jsonable,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response and mark it as recently used; expired entries are deleted.
+        Args:
+            key (str): Key from make_key.
+        Returns:
+            Optional[str]: The cached response, or None on a miss (always, when bypass is set).
+        """
+        response = None
+        if not self.bypass:
+            now = time.time()
+            try:
+                with self._connect() as db:
+                    row = db.execute(
+                        "SELECT response, created FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                        db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    elif row:
+                        db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                        response = row[0]
+            except sqlite3.Error:
+                response = None
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """
+        Store a response and evict old entries if the size bound is exceeded.
+        Failures are ignored: the cache is an optimization, never a source of errors.
+        Args:
+            key (str): Key from make_key.
+            model (str): Model that produced the response.
+            response (str): Response text.
+        """
+        now = time.time()
+        try:
+            with self._connect() as db:
+                # An upsert rather than INSERT OR REPLACE: REPLACE deletes without firing triggers.
+                db.execute(
+                    "INSERT INTO responses (key, model, response, size, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                    "model = excluded.model, response = excluded.response, size = excluded.size, "
+                    "created = excluded.created, accessed = excluded.accessed",
+                    (key, model, response, len(response.encode("utf-8")), now, now),
+                )
+                total = self._total_size(db)
+                if total > self.max_bytes:
+                    self._evict(db, total)
+        except sqlite3.Error:
+            return
+
+    def _evict(self, db: sqlite3.Connection, total: int) -> None:
+        """Delete expired entries, then least-recently-used ones until under 90% of max_bytes."""
+        if self.ttl_seconds is not None:
+            db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+            total = self._total_size(db)
+        target = int(self.max_bytes * 0.9)
+        doomed = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    @staticmethod
+    def _total_size(db: sqlite3.Connection) -> int:
+        """Bytes currently stored, from the metadata row the size triggers maintain."""
+        row = db.execute("SELECT value FROM meta WHERE key = 'total_size'").fetchone()
+        return row[0] if row else 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hits and misses of this instance, and the entries and bytes currently stored."""
+        try:
+            with self._connect() as db:
+                entries = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                size = self._total_size(db)
+        except sqlite3.Error:
+            entries, size = 0, 0
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        try:
+            with self._connect() as db:
+                db.execute("DELETE FROM responses")
+        except sqlite3.Error:
+            pass
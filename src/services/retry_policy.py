@@ -0,0 +1,174 @@
+"""
+Retry Policy for Gemini Calls
+Retries transient API failures with exponential backoff and full jitter, and gives up at once on
+permanent ones, so a busy quota window or a brief outage does not send files to the Error folder.
+- Retryable: HTTP 408/429 and 5xx (except 501), timeouts and dropped connections; anything else
+  (bad request, auth, safety blocks, ...) is permanent and raised on the first attempt
+- A server retry hint (the Retry-After header or the RetryInfo retryDelay of a 429) is waited out
+  in preference to the computed backoff
+- Attempts stop when max_attempts is reached or the next wait would exceed max_total_seconds
+"""
+import asyncio
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying besides 5xx; 501 (not implemented) never succeeds on retry.
+RETRYABLE_STATUS = {408, 429}
+PERMANENT_SERVER_STATUS = {501}
+# RetryInfo delays are protobuf durations such as "13s" or "0.250s".
+DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)s\s*$")
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of an API error (google-genai APIError.code, or its response's), if any."""
+    code = getattr(error, "code", None)
+    if not isinstance(code, int):
+        code = getattr(getattr(error, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    True for transient failures: 408/429/5xx responses, timeouts and connection errors.
+    Args:
+        error (BaseException): The exception a call raised.
+    Returns:
+        bool: Whether the same call may succeed if repeated.
+    """
+    code = status_code(error)
+    if code is not None:
+        return code in RETRYABLE_STATUS or (code >= 500 and code not in PERMANENT_SERVER_STATUS)
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(
+        error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+    )
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Seconds the server asked the client to wait, from a Retry-After header or a RetryInfo detail.
+    Args:
+        error (BaseException): The exception a call raised.
+    Returns:
+        Optional[float]: The hinted delay, or None if the error carries no hint.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is not None:
+        try:
+            value = headers.get("retry-after")
+            if value is not None:
+                return max(0.0, float(value))
+        except (TypeError, ValueError, AttributeError):
+            pass  # An HTTP date or an unexpected headers type: look for RetryInfo instead.
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        inner = details.get("error", details)
+        details = inner.get("details") if isinstance(inner, dict) else None
+    for detail in details if isinstance(details, list) else []:
+        if isinstance(detail, dict) and str(detail.get("@type", "")).endswith("RetryInfo"):
+            match = DURATION.match(str(detail.get("retryDelay", "")))
+            if match:
+                return float(match.group(1))
+    return None
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before repeating a failed call.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        max_total_seconds: float = 180.0,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialize the policy.
+        Args:
+            max_attempts (int): Calls made in total, including the first (1 disables retries).
+            base_delay (float): Backoff ceiling for the first retry, in seconds; it doubles per
+                attempt.
+            max_delay (float): Upper bound on a single backoff ceiling.
+            max_total_seconds (float): Retrying stops when the time spent plus the next wait
+                would exceed this.
+            rng (Optional[random.Random]): Source of jitter (seedable for tests).
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_seconds = max_total_seconds
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt: int, error: BaseException) -> float:
+        """
+        Wait before retry number attempt (1-based): the server's hint if it gave one, otherwise a
+        random delay up to base_delay * 2 ** (attempt - 1), capped at max_delay ("full jitter").
+        """
+        hint = retry_after(error)
+        if hint is not None:
+            # A little jitter on top, so clients told the same delay do not return in lockstep.
+            return hint + self.rng.uniform(0, self.base_delay)
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def next_delay(self, attempt: int, error: BaseException, elapsed: float) -> Optional[float]:
+        """
+        Wait before retrying after a failed attempt, or None if the call should not be retried.
+        Args:
+            attempt (int): Number of the attempt that failed (1-based).
+            error (BaseException): Its exception.
+            elapsed (float): Seconds spent on the call so far.
+        Returns:
+            Optional[float]: Seconds to wait, or None to give up.
+        """
+        if attempt >= self.max_attempts or not is_retryable(error):
+            return None
+        wait = self.delay(attempt, error)
+        if elapsed + wait > self.max_total_seconds:
+            return None
+        return wait
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Call func, retrying transient failures.
+        Returns:
+            The result of the first successful call.
+        Raises:
+            Exception: The last error, when it is permanent or retries are exhausted.
+        """
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                wait = self.next_delay(attempt, e, time.monotonic() - start)
+                if wait is None:
+                    raise
+            time.sleep(wait)
+
+    async def acall(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Async call: awaits func, retrying transient failures without blocking the event loop."""
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                wait = self.next_delay(attempt, e, time.monotonic() - start)
+                if wait is None:
+                    raise
+            await asyncio.sleep(wait)
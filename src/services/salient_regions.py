@@ -0,0 +1,221 @@
+"""
+Salient Region Selection for the Document Intelligence Agent
+Builds LLM prompt text from the most informative parts of a document instead of its first N
+characters, which for papers are often journal banners, licenses and affiliation lists.
+Runs locally, without any LLM call.
+- Structural cues pick the title-page lines, the abstract, section headings and the conclusion
+- Remaining budget goes to the blocks with the highest TF-IDF weight within the document
+- Boilerplate (copyright/license lines, DOIs, e-mail and affiliation lines, download banners) is
+  never selected, and nothing after the references heading is considered
+"""
+import math
+import re
+from collections import Counter
+from typing import List, NamedTuple, Optional
+
+from .token_estimator import TokenEstimator
+
+# Leading non-empty lines treated as the title page.
+TITLE_PAGE_LINES = 12
+# Title-page lines longer than this are body text, not title/author lines.
+MAX_TITLE_LINE_CHARS = 200
+# Paragraphs are cut into blocks of at most this many characters (at line breaks).
+MAX_BLOCK_CHARS = 1200
+# Section heading: optional number ("2", "3.1", "IV."), then a short capitalized phrase.
+HEADING = re.compile(r"^\s*((\d+(\.\d+)*|[IVX]+)\.?\s+)?[A-Z][A-Za-z][\w ,:&/()'-]{0,70}$")
+MAX_HEADING_WORDS = 8
+ABSTRACT_HEADING = re.compile(r"^\s*(abstract|summary)\b[\s.:—-]*", re.IGNORECASE)
+CONCLUSION_HEADING = re.compile(
+    r"^\s*((\d+|[IVX]+)\.?\s+)?"
+    r"(conclusions?|concluding remarks|summary and conclusions?|discussion and conclusions?)\b",
+    re.IGNORECASE,
+)
+# Back matter: nothing from here on is selected.
+BACK_MATTER_HEADING = re.compile(
+    r"^\s*((\d+|[IVX]+)\.?\s+)?(references|bibliography|acknowledge?ments?|works cited)\s*$",
+    re.IGNORECASE,
+)
+BOILERPLATE = re.compile(
+    r"©|\(c\)\s*\d{4}|copyright|all rights reserved|creative commons|licen[cs]e[ds]? under|"
+    r"open access|\bdoi\b|https?://|www\.|@[\w-]+\.|downloaded from|journal homepage|"
+    r"received:?\s+\d|accepted:?\s+\d|"
+    r"published online|available online|issn|corresponding author|\bpreprint\b|"
+    r"\b(vol\.|volume|issue|pp\.)\s*\d|\bjournal\b.*\b(19|20)\d{2}\b|"
+    r"^\s*(page\s*)?\d+(\s*(of|/)\s*\d+)?\s*$",
+    re.IGNORECASE,
+)
+# Affiliation lines: an institution word plus commas or a postcode-like number.
+AFFILIATION = re.compile(
+    r"\b(university|universit[äéà]|institute|department|faculty|school of|laborator(y|ies)|college|"
+    r"hospital)\b",
+    re.IGNORECASE,
+)
+TERM = re.compile(r"[^\W\d_]{3,}")
+# Selected blocks are joined one per line; each separator counts against the budget.
+SEPARATOR = "\n"
+STOPWORDS = frozenset(
+    "the and for with that this from are was were has have had not but its their they them these "
+    "those which when where what who whom will would can could may might been being than then "
+    "there here into onto also such each other our your his her all any some more most very only "
+    "over under between about after before during while both either nor per via using used use "
+    "one two three".split()
+)
+
+
+class Block(NamedTuple):
+    """A paragraph-sized region of the document: offsets into the text, and its kind."""
+    start: int
+    end: int
+    kind: str  # 'title', 'heading', 'abstract', 'conclusion' or 'body'
+
+
+def _is_boilerplate(line: str) -> bool:
+    """True for license, DOI, contact, affiliation and page-number lines."""
+    if BOILERPLATE.search(line):
+        return True
+    return bool(AFFILIATION.search(line)) and ("," in line or bool(re.search(r"\d", line)))
+
+
+def _is_heading(line: str) -> bool:
+    """True for short, capitalized lines that do not end like a sentence."""
+    stripped = line.strip()
+    return (
+        bool(HEADING.match(stripped))
+        and len(stripped.split()) <= MAX_HEADING_WORDS
+        and not stripped.endswith((".", ",", ";"))
+    )
+
+
+def split_blocks(text: str) -> List[Block]:
+    """
+    Split a document into title lines, headings and paragraph blocks, tagging the abstract and
+    conclusion sections. Boilerplate lines and everything after the references are left out.
+    Args:
+        text (str): Extracted document text.
+    Returns:
+        List[Block]: Blocks in document order.
+    """
+    blocks: List[Block] = []
+    section = "body"
+    paragraph_start = paragraph_end = None
+    non_empty = 0
+    title_page = True  # Until the abstract or first numbered heading
+
+    def flush():
+        nonlocal paragraph_start, paragraph_end
+        if paragraph_start is not None:
+            blocks.append(Block(paragraph_start, paragraph_end, section))
+        paragraph_start = paragraph_end = None
+
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        start, offset = offset, offset + len(line)
+        end = start + len(line.rstrip("\r\n"))
+        stripped = line.strip()
+        if not stripped:
+            flush()
+            continue
+        non_empty += 1
+        if _is_boilerplate(stripped):
+            flush()
+            continue
+        if BACK_MATTER_HEADING.match(stripped):
+            flush()
+            break
+        numbered_heading = _is_heading(stripped) and HEADING.match(stripped).group(1)
+        title_page = (
+            title_page and non_empty <= TITLE_PAGE_LINES
+            and not ABSTRACT_HEADING.match(stripped) and not numbered_heading
+        )
+        if title_page and len(stripped) <= MAX_TITLE_LINE_CHARS:
+            flush()
+            blocks.append(Block(start, end, "title"))
+            continue
+        title_page = False
+        abstract = ABSTRACT_HEADING.match(stripped)
+        if abstract or CONCLUSION_HEADING.match(stripped) or _is_heading(stripped):
+            flush()
+            if abstract:
+                section = "abstract"
+            else:
+                section = "conclusion" if CONCLUSION_HEADING.match(stripped) else "body"
+            if abstract and abstract.end() < len(stripped):
+                # "Abstract: We study ..." on one line: the rest of the line is abstract text.
+                indent = len(line) - len(line.lstrip())
+                paragraph_start, paragraph_end = start + indent + abstract.end(), end
+                continue
+            blocks.append(Block(start, end, "heading"))
+            continue
+        if paragraph_start is not None and end - paragraph_start > MAX_BLOCK_CHARS:
+            flush()
+        if paragraph_start is None:
+            paragraph_start = start
+        paragraph_end = end
+    flush()
+    return blocks
+
+
+def _tfidf_scores(texts: List[str]) -> List[float]:
+    """Length-normalized TF-IDF weight of each block, with IDF taken over the document's blocks."""
+    counts = [
+        Counter(t for t in TERM.findall(text.lower()) if t not in STOPWORDS) for text in texts
+    ]
+    df = Counter(term for count in counts for term in count)
+    total = len(texts)
+    scores = []
+    for count in counts:
+        length = sum(count.values())
+        if not length:
+            scores.append(0.0)
+            continue
+        weight = sum(tf * math.log((1 + total) / (1 + df[term])) for term, tf in count.items())
+        scores.append(weight / math.sqrt(length))
+    return scores
+
+
+def select_salient_text(
+    text: str, max_tokens: int, estimator: Optional[TokenEstimator] = None
+) -> str:
+    """
+    Assemble up to max_tokens of a document's most informative text, in document order.
+    Priority: title-page lines, abstract, conclusion, section headings, then the remaining blocks
+    by TF-IDF weight. A priority block that does not fit is cut to the tokens left.
+    Args:
+        text (str): Extracted document text.
+        max_tokens (int): Token budget for the selection.
+        estimator (Optional[TokenEstimator]): Token counter; a local estimator by default.
+    Returns:
+        str: Selected regions joined by newlines (the text itself when it already fits).
+    """
+    estimator = estimator or TokenEstimator()
+    if estimator.estimate(text) <= max_tokens:
+        return text.strip()
+    blocks = split_blocks(text)
+    if not blocks:
+        return ""
+    texts = [text[block.start:block.end] for block in blocks]
+    scores = _tfidf_scores(texts)
+    tiers = {"title": 0, "abstract": 1, "conclusion": 2, "heading": 3, "body": 4}
+    order = sorted(
+        range(len(blocks)),
+        key=lambda i: (tiers[blocks[i].kind], -scores[i] if blocks[i].kind == "body" else i),
+    )
+    chosen = {}
+    separator = estimator.estimate(SEPARATOR)
+    remaining = max_tokens
+    for i in order:
+        # Every block after the first also costs the separator that joins it to the others.
+        joint = separator if chosen else 0
+        if remaining - joint <= 0:
+            break
+        tokens = estimator.estimate(texts[i])
+        if tokens + joint <= remaining:
+            chosen[i] = texts[i]
+            remaining -= tokens + joint
+        elif blocks[i].kind in ("abstract", "conclusion"):
+            spans = estimator.iter_chunk_spans(texts[i], max_tokens=remaining - joint, overlap=0)
+            span = next(spans, None)
+            if span:
+                chosen[i] = texts[i][span[0]:span[1]]
+                remaining -= estimator.estimate(chosen[i]) + joint
+    return SEPARATOR.join(chosen[i].strip() for i in sorted(chosen))
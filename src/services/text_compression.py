@@ -0,0 +1,138 @@
+"""
+Extractive Compression for the Document Intelligence Agent
+Shrinks prompt text to a token target by keeping its most central sentences (TextRank), so fewer
+Gemini input tokens are sent per file. Runs locally on the CPU; similarity and ranking are
+NumPy-vectorized, so a pass over a few thousand sentences takes milliseconds.
+- Sentences become TF-IDF vectors; their cosine similarities form the TextRank graph
+- Sentences are kept by rank until the token target is met, then emitted in document order
+"""
+import re
+from typing import List, Optional, Tuple
+
+from .salient_regions import STOPWORDS, TERM
+from .token_estimator import TokenEstimator
+
+# Sentence boundary: terminal punctuation followed by whitespace, or a line break.
+SENTENCE_END = re.compile(r"(?<=[.!?;])\s+|\s*\n\s*")
+# Only this many leading sentences are ranked (the similarity matrix is quadratic in it).
+MAX_SENTENCES = 2000
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 50
+TEXTRANK_TOLERANCE = 1e-6
+# Kept sentences are joined one per line; each separator counts against the target.
+SEPARATOR = "\n"
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """
+    Split text into sentences (and separate lines, such as headings).
+    Args:
+        text (str): Text to split.
+    Returns:
+        List[Tuple[int, int]]: (start, end) offsets of each non-empty sentence.
+    """
+    spans = []
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        if match.start() > start:
+            spans.append((start, match.start()))
+        start = match.end()
+    if start < len(text) and text[start:].strip():
+        spans.append((start, len(text.rstrip())))
+    return spans
+
+
+def textrank_scores(sentences: List[str]):
+    """
+    Rank sentences by TextRank centrality over cosine similarity of their TF-IDF vectors.
+    Args:
+        sentences (List[str]): Sentence texts.
+    Returns:
+        numpy.ndarray: One score per sentence; the scores sum to 1.
+    """
+    import numpy as np
+
+    count = len(sentences)
+    vocabulary = {}
+    rows, columns = [], []
+    for row, sentence in enumerate(sentences):
+        for term in TERM.findall(sentence.lower()):
+            if term not in STOPWORDS:
+                rows.append(row)
+                columns.append(vocabulary.setdefault(term, len(vocabulary)))
+    vectors = np.zeros((count, max(1, len(vocabulary))), dtype=np.float32)
+    np.add.at(vectors, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), 1.0)
+    document_frequency = np.count_nonzero(vectors, axis=0)
+    vectors *= np.log((1 + count) / (1 + document_frequency)).astype(np.float32) + 1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms == 0, 1.0, norms)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    # Row-normalize into transition probabilities; isolated sentences link uniformly.
+    weights = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(
+        weights > 0, similarity / np.where(weights == 0, 1.0, weights), 1.0 / count
+    )
+    scores = np.full(count, 1.0 / count)
+    for _ in range(TEXTRANK_ITERATIONS):
+        updated = (1 - TEXTRANK_DAMPING) / count + TEXTRANK_DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TEXTRANK_TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def compress_text(
+    text: str,
+    target_tokens: int,
+    estimator: Optional[TokenEstimator] = None,
+    keep_leading: int = 1,
+) -> str:
+    """
+    Compress text to at most target_tokens by keeping its highest-ranked sentences, each distinct
+    sentence once.
+    Args:
+        text (str): Text to compress (e.g. the salient regions selected for a prompt).
+        target_tokens (int): Token budget for the result.
+        estimator (Optional[TokenEstimator]): Token counter; a local estimator by default.
+        keep_leading (int): Leading sentences always kept (usually the title line).
+    Returns:
+        str: Kept sentences in document order, one per line (the text itself when it already fits).
+    """
+    estimator = estimator or TokenEstimator()
+    if estimator.estimate(text) <= target_tokens:
+        return text
+    spans = split_sentences(text)[:MAX_SENTENCES]
+    if not spans:
+        return ""
+    # Repeated sentences (text copied across pages, boilerplate) are ranked and kept once: as
+    # duplicates they would reinforce one another in the similarity graph.
+    sentences = []
+    seen = set()
+    for start, end in spans:
+        normalized = " ".join(text[start:end].lower().split())
+        if normalized not in seen:
+            seen.add(normalized)
+            sentences.append(text[start:end])
+    costs = [estimator.estimate(sentence) for sentence in sentences]
+    scores = textrank_scores(sentences)
+    order = list(range(min(keep_leading, len(sentences))))
+    order += [i for i in map(int, scores.argsort()[::-1]) if i >= keep_leading]
+    kept = []
+    separator = estimator.estimate(SEPARATOR)
+    remaining = target_tokens
+    for i in order:
+        cost = costs[i] + (separator if kept else 0)
+        if cost <= remaining:
+            kept.append(i)
+            remaining -= cost
+        if remaining <= 0:
+            break
+    if not kept:
+        # Not even one sentence fits: cut the top-ranked one to the budget.
+        top = sentences[order[0]]
+        span = next(estimator.iter_chunk_spans(top, max_tokens=target_tokens, overlap=0), (0, 0))
+        return top[span[0]:span[1]]
+    return SEPARATOR.join(sentences[i].strip() for i in sorted(kept))
+
@@ -0,0 +1,218 @@
+"""
+Token Estimation for the Document Intelligence Agent
+Estimates Gemini token counts locally so prompts can be cut to a token budget instead of a word
+count. Whitespace-separated words are a poor proxy: a CJK sentence is one "word" of many tokens,
+and URLs or base64 blobs can be thousands of tokens long.
+- The local estimate prices each piece of text by kind (CJK character, word, digit, symbol,
+  newline) and scales the total by a calibration factor
+- Exact counts come from the Gemini count_tokens API when enabled (LLMClient enables them by
+  default); they are cached by content hash and used to recalibrate the local estimate for the
+  document being chunked, since the constants below are only an approximation
+"""
+import hashlib
+import math
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Iterator, List, Optional, Tuple
+
+# Hiragana/Katakana, CJK ideographs and Hangul: roughly one token per character.
+CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+# Pieces the estimator prices: CJK characters, letter runs, single digits (Gemini splits numbers
+# into digits), whitespace runs, and any other single character.
+TOKEN_PIECE = re.compile(rf"[{CJK_CHARS}]|[^\W\d_{CJK_CHARS}]+|\d|\s+|.", re.DOTALL)
+# Letter runs cost one token per this many characters. The constants are an approximation, not a
+# fit to recorded count_tokens output (which is why LLMClient calibrates against the API by
+# default); they are set so English prose matches Google's published Gemini rule of thumb (about
+# 4 characters per token, 100 tokens to 60-80 words): with 6, most words cost one token and long
+# ones two, which with punctuation gives 4-4.7 characters and 135-166 tokens per 100 words on the
+# English samples pinned in tests/test_llm_client.py.
+WORD_CHARS_PER_TOKEN = 6
+# Mixed-case runs (base64, identifiers, hashes) fall outside the vocabulary's whole words and split
+# into short fragments; 3 characters per token is a deliberately conservative guess, not a fit.
+MIXED_CHARS_PER_TOKEN = 3
+# Estimated tokens are multiplied by this factor. 1.0 trusts the ratios above as they are; with
+# exact counting on (LLMClient's default), each document gets its own factor fitted against
+# count_tokens instead.
+DEFAULT_CALIBRATION = 1.0
+# Characters of a document sent to count_tokens to calibrate the estimate for it.
+CALIBRATION_SAMPLE_CHARS = 8000
+# Exact counts kept in memory, keyed by content hash.
+EXACT_CACHE_SIZE = 1024
+
+
+def piece_tokens(piece: str) -> int:
+    """
+    Estimated Gemini tokens for one piece matched by TOKEN_PIECE.
+    Args:
+        piece (str): A CJK character, letter run, digit, whitespace run or other character.
+    Returns:
+        int: Estimated tokens; single spaces are free (they merge into the following word).
+    """
+    first = piece[0]
+    if first.isspace():
+        return 0 if piece == " " else 1
+    if len(piece) == 1:
+        return 1
+    if piece.islower() or piece.isupper() or piece.istitle():
+        return math.ceil(len(piece) / WORD_CHARS_PER_TOKEN)
+    return math.ceil(len(piece) / MIXED_CHARS_PER_TOKEN)
+
+
+def iter_pieces(text: str):
+    """Yield (start, end, estimated tokens) for each piece of text, in order."""
+    for match in TOKEN_PIECE.finditer(text):
+        yield match.start(), match.end(), piece_tokens(match.group(0))
+
+
+class TokenEstimator:
+    """
+    Estimates (or, with a client, counts) Gemini tokens and splits text on token budgets.
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        model: Optional[str] = None,
+        exact: bool = False,
+        calibration: float = DEFAULT_CALIBRATION,
+    ):
+        """
+        Initialize the estimator.
+        Args:
+            client (Any): Optional google-genai Client, used for exact counts.
+            model (Optional[str]): Model whose tokenizer is counted against.
+            exact (bool): If True (and a client is given), count through the API, with results
+                cached.
+            calibration (float): Factor applied to local estimates.
+        """
+        self.client = client
+        self.model = model
+        self.exact = exact and client is not None
+        self.calibration = calibration
+        self._exact_counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def estimate(self, text: str) -> int:
+        """Local token estimate for text, scaled by the calibration factor."""
+        return math.ceil(sum(cost for _, _, cost in iter_pieces(text)) * self.calibration)
+
+    def count_exact(self, text: str) -> Optional[int]:
+        """
+        Count tokens with the Gemini count_tokens API, caching the result by content hash.
+        Args:
+            text (str): Text to count.
+        Returns:
+            Optional[int]: The exact count, or None if exact counting is off or the call failed.
+            A failed call turns exact counting off, so an unreachable API is not retried for
+            every document.
+        """
+        if not self.exact:
+            return None
+        key = hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._exact_counts:
+                self._exact_counts.move_to_end(key)
+                return self._exact_counts[key]
+        try:
+            total = self.client.models.count_tokens(model=self.model, contents=text).total_tokens
+        except Exception:
+            # Counting is an optimization; the local estimate still works.
+            self.exact = False
+            return None
+        if not isinstance(total, int):
+            return None
+        with self._lock:
+            self._exact_counts[key] = total
+            while len(self._exact_counts) > EXACT_CACHE_SIZE:
+                self._exact_counts.popitem(last=False)
+        return total
+
+    def count(self, text: str) -> int:
+        """Exact token count when available, otherwise the local estimate."""
+        exact = self.count_exact(text)
+        return exact if exact is not None else self.estimate(text)
+
+    def scale_for(self, text: str) -> float:
+        """
+        Calibration factor for a document: exact count / raw estimate of its opening sample when
+        exact counting is on, otherwise the configured factor.
+        """
+        sample = text[:CALIBRATION_SAMPLE_CHARS]
+        exact = self.count_exact(sample) if sample.strip() else None
+        raw = sum(cost for _, _, cost in iter_pieces(sample))
+        if exact is None or raw == 0:
+            return self.calibration
+        return exact / raw
+
+    def iter_chunk_spans(
+        self, text: str, max_tokens: int = 1000, overlap: int = 100
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Lazily split text into chunks of at most max_tokens estimated tokens, as (start, end)
+        character offsets into text. Consecutive chunks share about overlap tokens. Pieces
+        larger than the budget (e.g. a huge base64 run) are cut by characters. Text is only
+        scanned as far as the chunks actually consumed, and no chunk strings are built.
+        Args:
+            text (str): The input text to split.
+            max_tokens (int): Token budget per chunk.
+            overlap (int): Tokens repeated at the start of the next chunk.
+        Yields:
+            Tuple[int, int]: Offsets of each chunk, trimmed of surrounding whitespace;
+            text[start:end] is the chunk.
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        overlap = max(0, min(overlap, max_tokens - 1))
+        window: Deque[Tuple[int, int, float]] = deque()  # Pieces of the chunk being built
+        used = 0.0
+        for piece in self._iter_pieces(text, self.scale_for(text), max_tokens):
+            if window and used + piece[2] > max_tokens:
+                span = self._trim(text, window[0][0], window[-1][1])
+                if span:
+                    yield span
+                # Keep the trailing pieces worth about overlap tokens, always making progress.
+                used -= window.popleft()[2]
+                while window and used > overlap:
+                    used -= window.popleft()[2]
+            window.append(piece)
+            used += piece[2]
+        if window:
+            span = self._trim(text, window[0][0], window[-1][1])
+            if span:
+                yield span
+
+    def chunk(self, text: str, max_tokens: int = 1000, overlap: int = 100) -> List[str]:
+        """
+        Split text into chunks of at most max_tokens estimated tokens; see iter_chunk_spans.
+        Args:
+            text (str): The input text to split.
+            max_tokens (int): Token budget per chunk.
+            overlap (int): Tokens repeated at the start of the next chunk.
+        Returns:
+            List[str]: The chunks, in order.
+        """
+        return [text[start:end] for start, end in self.iter_chunk_spans(text, max_tokens, overlap)]
+
+    @staticmethod
+    def _trim(text: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Offsets of text[start:end] without surrounding whitespace, or None if all whitespace."""
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return (start, end) if start < end else None
+
+    @staticmethod
+    def _iter_pieces(text: str, scale: float, max_tokens: int) -> Iterator[Tuple[int, int, float]]:
+        """Scaled (start, end, tokens) pieces, over-budget pieces cut into budget-sized slices."""
+        for start, end, cost in iter_pieces(text):
+            tokens = cost * scale
+            if tokens <= max_tokens:
+                yield start, end, tokens
+                continue
+            parts = math.ceil(tokens / max_tokens)
+            step = math.ceil((end - start) / parts)
+            for cut in range(start, end, step):
+                stop = min(cut + step, end)
+                yield cut, stop, tokens * (stop - cut) / (end - start)
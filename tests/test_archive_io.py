@@ -0,0 +1,53 @@
+import io
+import os
+import tarfile
+import tempfile
+import zipfile
+import pytest
+from src.services import archive_io
+from src.services.archive_io import (
+    ArchiveError, copy_member, list_members, read_member, split_virtual_path
+)
+from src.services.file_io import copy_file, open_buffer
+from src.handlers.txt_handler import TxtHandler
+
+
+def _make_archives(tmpdir):
+    zip_path = os.path.join(tmpdir, "batch.zip")
+    with zipfile.ZipFile(zip_path, "w") as z:
+        z.writestr(zipfile.ZipInfo("scans/", date_time=(2024, 1, 2, 3, 4, 6)), b"")
+        z.writestr(zipfile.ZipInfo("scans/a.txt", date_time=(2024, 1, 2, 3, 4, 6)), b"alpha member")
+        z.writestr("../escape.txt", b"never listed")
+    tar_path = os.path.join(tmpdir, "batch.tar.gz")
+    with tarfile.open(tar_path, "w:gz") as t:
+        for name, data in (("b.txt", b"bravo member"), ("c.txt", b"charlie member")):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 1700000000
+            t.addfile(info, io.BytesIO(data))
+    return zip_path, tar_path
+
+
+def test_archive_members_are_virtual_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        zip_path, tar_path = _make_archives(tmpdir)
+        assert list_members(zip_path) == ["scans/a.txt"]
+        assert list_members(tar_path) == ["b.txt", "c.txt"]
+        member = os.path.join(zip_path, "scans", "a.txt")
+        assert split_virtual_path(member) == (zip_path, "scans/a.txt")
+        assert split_virtual_path(zip_path) is None
+        assert read_member(member) == b"alpha member"
+        # Handlers read virtual paths directly, and the engine's buffers work on them too.
+        assert TxtHandler().extract_text(os.path.join(tar_path, "c.txt")) == "charlie member"
+        with open_buffer(os.path.join(tar_path, "b.txt")) as buffer:
+            assert buffer.stream().read() == b"bravo member"
+        dest = copy_file(os.path.join(tar_path, "b.txt"), os.path.join(tmpdir, "out.txt"))
+        with open(dest, "rb") as f:
+            assert f.read() == b"bravo member"
+        assert os.path.getmtime(dest) == 1700000000
+        copy_member(member, os.path.join(tmpdir, "a.txt"))
+        # Nothing was unpacked next to the archives.
+        assert os.listdir(tmpdir) and not os.path.exists(os.path.join(tmpdir, "scans"))
+        with pytest.raises(ArchiveError):
+            read_member(os.path.join(zip_path, "missing.txt"))
+        archive_io.close_archives()
@@ -0,0 +1,67 @@
+import os
+import pickle
+import tempfile
+import pytest
+from src.handlers.txt_handler import TxtHandler
+from src.services.extraction_cache import ExtractionCache
+from src.services.extraction_engine import ExtractionEngine
+
+
+def test_cache_roundtrip_and_key_depends_on_version():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ExtractionCache(cache_dir)
+        handler = TxtHandler()
+        key = cache.make_key("abc", handler, {"max_chars": 10})
+        assert cache.get(key) is None
+        cache.put(key, "cached text")
+        assert cache.get(key) == "cached text"
+
+        class NewerTxtHandler(TxtHandler):
+            version = "2"
+
+        assert cache.make_key("abc", NewerTxtHandler(), {"max_chars": 10}) != key
+        assert cache.make_key("abc", handler, {"max_chars": 20}) != key
+
+
+def test_cache_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ExtractionCache(cache_dir, max_bytes=1500)
+        payload = os.urandom(1000).hex()  # incompressible
+        cache.put("aa01", payload)
+        os.utime(os.path.join(cache_dir, "aa", "01"), (1, 1))
+        cache.put("aa02", payload)
+        assert cache.get("aa01") is None
+        assert cache.get("aa02") == payload
+
+
+def test_pickled_cache_keeps_running_size_without_scanning(monkeypatch):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ExtractionCache(cache_dir)
+        cache.put("aa01", "first entry")
+        # The copy a worker process receives: any directory walk on put would fail the test.
+        worker_copy = pickle.loads(pickle.dumps(cache))
+        monkeypatch.setattr(os, "walk", lambda *args, **kwargs: pytest.fail("cache was scanned"))
+        worker_copy.put("aa02", "second entry")
+        worker_copy.put("aa02", "second entry, rewritten")
+        monkeypatch.undo()
+        assert cache._read_size() == worker_copy._read_size() == cache._scan()[1]
+
+
+def test_engine_skips_parsing_on_cache_hit():
+    calls = []
+
+    class CountingTxtHandler(TxtHandler):
+        def extract_text(self, file_path, **kwargs):
+            calls.append(file_path)
+            return super().extract_text(file_path, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "doc.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("cache me")
+        cache = ExtractionCache(os.path.join(tmpdir, "cache"))
+        engine = ExtractionEngine(max_workers=1, cache=cache)
+        first = engine.extract_many([(CountingTxtHandler(), path)])
+        second = engine.extract_many([(CountingTxtHandler(), path)])
+        assert first[0].text == second[0].text == "cache me"
+        assert len(calls) == 1
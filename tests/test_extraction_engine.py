@@ -0,0 +1,158 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import pytest
+from src.handlers.base_handler import source_name
+from src.handlers.txt_handler import TxtHandler
+from src.services.extraction_engine import ExtractionEngine
+
+
+class HangingTxtHandler(TxtHandler):
+    def extract_text(self, file_path, **kwargs):
+        if "hang" in os.path.basename(source_name(file_path)):
+            time.sleep(60)
+        return super().extract_text(file_path, **kwargs)
+
+
+class SlowPageTxtHandler(TxtHandler):
+    def iter_sections(self, file_path, **kwargs):
+        yield "first page"
+        time.sleep(60)
+        yield "second page"
+
+
+def test_extract_many_preserves_order_and_reports_errors():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for i in range(4):
+            path = os.path.join(tmpdir, f"file{i}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"content {i}")
+            paths.append(path)
+        paths.insert(2, os.path.join(tmpdir, "missing.txt"))
+        engine = ExtractionEngine(max_workers=2)
+        results = engine.extract_many([(TxtHandler(), p) for p in paths])
+        assert [r.path for r in results] == paths
+        assert results[0].text == "content 0"
+        assert results[2].error and not results[2].text
+        assert results[4].text == "content 3"
+
+
+def test_extract_many_inline_with_budget():
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("abcdefghij")
+        path = f.name
+    try:
+        results = ExtractionEngine(max_workers=1).extract_many([(TxtHandler(), path)], max_chars=3)
+        assert results[0].text == "abc"
+        assert results[0].error is None
+    finally:
+        os.remove(path)
+
+
+def test_watchdog_times_out_hanging_file_and_continues():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for name in ("a.txt", "hang.txt", "b.txt", "c.txt"):
+            path = os.path.join(tmpdir, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(name)
+            paths.append(path)
+        engine = ExtractionEngine(max_workers=2, timeout=1, max_tasks_per_worker=1)
+        started = time.monotonic()
+        results = engine.extract_many([(HangingTxtHandler(), p) for p in paths])
+        assert time.monotonic() - started < 30
+        assert [r.text for r in results] == ["a.txt", "", "b.txt", "c.txt"]
+        assert "timed out" in results[1].error
+
+
+def test_watchdog_page_timeout():
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        path = f.name
+    try:
+        engine = ExtractionEngine(max_workers=1, page_timeout=0.5)
+        result = engine.extract_many([(SlowPageTxtHandler(), path)])[0]
+        assert result.error and "timed out" in result.error
+    finally:
+        os.remove(path)
+
+
+def test_watchdog_replaces_worker_that_died_while_idle(monkeypatch):
+    from src.services import extraction_engine
+    spawned = []
+
+    class DyingWorker(extraction_engine._WatchdogWorker):
+        def __init__(self, *args):
+            super().__init__(*args)
+            spawned.append(self)
+            if len(spawned) == 1:
+                # The first worker dies before it is handed any file.
+                self.process.kill()
+                self.process.join()
+
+    monkeypatch.setattr(extraction_engine, "_WatchdogWorker", DyingWorker)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for name in ("a.txt", "b.txt", "c.txt"):
+            path = os.path.join(tmpdir, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(name)
+            paths.append(path)
+        engine = ExtractionEngine(max_workers=1, timeout=30)
+        results = engine.extract_many([(TxtHandler(), p) for p in paths])
+        assert [r.text for r in results] == ["a.txt", "b.txt", "c.txt"]
+        assert len(spawned) == 2
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="the slowed start-up is patched in the parent and only inherited by forked workers",
+)
+def test_watchdog_timeout_excludes_worker_start_up(monkeypatch):
+    from src.services import extraction_engine
+    init_worker = extraction_engine._init_worker
+
+    def slow_init_worker():
+        time.sleep(1.5)  # Interpreter start-up and parser imports on a cold worker.
+        init_worker()
+
+    monkeypatch.setattr(extraction_engine, "_init_worker", slow_init_worker)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for name in ("a.txt", "b.txt"):
+            path = os.path.join(tmpdir, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(name)
+            paths.append(path)
+        # Every file lands on a freshly started worker, which takes longer than the timeout.
+        engine = ExtractionEngine(max_workers=1, timeout=1, max_tasks_per_worker=1)
+        results = engine.extract_many([(TxtHandler(), p) for p in paths])
+        assert [(r.text, r.error) for r in results] == [("a.txt", None), ("b.txt", None)]
+
+
+def test_pdf_is_parsed_once_between_triage_and_extraction(monkeypatch):
+    fpdf = pytest.importorskip("fpdf")
+    import pypdf
+    from src.handlers.pdf_handler import PdfHandler
+
+    readers = []
+
+    class CountingReader(pypdf.PdfReader):
+        def __init__(self, *args, **kwargs):
+            readers.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(pypdf, "PdfReader", CountingReader)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "paper.pdf")
+        pdf = fpdf.FPDF()
+        pdf.set_font("Arial", size=12)
+        for i in range(2):
+            pdf.add_page()
+            pdf.cell(200, 10, f"Page {i} carries a real text layer.", ln=True)
+        pdf.output(path)
+        result = ExtractionEngine(max_workers=1).extract_many([(PdfHandler(), path)])[0]
+    assert result.error is None and result.route == "full"
+    assert "Page 0 carries" in result.text and "Page 1 carries" in result.text
+    assert len(readers) == 1
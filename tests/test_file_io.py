@@ -0,0 +1,46 @@
+import hashlib
+import os
+import tempfile
+from src.handlers.txt_handler import TxtHandler
+from src.services.file_io import FileBuffer, copy_file
+
+
+def test_file_buffer_shares_one_read():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "doc.txt")
+        content = b"single read buffer " * 100
+        with open(path, "wb") as f:
+            f.write(content)
+        with FileBuffer(path) as buffer:
+            assert buffer.digest() == hashlib.sha256(content).hexdigest()
+            first, second = buffer.stream(), buffer.stream()
+            assert first.read(6) == b"single"
+            assert second.read(6) == b"single"
+            assert TxtHandler().extract_text(buffer.stream()) == content.decode().strip()
+            dest = os.path.join(tmpdir, "copy.txt")
+            buffer.copy_to(dest)
+        with open(dest, "rb") as f:
+            assert f.read() == content
+
+
+def test_file_buffer_empty_file():
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        path = f.name
+    try:
+        with FileBuffer(path) as buffer:
+            assert buffer.size == 0
+            assert buffer.stream().read() == b""
+    finally:
+        os.remove(path)
+
+
+def test_copy_file_preserves_content_and_mtime():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = os.path.join(tmpdir, "src.bin")
+        with open(src, "wb") as f:
+            f.write(os.urandom(100000))
+        os.utime(src, (1000000, 1000000))
+        dest = copy_file(src, os.path.join(tmpdir, "dest.bin"))
+        with open(src, "rb") as a, open(dest, "rb") as b:
+            assert a.read() == b.read()
+        assert os.path.getmtime(dest) == 1000000
@@ -63,3 +63,519 @@ def test_docx_handler():
         assert "Hello DOCX World!" in text
     finally:
         os.remove(path)
+
+def test_pdf_handler_budget():
+    handler = PdfHandler()
+    try:
+        from fpdf import FPDF
+    except ImportError:
+        pytest.skip("fpdf not installed")
+    with tempfile.NamedTemporaryFile('wb', suffix='.pdf', delete=False) as f:
+        pdf = FPDF()
+        pdf.set_font("Arial", size=12)
+        for i in range(3):
+            pdf.add_page()
+            pdf.cell(200, 10, f"Page number {i + 1}", ln=True)
+        pdf.output(f.name)
+        path = f.name
+    try:
+        text = handler.extract_text(path, max_pages=1)
+        assert "Page number 1" in text
+        assert "Page number 2" not in text
+        text = handler.extract_text(path, max_chars=5)
+        assert text == "Page "
+    finally:
+        os.remove(path)
+
+def test_txt_handler_iter_sections():
+    handler = TxtHandler()
+    with tempfile.NamedTemporaryFile('w+', suffix='.txt', delete=False) as f:
+        f.write("abcdefghij")
+        path = f.name
+    try:
+        assert list(handler.iter_sections(path, block_size=4)) == ["abcd", "efgh", "ij"]
+    finally:
+        os.remove(path)
+
+def test_extract_text_stops_consuming_sections():
+    consumed = []
+
+    class CountingHandler(TxtHandler):
+        section_separator = "\n"
+
+        def iter_sections(self, file_path, **kwargs):
+            for i in range(100):
+                consumed.append(i)
+                yield f"section {i}"
+
+    text = CountingHandler().extract_text("unused", max_chars=20)
+    assert text == "section 0\nsection 1"
+    assert len(consumed) == 2
+
+def test_pdf_handler_read_metadata():
+    handler = PdfHandler()
+    try:
+        from fpdf import FPDF
+    except ImportError:
+        pytest.skip("fpdf not installed")
+    with tempfile.NamedTemporaryFile('wb', suffix='.pdf', delete=False) as f:
+        pdf = FPDF()
+        pdf.set_title("Coastal Erosion Survey")
+        pdf.set_author("Ada Lovelace")
+        pdf.add_page()
+        pdf.output(f.name)
+        path = f.name
+    try:
+        metadata = handler.read_metadata(path)
+        assert metadata["title"] == "Coastal Erosion Survey"
+        assert metadata["author"] == "Ada Lovelace"
+    finally:
+        os.remove(path)
+
+def test_docx_handler_read_metadata():
+    handler = DocxHandler()
+    try:
+        from docx import Document
+    except ImportError:
+        pytest.skip("python-docx not installed")
+    with tempfile.NamedTemporaryFile('wb', suffix='.docx', delete=False) as f:
+        path = f.name
+    try:
+        doc = Document()
+        doc.core_properties.title = "Master Services Agreement"
+        doc.core_properties.author = "Grace Hopper"
+        doc.add_paragraph("Body text")
+        doc.save(path)
+        metadata = handler.read_metadata(path)
+        assert metadata["title"] == "Master Services Agreement"
+        assert metadata["author"] == "Grace Hopper"
+        assert "created" in metadata
+    finally:
+        os.remove(path)
+
+def _write_pdf(path, pages):
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.set_font("Arial", size=12)
+    for text in pages:
+        pdf.add_page()
+        if text:
+            pdf.cell(200, 10, text, ln=True)
+    pdf.output(path)
+
+def test_pdf_handler_triage_routes():
+    try:
+        import fpdf  # noqa: F401
+    except ImportError:
+        pytest.skip("fpdf not installed")
+
+    class SmallLimitPdfHandler(PdfHandler):
+        LARGE_DOCUMENT_PAGES = 2
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        text_pdf = os.path.join(tmpdir, "text.pdf")
+        _write_pdf(text_pdf, ["A page with a real text layer on it."] * 3)
+        blank_pdf = os.path.join(tmpdir, "blank.pdf")
+        _write_pdf(blank_pdf, ["", ""])
+        empty_pdf = os.path.join(tmpdir, "empty.pdf")
+        open(empty_pdf, "wb").close()
+
+        assert PdfHandler().triage(text_pdf).route == "full"
+        report = SmallLimitPdfHandler().triage(text_pdf)
+        assert report.route == "fast" and report.max_pages == PdfHandler.FAST_PATH_PAGES
+        report = PdfHandler().triage(blank_pdf)
+        assert report.route == "ocr" and not report.has_text and report.page_count == 2
+        assert PdfHandler().triage(empty_pdf).route == "skip"
+
+def test_pdf_handler_accepts_stream():
+    try:
+        import fpdf  # noqa: F401
+    except ImportError:
+        pytest.skip("fpdf not installed")
+    import io
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "doc.pdf")
+        _write_pdf(path, ["Streamed PDF text"])
+        with open(path, "rb") as f:
+            stream = io.BytesIO(f.read())
+        assert "Streamed PDF text" in PdfHandler().extract_text(stream)
+        assert PdfHandler().triage(stream).route == "ocr"  # below MIN_TEXT_CHARS
+
+def test_docx_stream_backend_extracts_tables_and_headers():
+    try:
+        from docx import Document
+    except ImportError:
+        pytest.skip("python-docx not installed")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "contract.docx")
+        doc = Document()
+        doc.sections[0].header.paragraphs[0].text = "CONFIDENTIAL HEADER"
+        doc.add_paragraph("Clause one")
+        table = doc.add_table(rows=1, cols=2)
+        table.rows[0].cells[0].text = "Fee"
+        table.rows[0].cells[1].text = "100"
+        doc.add_paragraph("Clause two")
+        doc.save(path)
+        sections = list(DocxHandler(backend="stream").iter_sections(path))
+        assert sections == ["Clause one", "Fee | 100", "Clause two"]
+        with_headers = list(DocxHandler(backend="stream", include_headers=True).iter_sections(path))
+        assert with_headers[0] == "CONFIDENTIAL HEADER"
+        assert DocxHandler(backend="stream").extract_text(path, max_chars=6) == "Clause"
+        python_docx_text = DocxHandler(backend="python-docx").extract_text(path)
+        assert python_docx_text == "Clause one\nClause two"
+
+def test_wordml_blocks_are_detached_once_handled(monkeypatch):
+    import io
+    import xml.etree.ElementTree as ET
+    from src.handlers.docx_handler import iter_wordml_blocks
+    w = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    paragraphs = "".join(f"<w:p><w:r><w:t>para {i}</w:t></w:r></w:p>" for i in range(3))
+    cells = [f"<w:tc><w:p><w:r><w:t>cell {i}</w:t></w:r></w:p></w:tc>" for i in range(3)]
+    rows = "".join(f"<w:tr>{cell}</w:tr>" for cell in cells)
+    xml = (
+        f'<w:document xmlns:w="{w}"><w:body>{paragraphs}<w:tbl>{rows}</w:tbl>'
+        "<w:sectPr/></w:body></w:document>"
+    )
+    parsers = []
+    real_iterparse = ET.iterparse
+
+    def recording_iterparse(*args, **kwargs):
+        parsers.append(real_iterparse(*args, **kwargs))
+        return parsers[-1]
+
+    monkeypatch.setattr(ET, "iterparse", recording_iterparse)
+    blocks = list(iter_wordml_blocks(io.BytesIO(xml.encode("utf-8"))))
+    assert blocks == ["para 0", "para 1", "para 2", "cell 0", "cell 1", "cell 2"]
+    body = parsers[0].root[0]
+    assert [child.tag.rsplit("}", 1)[-1] for child in body] == ["sectPr"]
+
+def test_txt_handler_detects_encodings():
+    handler = TxtHandler()
+    samples = {
+        "utf16_bom": "Résumé of the quarterly report".encode("utf-16"),
+        "utf16le_no_bom": "Plain report text without a BOM".encode("utf-16-le"),
+        "utf8_bom": "﻿Naïve café notes".encode("utf-8"),
+        "cp1252": "Smart quotes “inside”".encode("cp1252"),
+        "latin1": "Caf\xe9 \x81 menu".encode("latin-1"),
+    }
+    expected = {
+        "utf16_bom": "Résumé of the quarterly report",
+        "utf16le_no_bom": "Plain report text without a BOM",
+        "utf8_bom": "Naïve café notes",
+        "cp1252": "Smart quotes “inside”",
+        "latin1": "Caf\xe9 \x81 menu",
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, data in samples.items():
+            path = os.path.join(tmpdir, name + ".txt")
+            with open(path, "wb") as f:
+                f.write(data)
+            assert handler.extract_text(path, block_size=7) == expected[name], name
+
+def test_txt_handler_bounded_head_and_samples():
+    handler = TxtHandler()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "big.log")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(20000):
+                f.write(f"line {i:05d} of the log\n")
+        sections = list(handler.iter_sections(path, block_size=200, sample_blocks=2))
+        assert sections[0].startswith("line 00000")
+        assert len(sections) == 3
+        assert all(s.startswith("\n[...]\nline ") for s in sections[1:])
+        assert "line 10000" not in sections[0]
+        assert handler.extract_text(path, max_chars=10) == "line 00000"
+
+def _write_package(path, parts):
+    import zipfile
+    with zipfile.ZipFile(path, "w") as z:
+        for name, data in parts.items():
+            method = zipfile.ZIP_STORED if name == "mimetype" else zipfile.ZIP_DEFLATED
+            z.writestr(name, data, compress_type=method)
+    return path
+
+R_NS = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+P_NS = (
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    f'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" {R_NS}'
+)
+REL_NS = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+
+def _relationships(targets):
+    rels = "".join(f'<Relationship Id="{rel_id}" Target="{target}"/>' for rel_id, target in targets)
+    return f"<Relationships {REL_NS}>{rels}</Relationships>"
+
+def _slide(title, body):
+    shape = (
+        '<p:sp><p:nvSpPr><p:nvPr>{ph}</p:nvPr></p:nvSpPr>'
+        '<p:txBody><a:p><a:r><a:t>{text}</a:t></a:r></a:p></p:txBody></p:sp>'
+    )
+    return (f'<p:sld {P_NS}><p:cSld><p:spTree>'
+            + shape.format(ph='<p:ph type="title"/>', text=title)
+            + shape.format(ph='<p:ph idx="1"/>', text=body)
+            + '</p:spTree></p:cSld></p:sld>')
+
+def test_pptx_handler_yields_titles_first_in_presentation_order():
+    from src.handlers.pptx_handler import PptxHandler
+    slide_ids = '<p:sldId id="256" r:id="rId3"/><p:sldId id="257" r:id="rId2"/>'
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Slide 2 is shown first, so order must come from the presentation, not the part names.
+        path = _write_package(os.path.join(tmpdir, "deck.pptx"), {
+            "[Content_Types].xml": "<Types/>",
+            "ppt/presentation.xml": (
+                f"<p:presentation {P_NS}><p:sldIdLst>{slide_ids}</p:sldIdLst></p:presentation>"
+            ),
+            "ppt/_rels/presentation.xml.rels": _relationships(
+                [("rId2", "slides/slide1.xml"), ("rId3", "slides/slide2.xml")]
+            ),
+            "ppt/slides/slide1.xml": _slide("Results", "Revenue grew"),
+            "ppt/slides/slide2.xml": _slide("Q3 Review", "Agenda"),
+        })
+        handler = PptxHandler()
+        sections = list(handler.iter_sections(path))
+        assert sections == ["Q3 Review\nResults", "Agenda", "Revenue grew"]
+        assert handler.extract_text(path, max_chars=9) == "Q3 Review"
+
+def test_xlsx_handler_reads_header_and_samples_with_shared_strings():
+    from src.handlers.xlsx_handler import XlsxHandler
+    s_ns = f'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" {R_NS}'
+    rows = ['<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c></row>']
+    rows += [
+        f'<row r="{n}"><c r="A{n}" t="inlineStr"><is><t>Item {n}</t></is></c>'
+        f'<c r="B{n}"><v>{n * 10}</v></c></row>'
+        for n in range(2, 102)
+    ]
+    sheets = (
+        '<sheet name="Budget" sheetId="1" r:id="rId1"/>'
+        '<sheet name="Notes" sheetId="2" r:id="rId2"/>'
+    )
+    strings = (
+        "<si><t>Item</t></si><si><r><t>Cost</t></r><r><t> (GBP)</t></r></si><si><t>unused</t></si>"
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _write_package(os.path.join(tmpdir, "book.xlsx"), {
+            "[Content_Types].xml": "<Types/>",
+            "xl/workbook.xml": f"<workbook {s_ns}><sheets>{sheets}</sheets></workbook>",
+            "xl/_rels/workbook.xml.rels": _relationships([
+                ("rId1", "worksheets/sheet1.xml"),
+                ("rId2", "worksheets/sheet2.xml"),
+                ("rId3", "sharedStrings.xml"),
+            ]),
+            "xl/worksheets/sheet1.xml": (
+                f'<worksheet {s_ns}><dimension ref="A1:B101"/>'
+                f'<sheetData>{"".join(rows)}</sheetData></worksheet>'
+            ),
+            "xl/worksheets/sheet2.xml": f'<worksheet {s_ns}><sheetData/></worksheet>',
+            "xl/sharedStrings.xml": f"<sst {s_ns}>{strings}</sst>",
+        })
+        sections = list(XlsxHandler().iter_sections(path, header_rows=2, sample_rows=4))
+        assert sections[:3] == ["Sheets: Budget, Notes", "Item | Cost (GBP)", "Item 2 | 20"]
+        # Body rows 3..101 are sampled every 98 // 4 = 24 rows.
+        samples = ["[...]\nItem 3 | 30", "Item 27 | 270", "Item 51 | 510", "Item 75 | 750"]
+        assert sections[3:] == samples
+
+def test_xlsx_rows_are_detached_once_handled(monkeypatch):
+    import io
+    import xml.etree.ElementTree as ET
+    from src.handlers.xlsx_handler import iter_sheet_rows
+    ns = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    rows = "".join(f'<row r="{n}"><c r="A{n}"><v>{n}</v></c></row>' for n in range(1, 4))
+    xml = f'<worksheet xmlns="{ns}"><sheetData>{rows}</sheetData></worksheet>'
+    parsers = []
+    real_iterparse = ET.iterparse
+
+    def recording_iterparse(*args, **kwargs):
+        parsers.append(real_iterparse(*args, **kwargs))
+        return parsers[-1]
+
+    monkeypatch.setattr(ET, "iterparse", recording_iterparse)
+    rows = list(iter_sheet_rows(io.BytesIO(xml.encode("utf-8")), 5))
+    assert rows == [(1, ["1"]), (2, ["2"]), (3, ["3"])]
+    assert len(parsers[0].root[0]) == 0
+
+def test_odt_handler_streams_content_and_reads_meta():
+    from src.handlers.odt_handler import OdtHandler
+    office_ns = 'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"'
+    ns = (f'{office_ns} xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+          'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"')
+    meta_ns = (f'{office_ns} xmlns:dc="http://purl.org/dc/elements/1.1/" '
+               'xmlns:meta="urn:oasis:names:tc:opendocument:xmlns:meta:1.0"')
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _write_package(os.path.join(tmpdir, "minutes.odt"), {
+            "mimetype": "application/vnd.oasis.opendocument.text",
+            "content.xml": (f'<office:document-content {ns}><office:body><office:text>'
+                            '<text:h>Board Minutes</text:h><text:p>Present:<text:s text:c="2"/>All'
+                            '<text:note><text:p>footnote</text:p></text:note></text:p>'
+                            '<table:table><table:table-row>'
+                            '<table:table-cell><text:p>Vote</text:p></table:table-cell>'
+                            '<table:table-cell><text:p>Passed</text:p></table:table-cell>'
+                            '</table:table-row></table:table>'
+                            '</office:text></office:body></office:document-content>'),
+            "meta.xml": (f'<office:document-meta {meta_ns}><office:meta>'
+                         '<dc:title>Board Minutes</dc:title>'
+                         '<meta:initial-creator>Ana Silva</meta:initial-creator>'
+                         '</office:meta></office:document-meta>'),
+        })
+        handler = OdtHandler()
+        sections = list(handler.iter_sections(path))
+        assert sections == ["Board Minutes", "Present:  All", "Vote | Passed"]
+        assert handler.read_metadata(path) == {"title": "Board Minutes", "author": "Ana Silva"}
+        from src.handlers.registry import HandlerRegistry
+        assert HandlerRegistry(load_entry_points=False).resolve(path) is OdtHandler
+
+def test_html_handler_strips_markup_and_boilerplate():
+    from src.handlers.html_handler import HtmlHandler
+    page = """<!DOCTYPE html><html><head><title>Annual Report 2023</title>
+    <meta name="author" content="Jane Roe"><style>body { color: red }</style>
+    <script>var tracking = 1;</script></head>
+    <body><nav><a href="/">Home</a> | <a href="/about">About</a></nav>
+    <div class="cookie-banner">We use cookies</div>
+    <main><h1>Annual&nbsp;Report</h1><p>Revenue   grew <b>12%</b>.</p>
+    <table><tr><th>Year</th><th>Revenue</th></tr></table><br></main>
+    <footer>Copyright</footer></body></html>"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "report.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page)
+        handler = HtmlHandler()
+        sections = list(handler.iter_sections(path))
+        assert sections == [
+            "Annual Report 2023", "Annual Report", "Revenue grew 12%.", "Year | Revenue"
+        ]
+        assert handler.read_metadata(path) == {"author": "Jane Roe", "title": "Annual Report 2023"}
+
+def test_html_boilerplate_hints_keep_main_text():
+    from src.handlers.html_handler import iter_html_blocks
+    body = ('<body class="page has-sidebar">'
+            '<main><h1>Real Title</h1><p>Body text here.</p></main></body>')
+    assert list(iter_html_blocks([body])) == ["Real Title", "Body text here."]
+    report = '<div class="share-price-report"><p>Q3 share price analysis</p></div>'
+    assert list(iter_html_blocks([report])) == ["Q3 share price analysis"]
+    # <li> end tags are optional: a hinted item must not swallow the rest of the page.
+    menu = '<ul><li class="menu-item">Home<li class="menu">About</ul><p>Main content</p>'
+    assert list(iter_html_blocks([menu])) == ["Home", "About", "Main content"]
+    sidebar = '<div class="sidebar"><p>Links</p></div><p>Kept</p>'
+    assert list(iter_html_blocks([sidebar])) == ["Kept"]
+
+def test_markdown_handler_strips_markup():
+    from src.handlers.markdown_handler import MarkdownHandler
+    note = ("---\ntitle: \"Design Notes\"\nauthor: Li Wei\n---\n# Cache *design*\n\n"
+            "We use a [content hash](http://x.y)\nas the `key`.\n\n```python\nprint('code')\n```\n"
+            "- **Fast** path\n| A | B |\n|---|---|\n| 1 | 2 |\n[ref]: http://example.com\n")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "notes.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(note)
+        handler = MarkdownHandler()
+        sections = list(handler.iter_sections(path))
+        assert sections == [
+            "Cache design", "We use a content hash as the key.", "Fast path", "A | B", "1 | 2"
+        ]
+        assert "print('code')" in MarkdownHandler(include_code=True).extract_text(path)
+        assert handler.read_metadata(path) == {"title": "Design Notes", "author": "Li Wei"}
+
+def test_epub_handler_follows_spine_order():
+    from src.handlers.epub_handler import EpubHandler
+    opf = ('<package xmlns="http://www.idpf.org/2007/opf" '
+           'xmlns:dc="http://purl.org/dc/elements/1.1/" version="3.0">'
+           '<metadata><dc:title>Field Guide</dc:title><dc:creator>Sam Hill</dc:creator></metadata>'
+           '<manifest>'
+           '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>'
+           '<item id="c1" href="text/ch1.xhtml" media-type="application/xhtml+xml"/>'
+           '<item id="c2" href="text/ch2.xhtml" media-type="application/xhtml+xml"/></manifest>'
+           '<spine><itemref idref="nav"/><itemref idref="c2"/><itemref idref="c1"/></spine>'
+           '</package>')
+    chapter = (
+        '<html xmlns="http://www.w3.org/1999/xhtml"><body><h1>{0}</h1><p>{0} text</p></body></html>'
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _write_package(os.path.join(tmpdir, "book.epub"), {
+            "mimetype": "application/epub+zip",
+            "META-INF/container.xml": (
+                '<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container" version="1.0">'
+                '<rootfiles><rootfile full-path="OEBPS/content.opf" '
+                'media-type="application/oebps-package+xml"/></rootfiles></container>'
+            ),
+            "OEBPS/content.opf": opf,
+            "OEBPS/nav.xhtml": chapter.format("Contents"),
+            "OEBPS/text/ch1.xhtml": chapter.format("Second"),
+            "OEBPS/text/ch2.xhtml": chapter.format("First"),
+        })
+        handler = EpubHandler()
+        assert list(handler.iter_sections(path)) == ["First", "First text", "Second", "Second text"]
+        assert handler.read_metadata(path) == {"title": "Field Guide", "author": "Sam Hill"}
+        from src.handlers.registry import HandlerRegistry
+        assert HandlerRegistry(load_entry_points=False).resolve(path) is EpubHandler
+
+def _build_email(subject, body, attachments=()):
+    from email.message import EmailMessage
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = "Maria Lopez <maria@example.com>"
+    message["To"] = "team@example.com"
+    message["Date"] = "Tue, 05 Mar 2024 10:00:00 +0000"
+    message.set_content(body)
+    for filename, data, maintype, subtype in attachments:
+        message.add_attachment(data, maintype=maintype, subtype=subtype, filename=filename)
+    return message
+
+def test_email_handler_reads_headers_body_and_attachments_in_memory():
+    from src.handlers.email_handler import EmailHandler
+    attachment_text = "Attached minutes of the board meeting."
+    attachments = [
+        ("minutes.txt", attachment_text.encode(), "application", "octet-stream"),
+        ("image.bin", bytes(range(256)), "application", "octet-stream"),
+    ]
+    message = _build_email("Re: Fwd: Board meeting minutes", "Please see attached.", attachments)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "message.eml")
+        with open(path, "wb") as f:
+            f.write(message.as_bytes())
+        handler = EmailHandler()
+        sections = list(handler.iter_sections(path))
+        assert sections[0].startswith("Subject: Re: Fwd: Board meeting minutes\nFrom: Maria Lopez")
+        assert sections[1:] == [
+            "Please see attached.", "[Attachment: minutes.txt]", attachment_text
+        ]
+        assert handler.read_metadata(path) == {
+            "title": "Board meeting minutes",
+            "author": "Maria Lopez",
+            "created": "2024-03-05T10:00:00+00:00",
+        }
+        assert os.listdir(tmpdir) == ["message.eml"]  # no temporary files
+
+def test_email_handler_streams_mbox_messages():
+    from src.handlers.email_handler import EmailHandler
+    from src.handlers.registry import HandlerRegistry
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "export.dat")
+        with open(path, "wb") as f:
+            for n in range(3):
+                f.write(b"From maria@example.com Tue Mar  5 10:00:00 2024\n")
+                message = _build_email(f"Status update {n}", f"Body {n}\n>From the desk of Maria")
+                f.write(message.as_bytes().replace(b"\n>From", b"\n>>From"))
+                f.write(b"\n")
+        assert HandlerRegistry(load_entry_points=False).resolve(path) is EmailHandler
+        sections = list(EmailHandler().iter_sections(path))
+        bodies = [s for s in sections if s.startswith("Body")]
+        assert bodies == [f"Body {n}\n>From the desk of Maria" for n in range(3)]
+        assert EmailHandler().extract_text(path, max_chars=10) == "Subject: S"
+        assert EmailHandler().read_metadata(path) == {}
+
+def test_preprocess_removes_running_headers_and_rejoins_hyphens():
+    topics = ["anodes", "cathodes", "separators", "electrolytes"]
+    pages = [
+        f"Journal of Batteries, Vol. 12\nThis page covers {topic}.\n"
+        f"It discusses inter-\nnational   standards for {topic}.\n\n\n\n"
+        f"Results for {topic} follow.\n© 2021 Publisher\n{n}"
+        for n, topic in enumerate(topics, 1)
+    ]
+    cleaned = TxtHandler().preprocess("\f".join(pages))
+    assert "Journal of Batteries" not in cleaned
+    assert "Publisher" not in cleaned
+    assert "It discusses international standards for separators." in cleaned
+    assert cleaned.startswith("This page covers anodes.")
+    assert "\n\n\n" not in cleaned
+    # A single page keeps its lines; only hyphenation and whitespace are normalized.
+    single = TxtHandler().preprocess("Title\nSome  hyphen-\nated words")
+    assert single == "Title\nSome hyphenated words"
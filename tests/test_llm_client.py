@@ -7,7 +7,8 @@ from src.services.llm_client import LLMClient
 @pytest.fixture
 def llm_client():
     api_key = os.getenv("GEMINI_API_KEY", "test-key")
-    return LLMClient(api_key=api_key)
+    # These tests exercise the local estimator, so they must not reach the count_tokens API.
+    return LLMClient(api_key=api_key, exact_token_counts=False)
 
 
 def test_render_named_prompt(llm_client):
@@ -20,3 +21,83 @@ def test_chunk_text(llm_client):
     text = "word " * 1050
     chunks = llm_client.chunk_text(text, max_tokens=1000, overlap=100)
     assert len(chunks) == 2
+
+def test_chunk_text_splits_on_token_budget(llm_client):
+    # One whitespace-free "word" of CJK text is many tokens, not one.
+    cjk = "文書" * 1500
+    chunks = llm_client.chunk_text(cjk, max_tokens=1000, overlap=100)
+    assert len(chunks) == 4
+    assert all(llm_client.count_tokens(chunk) <= 1000 for chunk in chunks)
+    blob = "aGVsbG8gV29ybGQ" * 400
+    chunks = llm_client.chunk_text(blob, max_tokens=500)
+    assert all(llm_client.count_tokens(chunk) <= 500 for chunk in chunks)
+
+def test_exact_token_counts_are_cached(llm_client):
+    from src.services.token_estimator import TokenEstimator
+    client = MagicMock()
+    client.models.count_tokens.return_value.total_tokens = 42
+    estimator = TokenEstimator(client, "models/test", exact=True)
+    assert estimator.count("some text") == 42
+    assert estimator.count("some text") == 42
+    client.models.count_tokens.assert_called_once()
+    # The exact count recalibrates the local estimate for chunking.
+    assert estimator.scale_for("some text") == 42 / 2
+
+def test_exact_counting_is_default_and_stops_after_a_failure():
+    from src.services.token_estimator import TokenEstimator
+    client = LLMClient(api_key="test-key", exa_api_key="test-key")
+    assert client.token_estimator.exact
+    api = MagicMock()
+    api.models.count_tokens.side_effect = ConnectionError("offline")
+    estimator = TokenEstimator(api, "models/test", exact=True)
+    assert estimator.count("some text") == estimator.estimate("some text")
+    assert estimator.count("other text") == estimator.estimate("other text")
+    api.models.count_tokens.assert_called_once()
+
+def test_estimate_matches_published_gemini_ratios():
+    # Google documents Gemini tokens as about 4 characters, with 100 tokens to 60-80 English words.
+    # The estimator's constants are set against that guidance, so English prose must stay inside it.
+    from src.services.token_estimator import TokenEstimator
+    paragraphs = [
+        "This Master Services Agreement is entered into by and between the Client and the "
+        "Provider. The Provider shall deliver the services described in each Statement of Work, "
+        "and the Client shall pay the fees set out there within thirty days of receiving a "
+        "correct invoice.",
+        "We study how retrieval quality changes when documents are split into overlapping chunks. "
+        "Our experiments on three public benchmarks show that moderate overlap improves recall, "
+        "while very small chunks lose the context needed to answer multi-step questions.",
+        "Invoice number 2024-0117 covers consulting work performed in March. Please transfer "
+        "the total amount, including value added tax, to the account listed below and quote the "
+        "invoice number as the payment reference.",
+    ]
+    estimator = TokenEstimator()
+    for text in paragraphs:
+        tokens = estimator.estimate(text)
+        assert 3 <= len(text) / tokens <= 5
+        assert 125 <= 100 * tokens / len(text.split()) <= 167
+
+def test_iter_chunk_spans_is_lazy(llm_client):
+    text = "word " * 1050
+    spans = llm_client.iter_chunk_spans(text, max_tokens=1000, overlap=100)
+    assert next(spans) == (0, 4999)
+    assert next(spans) == (4500, 5249)  # 100 words of overlap
+    assert next(spans, None) is None
+    assert llm_client.chunk_text(text) == [text[0:4999], text[4500:5249]]
+
+def test_agenerate_many_keeps_order_and_bounds_concurrency(llm_client):
+    import asyncio
+    from unittest.mock import AsyncMock
+    state = {"active": 0, "peak": 0}
+
+    async def generate(model, contents, **kwargs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01 * (5 - int(contents)))  # Later prompts finish first
+        state["active"] -= 1
+        return type('resp', (), {"text": f"out {contents}"})()
+
+    llm_client.client = MagicMock()
+    llm_client.client.aio.models.generate_content = AsyncMock(side_effect=generate)
+    results = llm_client.generate_many([str(i) for i in range(5)], concurrency=2)
+    assert results == [f"out {i}" for i in range(5)]
+    assert state["peak"] == 2
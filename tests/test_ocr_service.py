@@ -0,0 +1,107 @@
+import os
+import subprocess
+import tempfile
+import zipfile
+import pytest
+from src.agent_core.research_workflow import ResearchWorkflow
+from src.handlers.base_handler import ROUTE_OCR, TriageReport
+from src.handlers.pdf_handler import PdfHandler
+from src.services import archive_io
+from src.services.extraction_cache import ExtractionCache
+from src.services.ocr_service import OcrPool
+
+
+class FakeOcrPool(OcrPool):
+    """OcrPool that records page requests instead of running tesseract."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.pages = []
+
+    def ocr_page(self, data, page_number, name="PDF"):
+        self.pages.append(page_number)
+        return f"Scanned page {page_number} about lithium batteries"
+
+
+class ScannedPDFHandler(PdfHandler):
+    def triage(self, file_path):
+        return TriageReport(ROUTE_OCR, "no text layer on sampled pages", page_count=1)
+
+    def extract_text(self, file_path, **kwargs):
+        raise AssertionError("scanned PDFs are not parsed")
+
+
+def test_ocr_pool_caches_pages_by_content():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "scan.pdf")
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4 not really a pdf")
+        copy = os.path.join(tmpdir, "copy.pdf")
+        with open(copy, "wb") as f:
+            f.write(b"%PDF-1.4 not really a pdf")
+        with FakeOcrPool(max_pages=2, cache=ExtractionCache(os.path.join(tmpdir, "cache"))) as pool:
+            text = pool.submit(path).result()
+            assert text == (
+                "Scanned page 1 about lithium batteries\fScanned page 2 about lithium batteries"
+            )
+            assert pool.pages == [1, 2]
+            # Same content under another name: every page comes from the cache.
+            assert pool.ocr_pdf(copy) == text
+            assert pool.pages == [1, 2]
+            assert pool.page_key("abc", 1) != FakeOcrPool(dpi=300).page_key("abc", 1)
+
+
+def test_ocr_page_reports_missing_tools():
+    pool = OcrPool(tesseract_cmd="no-such-tesseract", pdftoppm_cmd="no-such-pdftoppm")
+    assert not pool.available()
+    with pytest.raises(RuntimeError):
+        pool.ocr_page(b"%PDF-1.4", 1, "scan.pdf")
+    pool.shutdown()
+
+
+def test_ocr_pipes_archive_members_without_writing_files(monkeypatch):
+    from src.services import ocr_service
+    calls = []
+
+    def run(cmd, input=None, **kwargs):
+        calls.append((cmd, input))
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"recognized")
+
+    monkeypatch.setattr(ocr_service.subprocess, "run", run)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        zip_path = os.path.join(tmpdir, "batch.zip")
+        with zipfile.ZipFile(zip_path, "w") as z:
+            z.writestr("scan.pdf", b"%PDF-1.4 scanned member")
+        with OcrPool(max_pages=1) as pool:
+            assert pool.ocr_pdf(os.path.join(zip_path, "scan.pdf")) == "recognized"
+        archive_io.close_archives()
+    (render_cmd, render_input), (_, ocr_input) = calls
+    assert render_cmd[-1] == "-" and render_input == b"%PDF-1.4 scanned member"
+    assert ocr_input == b"recognized"
+
+
+def test_filter_pdfs_scores_ocr_text(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # filter_pdfs writes reason_for_paper_selection.md
+    prompts = []
+
+    class RecordingLLM:
+        def generate_content(self, prompt, **kwargs):
+            prompts.append(prompt)
+            return "0.8"
+
+    with tempfile.NamedTemporaryFile("wb", suffix=".pdf", delete=False) as f:
+        f.write(b"%PDF-1.4 scanned")
+        path = f.name
+    try:
+        with FakeOcrPool(max_pages=1) as pool:
+            workflow = ResearchWorkflow(
+                llm_client=RecordingLLM(), pdf_handler=ScannedPDFHandler(), ocr=pool
+            )
+            assert workflow.filter_pdfs([path], verbose=False) == [path]
+        assert "Scanned page 1 about lithium batteries" in prompts[0]
+        # Without an OCR pool the scanned PDF is skipped, not sent as an empty prompt.
+        workflow = ResearchWorkflow(llm_client=RecordingLLM(), pdf_handler=ScannedPDFHandler())
+        assert workflow.filter_pdfs([path], verbose=False) == []
+        assert len(prompts) == 1
+    finally:
+        os.remove(path)
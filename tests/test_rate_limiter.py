@@ -0,0 +1,98 @@
+import asyncio
+import os
+import tempfile
+from unittest.mock import MagicMock
+import pytest
+from src.services.rate_limiter import RateLimiter, RateQuota
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    def __call__(self):
+        return self.now
+
+def test_requests_queue_behind_the_rpm_quota():
+    clock = FakeClock()
+    limiter = RateLimiter({"m": RateQuota(rpm=600)}, headroom=1.0, clock=clock)
+    # A burst of 60 requests (a tenth of the minute's quota) goes at once, then one every 0.1 s.
+    assert all(limiter.reserve("m", 0) == 0.0 for _ in range(60))
+    assert limiter.reserve("m", 0) == 0.1
+    assert limiter.reserve("m", 0) == 0.2
+    clock.now += 0.2
+    assert abs(limiter.reserve("m", 0) - 0.1) < 1e-9
+    assert limiter.reserve("other", 10 ** 9) == 0.0  # Models without quotas are not limited
+
+def test_token_reservations_are_settled_with_actual_usage():
+    clock = FakeClock()
+    limiter = RateLimiter({"m": RateQuota(tpm=60000)}, headroom=1.0, clock=clock)
+    assert limiter.reserve("m", 6000) == 0.0
+    assert limiter.reserve("m", 1000) == 1.0  # 1000 tokens short at 1000 tokens/s
+    limiter.settle("m", 6000, 2000)
+    assert limiter.reserve("m", 1000) == 0.0
+
+def test_state_file_shares_quota_between_limiters():
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = os.path.join(tmpdir, "quota.json")
+        quotas = {"m": RateQuota(rpm=10)}
+        first = RateLimiter(quotas, state_file=state_file, headroom=1.0, clock=clock)
+        second = RateLimiter(quotas, state_file=state_file, headroom=1.0, clock=clock)
+        assert first.reserve("m", 0) == 0.0
+        assert second.reserve("m", 0) == 6.0
+
+def test_aacquire_books_file_backed_reservations_off_the_event_loop():
+    import threading
+
+    class RecordingLimiter(RateLimiter):
+        def reserve(self, model, tokens):
+            threads.append(threading.get_ident())
+            return super().reserve(model, tokens)
+
+    async def acquire_both(limiters):
+        for limiter in limiters:
+            await limiter.aacquire("m", 0)
+        return threading.get_ident()
+
+    threads = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        in_memory = RecordingLimiter({"m": RateQuota(rpm=600)})
+        state_file = os.path.join(tmpdir, "quota.json")
+        file_backed = RecordingLimiter({"m": RateQuota(rpm=600)}, state_file=state_file)
+        loop_thread = asyncio.run(acquire_both([in_memory, file_backed]))
+    assert threads[0] == loop_thread and threads[1] != loop_thread
+
+def test_llm_client_waits_for_quota(monkeypatch):
+    from src.services import rate_limiter
+    from src.services.llm_client import LLMClient
+    client = LLMClient(
+        api_key="test-key", exa_api_key="test-key", rate_limits={"models/test": RateQuota(rpm=10)}
+    )
+    client.client = MagicMock()
+    client.client.models.generate_content.return_value.text = "ok"
+    client.client.models.generate_content.return_value.usage_metadata.total_token_count = 12
+    sleeps = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", sleeps.append)
+    assert client.generate_content("hello", model="models/test") == "ok"
+    assert client.generate_content("hello", model="models/test") == "ok"
+    assert len(sleeps) == 1 and 6.5 < sleeps[0] <= 60 / 9  # One request per 6 s at 90% of the quota
+    assert asyncio.run(client.rate_limiter.aacquire("models/unlimited", 5)) is None
+
+
+def test_llm_client_settles_streamed_calls():
+    from src.services.llm_client import LLMClient
+    client = LLMClient(
+        api_key="test-key", exa_api_key="test-key",
+        rate_limits={"models/test": RateQuota(tpm=1_000_000)},
+    )
+    client.client = MagicMock()
+    chunks = [MagicMock(text="o"), MagicMock(text="k")]
+    chunks[0].usage_metadata.total_token_count = None
+    chunks[1].usage_metadata.total_token_count = 12
+    client.client.models.generate_content_stream.return_value = iter(chunks)
+    settled = []
+    client.rate_limiter.settle = lambda model, reserved, used: settled.append((model, used))
+    assert "".join(client.generate_content_stream("hello", model="models/test")) == "ok"
+    client.client.models.generate_content_stream.side_effect = ValueError("stream dropped")
+    with pytest.raises(RuntimeError):
+        list(client.generate_content_stream("hello", model="models/test"))
+    assert settled == [("models/test", 12), ("models/test", None)]
@@ -0,0 +1,77 @@
+import os
+import sys
+import tempfile
+import zipfile
+from src.handlers.registry import HandlerRegistry, sniff_type, TEXT_TYPE
+from src.handlers.txt_handler import TxtHandler
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def _write_zip(path, members):
+    with zipfile.ZipFile(path, "w") as z:
+        for name, data in members:
+            method = zipfile.ZIP_STORED if name == "mimetype" else zipfile.ZIP_DEFLATED
+            z.writestr(name, data, compress_type=method)
+    return path
+
+
+def test_sniff_type_by_magic_bytes():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        def sniff(name, data):
+            return sniff_type(_write(os.path.join(tmpdir, name), data))
+
+        def sniff_zip(name, members):
+            return sniff_type(_write_zip(os.path.join(tmpdir, name), members))
+
+        assert sniff("a.bin", b"junk\n%PDF-1.7\n...") == "pdf"
+        assert sniff("b.bin", "plain words\n".encode()) == TEXT_TYPE
+        assert sniff("c.bin", "﻿text".encode("utf-16")) == TEXT_TYPE
+        assert sniff("d.bin", bytes(range(256))) is None
+        assert sniff("e.bin", b"") is None
+        content_types = ("[Content_Types].xml", "<Types/>")
+        assert sniff_zip("f.zip", [content_types, ("word/document.xml", "<w/>")]) == "docx"
+        assert sniff_zip("g.zip", [content_types, ("ppt/presentation.xml", "<p/>")]) == "pptx"
+        epub = [("mimetype", "application/epub+zip"), ("content.opf", "<x/>")]
+        assert sniff_zip("h.zip", epub) == "epub"
+        assert sniff_zip("i.zip", [("notes.txt", "x")]) == "zip"
+
+
+def test_registry_routes_by_content_then_extension():
+    registry = HandlerRegistry(load_entry_points=False)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        def resolve(name, data):
+            return registry.resolve(_write(os.path.join(tmpdir, name), data))
+
+        # Content wins over a wrong extension.
+        assert resolve("paper.txt", b"%PDF-1.4\n").__name__ == "PdfHandler"
+        assert resolve("notes.pdf", b"just text") is TxtHandler
+        # A binary file claiming a signature-bearing type is not sent to that parser.
+        assert resolve("broken.docx", bytes(range(256))) is None
+        # Text-based types registered for an extension keep text files with that extension.
+        class MarkdownHandler(TxtHandler):
+            pass
+        registry.register("md", MarkdownHandler, [".md"], text_based=True)
+        assert resolve("readme.md", b"# Title") is MarkdownHandler
+
+
+def test_registry_imports_handlers_lazily(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "lazy_fake_handler.py"), "w", encoding="utf-8") as f:
+            f.write(
+                "from src.handlers.txt_handler import TxtHandler\n"
+                "class FakeHandler(TxtHandler):\n"
+                "    pass\n"
+            )
+        monkeypatch.syspath_prepend(tmpdir)
+        registry = HandlerRegistry(load_entry_points=False)
+        registry.register("fake", "lazy_fake_handler:FakeHandler", [".fake"])
+        assert ".fake" in registry.extension_map()
+        assert "lazy_fake_handler" not in sys.modules
+        assert registry.get("fake").__name__ == "FakeHandler"
+        assert "lazy_fake_handler" in sys.modules
+        monkeypatch.delitem(sys.modules, "lazy_fake_handler")
@@ -4,12 +4,14 @@ import tempfile
 import pytest
 from unittest.mock import MagicMock
 from src.agent_core import rename_workflow
+from src.handlers.registry import HandlerRegistry
+from src.handlers.txt_handler import TxtHandler
 
 from src.services.llm_client import LLMClient
 
 class DummyLLM(LLMClient):
-    def chunk_text(self, text, max_tokens=1000, overlap=100):
-        return [text]
+    def iter_chunk_spans(self, text, max_tokens=1000, overlap=100):
+        yield 0, len(text)
     def render_named_prompt(self, name, parameters):
         return f"Prompt: {parameters['text']}"
     def generate_content(self, prompt, model=None, max_tokens=None, **kwargs):
@@ -21,13 +23,134 @@ def test_rename_mode(monkeypatch):
         file_path = os.path.join(tmpdir, "test.txt")
         with open(file_path, "w", encoding="utf-8") as f:
             f.write("Test content for rename workflow.")
-        # Patch handler map to only txt
-        monkeypatch.setattr(rename_workflow, "HANDLER_MAP", {".txt": rename_workflow.TxtHandler})
         # Patch TxtHandler to avoid actual file reading
-        monkeypatch.setattr(rename_workflow.TxtHandler, "extract_text", lambda self, fp, **kw: "Dummy text")
+        monkeypatch.setattr(TxtHandler, "extract_text", lambda self, fp, **kw: "Dummy text")
         # Run rename_mode with DummyLLM
-        results = rename_workflow.rename_mode(target_dir=tmpdir, exts=[".txt"], dry_run=True, llm_client=DummyLLM(), verbose=False)
+        results = rename_workflow.rename_mode(
+            target_dir=tmpdir,
+            dest_dir=os.path.join(tmpdir, "out"),
+            exts=[".txt"],
+            dry_run=True,
+            llm_client=DummyLLM(),
+            verbose=False,
+        )
         assert len(results) == 1
         old_path, new_path = results[0]
         assert old_path == file_path
         assert new_path.endswith("Renamed_Document.txt")
+
+def test_name_from_metadata_rejects_junk():
+    assert rename_workflow.name_from_metadata({"title": "Microsoft Word - Document1"}) is None
+    assert rename_workflow.name_from_metadata({"title": "report_final.docx"}) is None
+    assert rename_workflow.name_from_metadata({"title": "Untitled"}) is None
+    name = rename_workflow.name_from_metadata({
+        "title": "Microsoft Word - Annual Water Report",
+        "author": "Smith, Jane",
+        "created": "D:20190401",
+    })
+    assert name == "Annual Water Report Smith 2019"
+
+def test_rename_mode_uses_metadata_without_llm(monkeypatch):
+    class FailingLLM(DummyLLM):
+        def generate_content(self, prompt, model=None, max_tokens=None, **kwargs):
+            raise AssertionError("LLM should not be called")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = os.path.join(tmpdir, "scan001.txt")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("Body")
+        metadata = {"title": "Quarterly Budget Review"}
+        monkeypatch.setattr(TxtHandler, "read_metadata", lambda self, fp, **kw: metadata)
+        results = rename_workflow.rename_mode(
+            target_dir=tmpdir,
+            dest_dir=os.path.join(tmpdir, "out"),
+            exts=[".txt"],
+            dry_run=True,
+            llm_client=FailingLLM(),
+            verbose=False,
+        )
+        assert results[0][1].endswith("Quarterly_Budget_Review.txt")
+
+class HangingTxtHandler(TxtHandler):
+    def extract_text(self, file_path, **kwargs):
+        import time
+        time.sleep(60)
+
+def test_rename_mode_timed_out_file_goes_to_error_folder(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = os.path.join(tmpdir, "stuck.txt")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("never read")
+        dest_dir = os.path.join(tmpdir, "out")
+        registry = HandlerRegistry(load_entry_points=False)
+        registry.register("txt", HangingTxtHandler, text_based=True)
+        monkeypatch.setattr(rename_workflow, "HANDLER_REGISTRY", registry)
+        rename_workflow.rename_mode(
+            target_dir=tmpdir,
+            dest_dir=dest_dir,
+            exts=[".txt"],
+            dry_run=True,
+            llm_client=DummyLLM(),
+            verbose=False,
+            extraction_timeout=1,
+            use_metadata=False,
+        )
+        assert os.path.exists(os.path.join(dest_dir, "Error", "stuck.txt"))
+
+def test_rename_mode_routes_mislabeled_file_by_content(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # A text file with a .pdf extension must not be handed to the PDF parser.
+        with open(os.path.join(tmpdir, "notes.pdf"), "w", encoding="utf-8") as f:
+            f.write("Plain text notes saved with the wrong extension.")
+        monkeypatch.setattr(TxtHandler, "extract_text", lambda self, fp, **kw: "Dummy text")
+        results = rename_workflow.rename_mode(
+            target_dir=tmpdir,
+            dest_dir=os.path.join(tmpdir, "out"),
+            exts=[".pdf"],
+            dry_run=True,
+            llm_client=DummyLLM(),
+            verbose=False,
+            use_metadata=False,
+        )
+        assert results[0][1].endswith("Renamed_Document.pdf")
+
+def test_rename_mode_reads_archive_members_in_place(monkeypatch):
+    import zipfile
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src_dir = os.path.join(tmpdir, "in")
+        os.makedirs(src_dir)
+        with zipfile.ZipFile(os.path.join(src_dir, "batch.zip"), "w") as z:
+            z.writestr("docs/report.txt", "Quarterly numbers for the board.")
+        dest_dir = os.path.join(tmpdir, "out")
+        results = rename_workflow.rename_mode(
+            target_dir=src_dir, dest_dir=dest_dir, exts=[".txt"], dry_run=False,
+            llm_client=DummyLLM(), verbose=False, use_metadata=False
+        )
+        assert results == [(
+            os.path.join(src_dir, "batch.zip", "docs", "report.txt"),
+            os.path.join(dest_dir, "Renamed_Document.txt"),
+        )]
+        with open(os.path.join(dest_dir, "Renamed_Document.txt"), encoding="utf-8") as f:
+            assert f.read() == "Quarterly numbers for the board."
+        assert sorted(os.listdir(src_dir)) == ["batch.zip"]
+
+def test_arename_mode_matches_rename_mode(monkeypatch):
+    import asyncio
+
+    class AsyncLLM(DummyLLM):
+        def generate_content(self, prompt, model=None, max_tokens=None, **kwargs):
+            raise AssertionError("the async API should be used")
+        async def agenerate_content(self, prompt, model=None, **kwargs):
+            return "Renamed_Document"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in ("a.txt", "b.txt"):
+            with open(os.path.join(tmpdir, name), "w", encoding="utf-8") as f:
+                f.write(name[0])
+        monkeypatch.setattr(TxtHandler, "extract_text", lambda self, fp, **kw: "Dummy text")
+        results = asyncio.run(rename_workflow.arename_mode(
+            target_dir=tmpdir, dest_dir=os.path.join(tmpdir, "out"), exts=[".txt"], dry_run=True,
+            llm_client=AsyncLLM(), verbose=False, use_metadata=False, concurrency=2,
+        ))
+        assert sorted(os.path.basename(old) for old, _ in results) == ["a.txt", "b.txt"]
+        assert all(new.endswith("Renamed_Document.txt") for _, new in results)
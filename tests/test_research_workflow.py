@@ -4,8 +4,14 @@ import tempfile
 import pytest
 from unittest.mock import MagicMock
 from src.agent_core.research_workflow import ResearchWorkflow
+from src.handlers.txt_handler import TxtHandler
 
-class DummyPDFHandler:
+@pytest.fixture(autouse=True)
+def run_in_tmp_path(monkeypatch, tmp_path):
+    # filter_pdfs writes reason_for_paper_selection.md into the working directory.
+    monkeypatch.chdir(tmp_path)
+
+class DummyPDFHandler(TxtHandler):
     def extract_text(self, file_path, **kwargs):
         return "Dummy PDF content"
 
@@ -33,3 +39,37 @@ def test_copy_relevant_pdfs():
             f.write("irrelevant")
         copied = workflow.copy_relevant_pdfs(src_dir, dest_dir, score_threshold=0.5, verbose=False)
         assert any(os.path.basename(file_path) in c for c in copied)
+
+def test_filter_pdfs_skips_llm_for_empty_text():
+    class EmptyPDFHandler(TxtHandler):
+        def extract_text(self, file_path, **kwargs):
+            return ""
+
+    class FailingLLM:
+        def generate_content(self, prompt, **kwargs):
+            raise AssertionError("LLM should not be called for empty text")
+
+    workflow = ResearchWorkflow(llm_client=FailingLLM(), pdf_handler=EmptyPDFHandler())
+    with tempfile.NamedTemporaryFile('w', suffix='.pdf', delete=False) as f:
+        path = f.name
+    try:
+        assert workflow.filter_pdfs([path], verbose=False) == []
+        assert workflow._error_files == [path]
+    finally:
+        os.remove(path)
+
+def test_afilter_pdfs_matches_filter_pdfs():
+    import asyncio
+
+    class AsyncLLM(DummyLLM):
+        async def agenerate_content(self, prompt, **kwargs):
+            return "0.9"
+
+    workflow = ResearchWorkflow(llm_client=AsyncLLM(), pdf_handler=DummyPDFHandler())
+    with tempfile.NamedTemporaryFile('w', suffix='.pdf', delete=False) as f:
+        path = f.name
+    try:
+        assert asyncio.run(workflow.afilter_pdfs([path], verbose=False, concurrency=4)) == [path]
+        assert workflow._error_files == []
+    finally:
+        os.remove(path)
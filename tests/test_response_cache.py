@@ -0,0 +1,68 @@
+import os
+import tempfile
+from unittest.mock import MagicMock
+from src.services.response_cache import ResponseCache
+
+
+def test_cache_roundtrip_key_and_counters():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ResponseCache(os.path.join(tmpdir, "llm.sqlite3"))
+        key = cache.make_key("models/a", "prompt", {"config": {"temperature": 0}})
+        assert cache.make_key("models/b", "prompt", {"config": {"temperature": 0}}) != key
+        assert cache.make_key("models/a", "prompt", {"config": {"temperature": 1}}) != key
+        assert cache.get(key) is None
+        cache.put(key, "models/a", "answer")
+        assert cache.get(key) == "answer"
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": 6}
+
+
+def test_cache_expires_evicts_and_bypasses():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "llm.sqlite3")
+        expired = ResponseCache(path, ttl_seconds=-1)
+        expired.put("k0", "m", "old")
+        assert expired.get("k0") is None
+        cache = ResponseCache(path, max_bytes=2500)
+        cache.put("k1", "m", "x" * 1000)
+        cache.put("k2", "m", "y" * 1000)
+        assert cache.get("k1") == "x" * 1000  # k2 is now least recently used
+        cache.put("k3", "m", "z" * 1000)
+        assert cache.get("k2") is None
+        assert cache.get("k1") is not None and cache.get("k3") is not None
+        assert ResponseCache(path, bypass=True).get("k1") is None
+
+
+def test_llm_client_serves_repeated_prompts_from_cache():
+    from src.services.llm_client import LLMClient
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ResponseCache(os.path.join(tmpdir, "llm.sqlite3"))
+        client = LLMClient(api_key="test-key", exa_api_key="test-key", response_cache=cache)
+        client.client = MagicMock()
+        client.client.models.generate_content.return_value = type('resp', (), {"text": "Renamed"})()
+        assert client.generate_content("same prompt") == "Renamed"
+        assert client.generate_content("same prompt") == "Renamed"
+        assert client.client.models.generate_content.call_count == 1
+        assert client.generate_content("same prompt", bypass_cache=True) == "Renamed"
+        assert client.client.models.generate_content.call_count == 2
+
+
+def test_running_size_tracks_every_write():
+    import sqlite3
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "llm.sqlite3")
+        # A database written before the size row existed is seeded from its contents.
+        with sqlite3.connect(path) as db:
+            db.execute(
+                "CREATE TABLE responses (key TEXT PRIMARY KEY, model TEXT, response TEXT, "
+                "size INTEGER, created REAL, accessed REAL)"
+            )
+            db.execute("INSERT INTO responses VALUES ('old', 'm', 'abcd', 4, 0, 0)")
+        db.close()
+        cache = ResponseCache(path, ttl_seconds=None)
+        assert cache.stats()["bytes"] == 4
+        cache.put("k1", "m", "x" * 10)
+        cache.put("k1", "m", "x" * 3)  # Replacing an entry counts only its new size.
+        cache.put("k2", "m", "yy")
+        assert cache.stats()["bytes"] == 4 + 3 + 2
+        cache.clear()
+        assert cache.stats() == {"hits": 0, "misses": 0, "entries": 0, "bytes": 0}
@@ -0,0 +1,77 @@
+import asyncio
+import random
+import pytest
+from unittest.mock import MagicMock
+from src.services import retry_policy
+from src.services.retry_policy import RetryPolicy, is_retryable, retry_after
+
+class ApiError(Exception):
+    def __init__(self, code, details=None, headers=None):
+        super().__init__(f"{code}")
+        self.code = code
+        self.details = details
+        self.response = type('resp', (), {"headers": headers or {}})()
+
+def test_errors_are_classified():
+    assert is_retryable(ApiError(429))
+    assert is_retryable(ApiError(503))
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(ApiError(400))
+    assert not is_retryable(ApiError(501))
+    assert not is_retryable(ValueError("bad prompt"))
+
+def test_server_retry_hints_are_read():
+    assert retry_after(ApiError(429, headers={"retry-after": "7"})) == 7.0
+    retry_info = {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "13.5s"}
+    details = {"error": {"details": [retry_info]}}
+    assert retry_after(ApiError(429, details=details)) == 13.5
+    assert retry_after(ApiError(503)) is None
+
+def test_call_retries_transient_errors_with_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(retry_policy.time, "sleep", sleeps.append)
+    func = MagicMock(side_effect=[ApiError(503), ApiError(429, headers={"retry-after": "5"}), "ok"])
+    policy = RetryPolicy(base_delay=1.0, rng=random.Random(0))
+    assert policy.call(func) == "ok"
+    assert func.call_count == 3
+    assert 0 <= sleeps[0] <= 1.0
+    assert 5.0 <= sleeps[1] <= 6.0  # The server's hint, plus jitter
+
+def test_call_gives_up_on_permanent_errors_and_time_cap(monkeypatch):
+    monkeypatch.setattr(retry_policy.time, "sleep", lambda s: None)
+    func = MagicMock(side_effect=ApiError(400))
+    with pytest.raises(ApiError):
+        RetryPolicy().call(func)
+    assert func.call_count == 1
+    func = MagicMock(side_effect=ApiError(429, headers={"retry-after": "120"}))
+    with pytest.raises(ApiError):
+        RetryPolicy(max_total_seconds=60).call(func)
+    assert func.call_count == 1
+
+def test_llm_client_retries_and_chains_the_cause(monkeypatch):
+    from src.services.llm_client import LLMClient
+    client = LLMClient(
+        api_key="test-key", exa_api_key="test-key", retry_policy=RetryPolicy(max_attempts=2)
+    )
+    client.client = MagicMock()
+    response = type('resp', (), {"text": "ok"})()
+    client.client.models.generate_content.side_effect = [ApiError(500), response]
+    monkeypatch.setattr(retry_policy.time, "sleep", lambda s: None)
+    assert client.generate_content("hello") == "ok"
+    client.client.models.generate_content.side_effect = ApiError(403)
+    with pytest.raises(RuntimeError) as info:
+        client.generate_content("hello")
+    assert isinstance(info.value.__cause__, ApiError)
+
+def test_acall_retries_without_blocking(monkeypatch):
+    async def no_sleep(seconds):
+        return None
+    monkeypatch.setattr(retry_policy.asyncio, "sleep", no_sleep)
+    calls = []
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise asyncio.TimeoutError()
+        return "ok"
+    assert asyncio.run(RetryPolicy().acall(flaky)) == "ok"
+    assert len(calls) == 3
@@ -0,0 +1,79 @@
+from src.agent_core.research_workflow import ResearchWorkflow
+from src.handlers.txt_handler import TxtHandler
+from src.services.salient_regions import select_salient_text, split_blocks
+from src.services.token_estimator import TokenEstimator
+
+SENTENCE = (
+    "The apparatus was calibrated and measured repeatedly under standard laboratory conditions."
+)
+FILLER = " ".join([SENTENCE] * 6)
+PAPER = "\n".join([
+    "Journal of Applied Batteries 12 (2021) 1-20",
+    "© 2021 Elsevier Ltd. All rights reserved.",
+    "Solid-State Electrolytes for Lithium Metal Anodes",
+    "Jane Smith, Wei Zhang",
+    "Department of Chemistry, University of Somewhere, 12345 City",
+    "jane@uni.edu",
+    "",
+    "Abstract",
+    "We show that sulfide electrolytes suppress dendrite growth in lithium metal anodes.",
+    "",
+    "1 Introduction",
+    FILLER, "", FILLER, "",
+    "2 Methods",
+    FILLER, "",
+    "Dendrite suppression by sulfide electrolytes depends on interfacial impedance.", "",
+    FILLER, "",
+    "5 Conclusions",
+    "Sulfide electrolytes enable stable cycling of lithium metal anodes for 1000 cycles.",
+    "",
+    "References",
+    "[1] Someone et al. Lithium dendrites. 2019.",
+])
+
+
+def test_split_blocks_tags_structure_and_drops_boilerplate():
+    kinds = [(block.kind, PAPER[block.start:block.end]) for block in split_blocks(PAPER)]
+    assert kinds[0] == ("title", "Solid-State Electrolytes for Lithium Metal Anodes")
+    abstract = "We show that sulfide electrolytes suppress dendrite growth in lithium metal anodes."
+    assert ("abstract", abstract) in kinds
+    assert ("heading", "2 Methods") in kinds
+    assert kinds[-1][0] == "conclusion"
+    dropped = ("Elsevier", "University", "Someone")
+    assert not any(word in text for word in dropped for _, text in kinds)
+
+
+def test_select_salient_text_fits_budget_and_keeps_key_regions():
+    selected = select_salient_text(PAPER, 120)
+    assert TokenEstimator().estimate(selected) <= 120
+    assert selected.startswith("Solid-State Electrolytes for Lithium Metal Anodes")
+    assert "suppress dendrite growth" in selected
+    assert "stable cycling" in selected
+    # The distinctive body paragraph outranks the repeated filler.
+    assert "interfacial impedance" in selected
+    assert "calibrated" not in selected
+    assert select_salient_text("A short note.", 120) == "A short note."
+
+
+def test_select_salient_text_counts_separators():
+    estimator = TokenEstimator()
+    for budget in (50, 100, 200):
+        assert estimator.estimate(select_salient_text(PAPER * 3, budget, estimator)) <= budget
+
+
+def test_filter_pdfs_prompt_uses_salient_regions(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # filter_pdfs writes reason_for_paper_selection.md
+    prompts = []
+
+    class Handler(TxtHandler):
+        def extract_text(self, file_path, **kwargs):
+            return PAPER * 3
+
+    class RecordingLLM:
+        def generate_content(self, prompt, **kwargs):
+            prompts.append(prompt)
+            return "0.9"
+
+    workflow = ResearchWorkflow(llm_client=RecordingLLM(), pdf_handler=Handler())
+    workflow.filter_pdfs([__file__], verbose=False)
+    assert "stable cycling" in prompts[0] and "Elsevier" not in prompts[0]
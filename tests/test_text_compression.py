@@ -0,0 +1,54 @@
+from src.services.text_compression import compress_text, split_sentences, textrank_scores
+from src.services.token_estimator import TokenEstimator
+
+
+def test_split_sentences_on_punctuation_and_lines():
+    text = "Battery Study\nLithium is light. Sulfides conduct ions! Done"
+    assert [text[s:e] for s, e in split_sentences(text)] == [
+        "Battery Study", "Lithium is light.", "Sulfides conduct ions!", "Done"
+    ]
+
+
+def test_textrank_prefers_central_sentences():
+    sentences = [
+        "Lithium anodes grow dendrites during fast charging.",
+        "Sulfide electrolytes suppress lithium dendrites in anodes.",
+        "Dendrites in lithium anodes shorten battery life.",
+        "The weather was pleasant on the day of submission.",
+    ]
+    scores = textrank_scores(sentences)
+    assert abs(scores.sum() - 1.0) < 1e-6
+    assert scores.argmin() == 3
+
+
+def test_compress_text_meets_target_and_keeps_title():
+    body = " ".join([
+        "Lithium metal anodes promise high energy density.",
+        "Dendrite growth in lithium anodes causes short circuits.",
+        "Sulfide solid electrolytes suppress dendrite growth in lithium anodes.",
+        "The conference venue offered excellent coffee.",
+    ] * 10)
+    text = "Sulfide Electrolytes for Lithium Anodes\n" + body
+    estimator = TokenEstimator()
+    compressed = compress_text(text, 50, estimator)
+    assert estimator.estimate(compressed) <= 50
+    assert estimator.estimate(text) / estimator.estimate(compressed) >= 3
+    assert compressed.startswith("Sulfide Electrolytes for Lithium Anodes")
+    assert "coffee" not in compressed
+    assert compress_text("Short text.", 60) == "Short text."
+
+
+def test_compress_text_drops_repeats_and_counts_separators():
+    body = " ".join([
+        "Sulfide solid electrolytes suppress dendrite growth in lithium anodes.",
+        "Dendrite growth in lithium anodes causes short circuits.",
+        "Lithium metal anodes promise high energy density.",
+        "Garnet oxides are stable against lithium metal.",
+    ] * 10)
+    text = "Sulfide Electrolytes for Lithium Anodes\n" + body
+    estimator = TokenEstimator()
+    for target in (30, 50, 80):
+        compressed = compress_text(text, target, estimator)
+        assert estimator.estimate(compressed) <= target
+        lines = compressed.split("\n")
+        assert len(lines) == len(set(lines))